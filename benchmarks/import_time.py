@@ -0,0 +1,73 @@
+"""
+Cold start benchmark: time to import izthere and build the monitors of a config, each
+measurement in a fresh interpreter.
+
+    uv run python benchmarks/import_time.py [--repeat 10]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+MONITORS = {
+    "json_api": {"items_path": "jobs", "predicates": []},
+    "html_word": {"keywords": ["a"]},
+    "xpath_word": {"xpath": "//p", "keywords": ["a"]},
+}
+
+SCENARIOS = {
+    "bare import": ([], False),
+    "json_api only": (["json_api"], False),
+    "json_api + telegram": (["json_api"], True),
+    "all built-ins": (list(MONITORS), True),
+}
+
+HEAVY = ("bs4", "lxml", "telegram", "httpx", "apscheduler")
+
+SNIPPET = """
+import sys, time
+t = time.perf_counter()
+import izthere.main
+from izthere.monitors.base import Monitor
+from izthere.notifiers.base import Notifier
+for cfg in {monitors!r}:
+    Monitor.from_config(cfg)
+if {telegram!r}:
+    Notifier.from_config({{"type": "telegram", "bot_token": "1:x", "chat_id": "1"}})
+elapsed = time.perf_counter() - t
+print(elapsed, ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def measure(types: list[str], telegram: bool) -> tuple[float, str]:
+    monitors = [
+        {"type": t, "question": t, "url": "http://localhost", **MONITORS[t]}
+        for t in types
+    ]
+    code = SNIPPET.format(monitors=monitors, telegram=telegram, heavy=HEAVY)
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout.split()
+    return float(out[0]), out[1] if len(out) > 1 else ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    _ = parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    print(f"{'scenario':<22} {'median ms':>10} {'min ms':>8}  modules loaded")
+    for name, (types, telegram) in SCENARIOS.items():
+        runs = [measure(types, telegram) for _ in range(args.repeat)]
+        times = [t * 1000 for t, _ in runs]
+        print(
+            f"{name:<22} {statistics.median(times):>10.1f} {min(times):>8.1f}  {runs[0][1]}"
+        )
+    print(f"({args.repeat} runs each, {time.perf_counter() - started:.1f}s total)")
+
+
+if __name__ == "__main__":
+    main()
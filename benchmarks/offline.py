@@ -0,0 +1,488 @@
+"""
+Offline benchmark: monitors and notifiers run against a local stand-in server (HTML and
+JSON fixtures of realistic sizes, a fake Telegram Bot API), no network needed.
+
+Measures the latency of each stage (fetch, visible text extraction, xpath extraction,
+predicate evaluation, notify) and the end-to-end throughput and peak RSS of running
+10 to 10,000 monitors once, each scale in a fresh interpreter. Results are saved as
+JSON so that two runs (say, two releases) can be compared.
+
+    uv run python benchmarks/offline.py [--sizes 10,100,1000,10000] [--repeat 50]
+    uv run python benchmarks/offline.py --compare benchmarks/results/<before>.json
+"""
+
+import argparse
+import asyncio
+import http.server
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Self
+
+RESULTS_DIR = Path(__file__).parent / "results"
+PAGE_VARIANTS = 20
+# replaced per request so that every monitor gets its own body (no shared parse)
+ID_MARKER = b"__REQUEST_ID__"
+
+WORDS = [
+    "video",
+    "editing",
+    "film",
+    "camera",
+    "lens",
+    "studio",
+    "light",
+    "color",
+    "grading",
+    "sound",
+    "mix",
+    "timeline",
+    "render",
+    "export",
+    "codec",
+    "frame",
+    "scene",
+    "actor",
+    "script",
+    "director",
+    "producer",
+    "budget",
+    "schedule",
+    "remote",
+    "office",
+    "contract",
+    "freelance",
+    "senior",
+    "junior",
+    "backend",
+    "frontend",
+    "platform",
+    "data",
+]
+
+
+# --- fixtures ---------------------------------------------------------------------
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def html_fixture(rng: random.Random, cards: int = 60) -> bytes:
+    """A listing page of about 60 KB: navigation, cards, inline scripts and styles."""
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(30))
+    body = "".join(
+        f'<article class="card" id="c{i}"><h2><a href="/item/{i}">{_sentence(rng, 6)}'
+        f'</a></h2><p class="meta">Posted {i} days ago · {rng.choice(WORDS)}</p>'
+        f"<p>{_sentence(rng, 45)}</p>"
+        f'<script type="application/ld+json">{{"@id": "{i}", "name": "{_sentence(rng, 8)}"}}'
+        "</script></article>\n"
+        for i in range(cards)
+    )
+    analytics = "var q=[];" + "".join(f"q.push({i});" for i in range(400))
+    return (
+        "<!DOCTYPE html><html><head><title>Listings</title><style>"
+        + "".join(f".c{i}{{margin:{i}px}}" for i in range(150))
+        + f"</style><script>{analytics}</script></head><body><header><nav><ul>{nav}"
+        + f'</ul></nav></header><main id="main"><span>{ID_MARKER.decode()}</span>'
+        + body
+        + "</main><footer><p>Contact · Terms · Privacy</p></footer></body></html>"
+    ).encode()
+
+
+def json_fixture(rng: random.Random, items: int = 300) -> bytes:
+    """A job board API answer of about 150 KB."""
+    jobs = [
+        {
+            "id": i,
+            "title": f"{rng.choice(['Senior', 'Junior', 'Lead'])} {rng.choice(WORDS)} engineer",
+            "department": rng.choice(WORDS),
+            "location": rng.choice(["Remote", "Paris", "Tokyo", "Berlin"]),
+            "employmentType": rng.choice(["FullTime", "PartTime", "Contract"]),
+            "secondaryLocations": [
+                {"location": rng.choice(["Japan", "France", "Spain"])}
+                for _ in range(rng.randint(0, 3))
+            ],
+            "description": _sentence(rng, 35),
+            "jobUrl": f"https://jobs.example.com/{i}",
+        }
+        for i in range(items)
+    ]
+    return json.dumps({"request": ID_MARKER.decode(), "jobs": jobs}).encode()
+
+
+def fixtures(seed: int = 0) -> dict[str, bytes]:
+    rng = random.Random(seed)
+    pages: dict[str, bytes] = {}
+    for k in range(PAGE_VARIANTS):
+        pages[f"/page/{k}.html"] = html_fixture(rng)
+        pages[f"/api/{k}.json"] = json_fixture(rng)
+    return pages
+
+
+# --- stand-in server --------------------------------------------------------------
+
+
+class StandInServer:
+    """Serves the fixtures and answers Telegram ``sendMessage`` like the Bot API."""
+
+    def __init__(self, pages: dict[str, bytes]) -> None:
+        self.pages: dict[str, bytes] = pages
+        self.requests: int = 0
+        self.messages: int = 0
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are separate writes, Nagle would delay the body
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                path, _, query = self.path.partition("?")
+                body = server.pages.get(path)
+                server.requests += 1
+                if body is None:
+                    self._reply(404, b"", "text/plain")
+                    return
+                kind = "application/json" if path.endswith(".json") else "text/html"
+                self._reply(200, body.replace(ID_MARKER, query.encode()), kind)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                _ = self.rfile.read(length)
+                server.messages += 1
+                message = {
+                    "message_id": server.messages,
+                    "date": int(time.time()),
+                    "chat": {"id": 1, "type": "private"},
+                    "text": "ok",
+                }
+                payload = json.dumps({"ok": True, "result": message}).encode()
+                self._reply(200, payload, "application/json")
+
+            def _reply(self, status: int, body: bytes, kind: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", f"{kind}; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                _ = self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def __enter__(self) -> Self:
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+# --- measurements -----------------------------------------------------------------
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Latency statistics in milliseconds."""
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "n": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 6),
+        "p50_ms": round(ms[len(ms) // 2], 6),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 6),
+        "max_ms": round(ms[-1], 6),
+    }
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _ = fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def monitor_config(i: int, base_url: str) -> dict[str, Any]:
+    """The i-th monitor of a mixed fleet: a third of each built-in type."""
+    k = i % PAGE_VARIANTS
+    common = {"question": f"bench monitor {i}", "schedule": "* * * * *"}
+    kind = i % 3
+    if kind == 0:
+        return {
+            **common,
+            "type": "html_word",
+            "url": f"{base_url}/page/{k}.html?{i}",
+            "keywords": ["video editing", "color grading"],
+        }
+    if kind == 1:
+        return {
+            **common,
+            "type": "xpath_word",
+            "url": f"{base_url}/page/{k}.html?{i}",
+            "xpath": ["//article/h2", "//p[@class='meta']"],
+            "keywords": ["studio"],
+        }
+    return {
+        **common,
+        "type": "json_api",
+        "url": f"{base_url}/api/{k}.json?{i}",
+        "items_path": "jobs",
+        "extras_path": "jobUrl",
+        "predicates": [
+            {"path": "title", "op": "contains_insensitive", "value": "backend"},
+            {"path": "location", "op": "equal_insensitive", "value": "remote"},
+            {
+                "path": "secondaryLocations",
+                "op": "any_item_contains_any_insensitive",
+                "value": ["japan", "spain"],
+            },
+        ],
+    }
+
+
+async def measure_stages(base_url: str, pages: dict[str, bytes], repeat: int) -> Any:
+    from izthere.monitors.base import Monitor
+    from izthere.monitors.html_word_monitor import HtmlWordMonitor
+    from izthere.monitors.http_client import close_client_manager
+    from izthere.monitors.json_parser_monitor import JSONParserMonitor
+    from izthere.monitors.text_extractors import TEXT_BACKENDS, parse_html_lxml
+    from izthere.monitors.web_utils import fetch
+    from izthere.monitors.xpath_word_monitor import XpathWordMonitor
+    from izthere.notifiers.telegram_notifier import TelegramNotifier
+
+    html = pages["/page/0.html"].decode()
+    results: dict[str, Any] = {}
+
+    samples: list[float] = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        _ = await fetch(f"{base_url}/page/{i % PAGE_VARIANTS}.html?{i}")
+        samples.append(time.perf_counter() - start)
+    results["fetch"] = summarize(samples)
+
+    for backend in TEXT_BACKENDS:
+        results[f"extract_visible_text[{backend}]"] = summarize(
+            timed(
+                lambda b=backend: HtmlWordMonitor._extract_visible_text(html, b),  # pyright: ignore[reportPrivateUsage]
+                repeat,
+            )
+        )
+
+    tree = parse_html_lxml(html)
+    results["extract_from_xpath"] = summarize(
+        timed(
+            lambda: XpathWordMonitor._extract_from_xpath(tree, "//article/h2"),  # pyright: ignore[reportPrivateUsage]
+            repeat,
+        )
+    )
+
+    monitor = Monitor.from_config(monitor_config(2, base_url))
+    assert isinstance(monitor, JSONParserMonitor)
+    items = json.loads(pages["/api/0.json"])["jobs"]
+
+    def evaluate_all() -> None:
+        for item in items:
+            for pred in monitor.predicates:
+                _ = monitor._evaluate_predicate(item, pred)  # pyright: ignore[reportPrivateUsage]
+
+    evaluations = len(items) * len(monitor.predicates)
+    per_call = [s / evaluations for s in timed(evaluate_all, repeat)]
+    results["evaluate_predicate"] = summarize(per_call)
+
+    # within the bot's burst, so the rate limiter does not add to the latency
+    notifier = TelegramNotifier(
+        bot_token="1:bench",
+        chat_id="1",
+        messages_per_minute=60_000,
+        burst=1000,
+        api_url=base_url,
+    )
+    samples = []
+    for i in range(min(repeat, 25)):
+        start = time.perf_counter()
+        await notifier.notify(
+            what=f"bench {i}",
+            where=f"{base_url}/page/0.html",
+            answer=True,
+            ts=datetime.now(UTC),
+            extra="matched: video editing (@8)",
+        )
+        samples.append(time.perf_counter() - start)
+    results["notify"] = summarize(samples)
+    await notifier.close()
+    await close_client_manager()
+    return results
+
+
+async def run_fleet(base_url: str, size: int, concurrency: int) -> dict[str, Any]:
+    """Run ``size`` monitors once (notifications excluded), inside this process."""
+    from izthere.monitors.base import Monitor
+    from izthere.monitors.execution import ExecutionScheduler
+    from izthere.monitors.http_client import (
+        close_client_manager,
+        configure_client_manager,
+    )
+
+    _ = configure_client_manager(
+        {"max_connections": concurrency, "max_keepalive_connections": concurrency}
+    )
+    execution = ExecutionScheduler(max_in_flight=concurrency)
+    monitors = [Monitor.from_config(monitor_config(i, base_url)) for i in range(size)]
+
+    async def run_one(m: Monitor) -> None:
+        async with execution.slot(m.what, m.where):
+            _ = await m.run()
+
+    start = time.perf_counter()
+    _ = await asyncio.gather(*(run_one(m) for m in monitors))
+    elapsed = time.perf_counter() - start
+    await close_client_manager()
+
+    phases: dict[str, list[float]] = {}
+    for m in monitors:
+        for name, seconds in m.timings.items():
+            phases.setdefault(name, []).append(seconds)
+    return {
+        "monitors": size,
+        "seconds": round(elapsed, 4),
+        "monitors_per_second": round(size / elapsed, 2),
+        "errors": sum(1 for m in monitors if m.last_error),
+        # kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024),
+        "phases": {name: summarize(s) for name, s in sorted(phases.items())},
+    }
+
+
+def measure_scale(base_url: str, size: int, concurrency: int) -> dict[str, Any]:
+    # a fresh interpreter per size, so that peak RSS is the one of this size only
+    out = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--fleet",
+            str(size),
+            "--url",
+            base_url,
+            "--concurrency",
+            str(concurrency),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "LOG_LEVEL": "error"},
+    ).stdout
+    return json.loads(out)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# --- reporting --------------------------------------------------------------------
+
+
+def flatten(results: dict[str, Any]) -> dict[str, float]:
+    """Comparable metrics of a result file, lower is better unless noted."""
+    metrics: dict[str, float] = {}
+    for stage, stats in results["stages"].items():
+        metrics[f"{stage} p50_ms"] = stats["p50_ms"]
+    for scale in results["scaling"]:
+        n = scale["monitors"]
+        metrics[f"{n} monitors/s (higher is better)"] = scale["monitors_per_second"]
+        metrics[f"{n} monitors peak_rss_mb"] = scale["peak_rss_mb"]
+    return metrics
+
+
+def report(results: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    current = flatten(results)
+    before = flatten(baseline) if baseline else {}
+    print(f"{'metric':<44} {'value':>10} {'before':>10} {'change':>8}")
+    for name, value in current.items():
+        line = f"{name:<44} {value:>10.4g}"
+        if before.get(name):
+            change = (value - before[name]) / before[name] * 100
+            line += f" {before[name]:>10.4g} {change:>+7.1f}%"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    _ = parser.add_argument("--sizes", default="10,100,1000,10000")
+    _ = parser.add_argument("--repeat", type=int, default=50)
+    _ = parser.add_argument("--concurrency", type=int, default=64)
+    _ = parser.add_argument("--output", type=Path, help="result file to write")
+    _ = parser.add_argument("--compare", type=Path, help="previous result file")
+    _ = parser.add_argument("--fleet", type=int, help=argparse.SUPPRESS)
+    _ = parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.fleet is not None:  # child process of measure_scale
+        fleet = asyncio.run(run_fleet(args.url, args.fleet, args.concurrency))
+        print(json.dumps(fleet))
+        return
+
+    os.environ.setdefault("LOG_LEVEL", "error")
+    pages = fixtures()
+    with StandInServer(pages) as server:
+        stages = asyncio.run(measure_stages(server.url, pages, args.repeat))
+        scaling = [
+            measure_scale(server.url, int(size), args.concurrency)
+            for size in args.sizes.split(",")
+        ]
+
+    results = {
+        "meta": {
+            "date": datetime.now(UTC).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+            "concurrency": args.concurrency,
+            "fixture_kb": {
+                "html": len(pages["/page/0.html"]) // 1024,
+                "json": len(pages["/api/0.json"]) // 1024,
+            },
+        },
+        "stages": stages,
+        "scaling": scaling,
+    }
+    output: Path = args.output or RESULTS_DIR / (
+        f"{datetime.now():%Y%m%d-%H%M%S}-{results['meta']['commit'] or 'local'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    _ = output.write_text(json.dumps(results, indent=2))
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    report(results, baseline)
+    print(f"results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
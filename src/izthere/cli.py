@@ -0,0 +1,160 @@
+import asyncio
+import json
+import re
+import sys
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+from izthere.engine import monitor_slug
+from izthere.hooks import observe
+from izthere.logger import get_logger, set_log_stream
+from izthere.monitors.base import Monitor
+from izthere.notifiers.base import Notifier
+from izthere.notifiers.dispatcher import Notification, NotificationDispatcher
+from izthere.services import (
+    close_services,
+    config_path,
+    configure_services,
+    load_config,
+)
+
+logger = get_logger()
+
+EXIT_OK = 0
+EXIT_FAILED = 1  # a monitor or a delivery failed
+EXIT_USAGE = 2  # bad config or nothing selected
+
+
+def _select(configs: dict[str, Any], pattern: str | None) -> list[dict[str, Any]]:
+    monitors: list[dict[str, Any]] = configs.get("monitors", [])
+    if pattern is None:
+        return monitors
+    regex = re.compile(pattern, re.IGNORECASE)
+    return [
+        cfg
+        for cfg in monitors
+        if regex.search(cfg["question"]) or regex.search(monitor_slug(cfg["question"]))
+    ]
+
+
+async def _run_monitor(
+    cfg: dict[str, Any],
+    notifiers: dict[str, Notifier],
+    dispatcher: NotificationDispatcher,
+    slots: asyncio.Semaphore,
+    dry_run: bool,
+) -> dict[str, Any]:
+    result: dict[str, Any] = {
+        "name": monitor_slug(cfg["question"]),
+        "question": cfg["question"],
+        "type": cfg.get("type"),
+        "url": cfg.get("url"),
+    }
+    async with slots:
+        start = time.perf_counter()
+        try:
+            m = Monitor.from_config(cfg)
+            previous = await m.load_state()
+        except Exception as e:  # noqa: BLE001
+            return {**result, "error": f"invalid monitor: {e}", "timings": {}}
+        timings = {"load": time.perf_counter() - start}
+
+        start = time.perf_counter()
+        with observe("monitor", result["name"], m.where, m):
+            answer, extra = await m.run()
+        timings["run"] = time.perf_counter() - start
+        timings.update(m.timings)
+        result.update(answer=answer, extra=extra, error=m.last_error)
+
+        unchanged = (
+            previous is not None
+            and previous.answer == answer
+            and previous.extra == extra
+        )
+        routes = [
+            name
+            for name in cfg.get("notifiers", [])
+            if name in notifiers and not (unchanged and notifiers[name].skip_unchanged)
+        ]
+        result["notifiers"] = routes
+        if routes and not dry_run:
+            start = time.perf_counter()
+            notification = Notification(
+                what=m.what,
+                where=m.where,
+                answer=answer,
+                ts=datetime.now(UTC),
+                extra=extra,
+            )
+            result["delivered"] = await dispatcher.send(
+                [notifiers[name] for name in routes], notification
+            )
+            timings["notify"] = time.perf_counter() - start
+    result["timings"] = {k: round(v, 6) for k, v in timings.items()}
+    return result
+
+
+async def run_once(
+    config_file: str | None = None,
+    pattern: str | None = None,
+    dry_run: bool = False,
+    concurrency: int = 8,
+) -> int:
+    """
+    Run the selected monitors once, outside the scheduler, and print a JSON report on
+    stdout (logs go to stderr). Returns the process exit status: ``EXIT_FAILED`` when a
+    monitor errored or a notification could not be delivered.
+    """
+    # stdout carries the report
+    set_log_stream(sys.stderr)
+
+    started = time.perf_counter()
+    try:
+        configs: dict[str, Any] = load_config(config_path(config_file))
+        selected = _select(configs, pattern)
+        if not selected:
+            raise ValueError("no monitor matches the selection")
+        defined = {cfg["name"] for cfg in configs.get("notifiers", [])}
+        for cfg in selected:
+            for name in cfg.get("notifiers", []):
+                if name not in defined:
+                    raise RuntimeError(f"Notifier '{name}' referenced but not defined")
+        notifiers: dict[str, Notifier] = {
+            cfg["name"]: Notifier.from_config(cfg)
+            for cfg in configs.get("notifiers", [])
+        }
+    except Exception as e:  # noqa: BLE001
+        logger.error("cannot run: %s", e)
+        return EXIT_USAGE
+
+    # a dry run must not mark items as seen nor change the answer the daemon compares to
+    dispatcher = configure_services(configs, persist=not dry_run)
+    slots = asyncio.Semaphore(max(1, concurrency))
+    try:
+        results = await asyncio.gather(
+            *(
+                _run_monitor(cfg, notifiers, dispatcher, slots, dry_run)
+                for cfg in selected
+            )
+        )
+    finally:
+        for notifier in notifiers.values():
+            await notifier.close()
+        await close_services()
+
+    failed = [r["name"] for r in results if r.get("error")]
+    undelivered = [r["name"] for r in results if r.get("delivered") is False]
+    report = {
+        "dry_run": dry_run,
+        "monitors": results,
+        "summary": {
+            "total": len(results),
+            "matched": sum(1 for r in results if r.get("answer")),
+            "failed": failed,
+            "undelivered": undelivered,
+            "seconds": round(time.perf_counter() - started, 6),
+        },
+    }
+    print(json.dumps(report, indent=2, default=str))
+    return EXIT_FAILED if failed or undelivered else EXIT_OK
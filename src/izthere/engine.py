@@ -0,0 +1,232 @@
+import asyncio
+import re
+import time
+from datetime import UTC, datetime
+from typing import Any, Final
+
+from apscheduler.events import EVENT_JOB_SUBMITTED, JobSubmissionEvent
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+
+from izthere.hooks import observe
+from izthere.logger import get_logger
+from izthere.metrics import get_metrics
+from izthere.monitors.base import Monitor
+from izthere.monitors.execution import ExecutionScheduler
+from izthere.notifiers.base import Notifier
+from izthere.notifiers.dispatcher import Notification, NotificationDispatcher
+from izthere.sharding import ShardCoordinator, firing_time
+
+logger = get_logger()
+
+# keys of a monitor config that only affect when it runs and where results go
+_ROUTING_KEYS: Final[frozenset[str]] = frozenset({"schedule", "notifiers"})
+# sections applied once at startup, the pools and stores they shape are kept on reload
+_STARTUP_SECTIONS: Final[tuple[str, ...]] = (
+    "data_dir",
+    "http",
+    "cache",
+    "seen_items",
+    "state",
+    "document_cache",
+    "parse_executor",
+    "dispatch",
+    "execution",
+    "sharding",
+    "reload",
+    "metrics",
+    "hooks",
+    "profiling",
+)
+
+
+def monitor_slug(question: str) -> str:
+    """Job name of a monitor, also its identity across reloads and workers."""
+    return re.sub(r"[^a-z0-9_]+", "", re.sub(r"[ \t]+", "_", question.lower()))
+
+
+class Engine:
+    """
+    The running set of notifiers and scheduled monitors.
+
+    ``apply`` diffs a config against what is running and only touches what changed:
+    monitors whose settings are unchanged keep their instance (compiled matchers,
+    state), notifiers keep their clients, and a job is only added, removed or
+    rescheduled when its monitor or schedule changed. A config that fails to load is
+    rejected as a whole and the running set is left as it was.
+    """
+
+    def __init__(
+        self,
+        scheduler: AsyncIOScheduler,
+        dispatcher: NotificationDispatcher,
+        execution: ExecutionScheduler,
+        shard: ShardCoordinator | None = None,
+    ) -> None:
+        self.scheduler: AsyncIOScheduler = scheduler
+        self.dispatcher: NotificationDispatcher = dispatcher
+        self.execution: ExecutionScheduler = execution
+        self.shard: ShardCoordinator | None = shard
+        self.notifiers: dict[str, Notifier] = {}
+        self.monitors: dict[str, Monitor] = {}
+        self.routes: dict[str, list[str]] = {}  # monitor -> notifier names
+        self._notifier_cfgs: dict[str, dict[str, Any]] = {}
+        self._monitor_cfgs: dict[str, dict[str, Any]] = {}
+        self._startup_cfg: dict[str, Any] | None = None
+        self._lock: asyncio.Lock = asyncio.Lock()
+        # job -> time its current firing was due, to measure how late it starts
+        self._due: dict[str, datetime] = {}
+        self.scheduler.add_listener(self._on_submitted, EVENT_JOB_SUBMITTED)
+
+    async def apply(self, configs: dict[str, Any]) -> None:
+        async with self._lock:
+            await self._apply(configs)
+
+    async def _apply(self, configs: dict[str, Any]) -> None:
+        startup_cfg = {k: configs.get(k) for k in _STARTUP_SECTIONS}
+        if self._startup_cfg is None:
+            self._startup_cfg = startup_cfg
+        elif startup_cfg != self._startup_cfg:
+            previous = self._startup_cfg
+            changed = [k for k in _STARTUP_SECTIONS if startup_cfg[k] != previous[k]]
+            logger.warning("changes to %s are only applied after a restart", changed)
+
+        # build everything first, a broken config must not leave a half-applied set
+        notifier_cfgs: dict[str, dict[str, Any]] = {
+            cfg["name"]: cfg for cfg in configs.get("notifiers", [])
+        }
+        notifiers: dict[str, Notifier] = {}
+        for name, cfg in notifier_cfgs.items():
+            if self._notifier_cfgs.get(name) == cfg:
+                notifiers[name] = self.notifiers[name]
+            else:
+                notifiers[name] = Notifier.from_config(cfg)
+
+        monitor_cfgs: dict[str, dict[str, Any]] = {}
+        monitors: dict[str, Monitor] = {}
+        triggers: dict[str, CronTrigger] = {}
+        for cfg in configs.get("monitors", []):
+            name = monitor_slug(cfg["question"])
+            if name in monitor_cfgs:
+                raise ValueError(f"Monitor '{cfg['question']}' defined twice")
+            for notifier_name in cfg["notifiers"]:
+                if notifier_name not in notifiers:
+                    raise RuntimeError(
+                        f"Notifier '{notifier_name}' referenced but not defined"
+                    )
+            triggers[name] = CronTrigger.from_crontab(cfg["schedule"])
+            monitor_cfgs[name] = cfg
+
+            old_cfg = self._monitor_cfgs.get(name)
+            if old_cfg is not None and _settings(old_cfg) == _settings(cfg):
+                monitors[name] = self.monitors[name]
+            else:
+                monitors[name] = Monitor.from_config(cfg)
+                # result of the previous process, a restart alone is not a change
+                _ = await monitors[name].load_state()
+
+        removed = [n for n in self._monitor_cfgs if n not in monitor_cfgs]
+        for name in removed:
+            self.scheduler.remove_job(name)
+            logger.info("monitor '%s' removed", self._monitor_cfgs[name]["question"])
+
+        for name, cfg in monitor_cfgs.items():
+            old_cfg = self._monitor_cfgs.get(name)
+            if old_cfg is None:
+                self._schedule(name, cfg, triggers[name])
+            elif old_cfg["schedule"] != cfg["schedule"]:
+                _ = self.scheduler.reschedule_job(name, trigger=triggers[name])
+                logger.info(
+                    "monitor '%s' rescheduled (cron) '%s'",
+                    cfg["question"],
+                    cfg["schedule"],
+                )
+            elif monitors[name] is not self.monitors[name]:
+                logger.info("monitor '%s' updated", cfg["question"])
+
+        stale = [
+            n for name, n in self.notifiers.items() if notifiers.get(name) is not n
+        ]
+        self.notifiers = notifiers
+        self.monitors = monitors
+        self.routes = {name: cfg["notifiers"] for name, cfg in monitor_cfgs.items()}
+        self._notifier_cfgs = notifier_cfgs
+        self._monitor_cfgs = monitor_cfgs
+        for notifier in stale:
+            await notifier.close()
+
+    def _schedule(self, name: str, cfg: dict[str, Any], trigger: CronTrigger) -> None:
+        next_exec = trigger.get_next_fire_time(None, datetime.now())
+        logger.info(
+            "loaded one monitor '%s' with %s notifier(s) on schedule (cron) '%s', next execution %s",
+            cfg["question"],
+            len(cfg["notifiers"]),
+            cfg["schedule"],
+            next_exec,
+        )
+        _ = self.scheduler.add_job(
+            self.run_monitor,
+            trigger,
+            args=(name,),
+            id=name,
+            name=name,
+            max_instances=1,
+            replace_existing=True,
+        )
+        logger.info("monitor '%s' scheduled", cfg["question"])
+
+    def _on_submitted(self, event: JobSubmissionEvent) -> None:
+        if event.scheduled_run_times:
+            self._due[event.job_id] = event.scheduled_run_times[-1]
+
+    async def run_monitor(self, name: str) -> None:
+        """Scheduler job, looks the monitor up on every run so reloads apply to it."""
+        due = self._due.pop(name, None)
+        metrics = get_metrics()
+        # lag is taken as the job fires, jitter and the wait for a slot are measured apart
+        if metrics is not None and due is not None:
+            lag = (datetime.now(UTC) - due).total_seconds()
+            metrics.scheduler_lag.observe(max(lag, 0.0), name)
+        # with several workers, only the one claiming this firing runs the monitor; the
+        # key comes from the due time, a late start must not look like another firing
+        if self.shard is not None and not await self.shard.claim(
+            name, firing_time(due)
+        ):
+            return
+        m = self.monitors.get(name)
+        if m is None:
+            return
+        previous = await m.load_state()
+        async with self.execution.slot(name, m.where) as waited:
+            if metrics is not None:
+                metrics.slot_wait.observe(waited, name)
+            start = time.perf_counter()
+            with observe("monitor", name, m.where, m):
+                answer, extra = await m.run()
+            if metrics is not None:
+                metrics.record_run(name, m, time.perf_counter() - start)
+        unchanged = (
+            previous is not None
+            and previous.answer == answer
+            and previous.extra == extra
+        )
+        ns = [
+            self.notifiers[n] for n in self.routes.get(name, []) if n in self.notifiers
+        ]
+        ts: datetime = datetime.now(UTC)
+        if unchanged:
+            logger.debug("unchanged answer of '%s'", m.what)
+            ns = [n for n in ns if not n.skip_unchanged]
+        # delivery (and its retries) happens in the dispatcher, the job ends here
+        await self.dispatcher.submit(
+            ns,
+            Notification(what=m.what, where=m.where, answer=answer, ts=ts, extra=extra),
+        )
+
+    async def close(self) -> None:
+        for notifier in self.notifiers.values():
+            await notifier.close()
+
+
+def _settings(cfg: dict[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in cfg.items() if k not in _ROUTING_KEYS}
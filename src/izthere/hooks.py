@@ -0,0 +1,287 @@
+import pkgutil
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from types import FrameType
+from typing import Any, Literal
+
+from izthere.logger import get_logger
+from izthere.monitors.base import Monitor
+
+logger = get_logger()
+
+RunKind = Literal["monitor", "notifier"]
+
+
+@dataclass
+class RunEvent:
+    """One ``Monitor.run`` or ``Notifier.notify`` call, as seen by the hooks."""
+
+    kind: RunKind
+    name: str  # monitor job name, or notifier type
+    target: str  # url of the monitor, or of the result being delivered
+    subject: Any  # the Monitor or Notifier
+    started_at: datetime
+    seconds: float = 0.0
+    timings: dict[str, float] = field(default_factory=dict)
+    bytes_downloaded: int = 0
+    error: str | None = None
+
+
+class Hook:
+    """
+    Callbacks around monitor runs and deliveries, subclass and override what you need.
+    They run on the event loop, inline with the run: keep them quick. A hook raising
+    is logged and ignored.
+    """
+
+    def on_start(self, event: RunEvent) -> None:
+        return None
+
+    def on_end(self, event: RunEvent) -> None:
+        """The call returned, ``event.error`` is set when the monitor failed."""
+
+    def on_error(self, event: RunEvent, error: BaseException) -> None:
+        """The call raised (or was cancelled)."""
+
+    def close(self) -> None:
+        return None
+
+
+_hooks: list[Hook] = []
+
+
+def register_hook(hook: Hook) -> None:
+    _hooks.append(hook)
+
+
+def unregister_hook(hook: Hook) -> None:
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def _call(method: str, *args: Any) -> None:
+    for hook in _hooks.copy():
+        try:
+            getattr(hook, method)(*args)
+        except Exception:
+            logger.exception("hook %s.%s failed", type(hook).__name__, method)
+
+
+@contextmanager
+def observe(kind: RunKind, name: str, target: str, subject: Any) -> Iterator[RunEvent]:
+    """Wrap one run or delivery, calling the registered hooks around it."""
+    event = RunEvent(
+        kind=kind,
+        name=name,
+        target=target,
+        subject=subject,
+        started_at=datetime.now(UTC),
+    )
+    if not _hooks:
+        yield event
+        return
+
+    _call("on_start", event)
+    start = time.perf_counter()
+    try:
+        yield event
+    except BaseException as e:
+        event.seconds = time.perf_counter() - start
+        event.error = str(e) or type(e).__name__
+        _call("on_error", event, e)
+        raise
+    event.seconds = time.perf_counter() - start
+    if isinstance(subject, Monitor):
+        event.timings = subject.timings
+        event.bytes_downloaded = subject.bytes_downloaded
+        event.error = subject.last_error
+    _call("on_end", event)
+
+
+@dataclass
+class _Sampled:
+    thread_id: int
+    stacks: Counter[str] = field(default_factory=Counter)
+    waiting: int = 0
+
+
+def _owns(frame: FrameType, subject: Any) -> bool:
+    # reading f_locals of another thread's frame is what debuggers do, it is safe
+    # under the GIL
+    return frame.f_locals.get("self") is subject
+
+
+class SlowRunProfiler(Hook):
+    """
+    Keeps a profile of the runs slower than ``threshold_seconds``.
+
+    While runs are in flight a background thread samples the event loop's stack every
+    ``interval_seconds``; a sample counts for a run when the run's own frames are on
+    the stack (it is on the CPU), otherwise as waiting (I/O, a slot, another
+    coroutine). cProfile cannot be used here: it profiles a thread, not a coroutine,
+    and concurrent runs interleave on the same thread. When a run ends over the
+    threshold its folded stacks and a summary (phases, payload size, error) are
+    written to ``directory``, where only the ``keep`` latest captures are kept.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        threshold_seconds: float = 5.0,
+        interval_seconds: float = 0.01,
+        keep: int = 50,
+    ) -> None:
+        self.directory: Path = directory
+        self.threshold_seconds: float = threshold_seconds
+        self.interval_seconds: float = interval_seconds
+        self.keep: int = keep
+        self._active: dict[int, tuple[RunEvent, _Sampled]] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._wake: threading.Event = threading.Event()
+        self._closed: threading.Event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def on_start(self, event: RunEvent) -> None:
+        with self._lock:
+            self._active[id(event)] = (event, _Sampled(threading.get_ident()))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._sample_loop, name="izthere-profiler", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def on_end(self, event: RunEvent) -> None:
+        self._finish(event)
+
+    def on_error(self, event: RunEvent, error: BaseException) -> None:
+        self._finish(event)
+
+    def _finish(self, event: RunEvent) -> None:
+        with self._lock:
+            _, sampled = self._active.pop(id(event), (None, None))
+        if sampled is not None and event.seconds >= self.threshold_seconds:
+            try:
+                self._dump(event, sampled)
+            except OSError as e:
+                logger.error("could not write the profile of '%s': %s", event.name, e)
+
+    def _sample_loop(self) -> None:
+        while not self._closed.is_set():
+            if not self._active:
+                _ = self._wake.wait()
+                self._wake.clear()
+                continue
+            self._sample()
+            _ = self._closed.wait(self.interval_seconds)
+
+    def _sample(self) -> None:
+        frames = sys._current_frames()  # pyright: ignore[reportPrivateUsage]
+        with self._lock:
+            runs = list(self._active.values())
+        stacks: dict[int, list[FrameType]] = {}
+        for event, sampled in runs:
+            if sampled.thread_id not in stacks:
+                stack: list[FrameType] = []
+                frame = frames.get(sampled.thread_id)
+                while frame is not None:
+                    stack.append(frame)
+                    frame = frame.f_back
+                stacks[sampled.thread_id] = stack
+            stack = stacks[sampled.thread_id]
+            if any(_owns(f, event.subject) for f in stack):
+                folded = ";".join(
+                    f"{f.f_globals.get('__name__', '?')}:{f.f_code.co_qualname}"
+                    for f in reversed(stack)
+                )
+                sampled.stacks[folded] += 1
+            else:
+                sampled.waiting += 1
+
+    def _dump(self, event: RunEvent, sampled: _Sampled) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = f"{event.started_at:%Y%m%dT%H%M%S%f}-{event.kind}-{event.name}"
+        on_cpu = sum(sampled.stacks.values())
+        phases = ", ".join(f"{k}={v:.3f}s" for k, v in event.timings.items())
+        summary = [
+            f"{event.kind} {event.name} {event.target}",
+            f"started {event.started_at.isoformat()}, took {event.seconds:.3f}s "
+            + f"(threshold {self.threshold_seconds}s)",
+            f"phases: {phases or '-'}",
+            f"payload: {event.bytes_downloaded} bytes",
+            f"error: {event.error or '-'}",
+            f"samples every {self.interval_seconds * 1000:.0f}ms: {on_cpu} running, "
+            + f"{sampled.waiting} waiting",
+            "",
+            "hottest stacks (full ones in the .folded file):",
+        ]
+        for stack, count in sampled.stacks.most_common(15):
+            summary.append(f"{count:>6}  ...;{';'.join(stack.split(';')[-3:])}")
+        _ = (self.directory / f"{stem}.txt").write_text("\n".join(summary) + "\n")
+        # one "root;...;leaf count" line per stack, for flamegraph.pl or speedscope
+        _ = (self.directory / f"{stem}.folded").write_text(
+            "".join(f"{s} {n}\n" for s, n in sampled.stacks.most_common())
+        )
+        logger.warning(
+            "slow %s '%s' (%.1fs), profile written to %s.txt",
+            event.kind,
+            event.name,
+            event.seconds,
+            self.directory / stem,
+        )
+        self._rotate()
+
+    def _rotate(self) -> None:
+        captures = sorted(self.directory.glob("*.txt"))
+        for old in captures[: max(0, len(captures) - self.keep)]:
+            old.unlink(missing_ok=True)
+            old.with_suffix(".folded").unlink(missing_ok=True)
+
+    def close(self) -> None:
+        self._closed.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+
+def configure_hooks(
+    hooks: list[str] | None, profiling: dict[str, Any] | None, data_dir: Path
+) -> list[Hook]:
+    """
+    Register the hooks listed in the ``hooks`` section (``package.module:Factory``,
+    called without arguments) and, if enabled, the ``profiling`` slow run profiler.
+    """
+    close_hooks()
+    for path in hooks or []:
+        register_hook(pkgutil.resolve_name(path)())
+        logger.info("hook %s registered", path)
+
+    profiling = profiling or {}
+    if profiling.get("enabled", False):
+        profiler = SlowRunProfiler(
+            Path(profiling.get("path", data_dir / "profiles")),
+            threshold_seconds=profiling.get("threshold_seconds", 5.0),
+            interval_seconds=profiling.get("interval_ms", 10) / 1000,
+            keep=profiling.get("keep", 50),
+        )
+        register_hook(profiler)
+        logger.info(
+            "profiling runs slower than %ss into %s",
+            profiler.threshold_seconds,
+            profiler.directory,
+        )
+    return list(_hooks)
+
+
+def close_hooks() -> None:
+    for hook in _hooks:
+        hook.close()
+    _hooks.clear()
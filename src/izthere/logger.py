@@ -1,8 +1,13 @@
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
 import sys
-from datetime import datetime
-from typing import Final, override
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from typing import Any, Final, TextIO, override
 
 _LOG_LEVEL_MAP: Final[dict[str, int]] = {
     "critical": logging.CRITICAL,
@@ -13,6 +18,14 @@ _LOG_LEVEL_MAP: Final[dict[str, int]] = {
     "notset": logging.NOTSET,
 }
 
+# what is being worked on, attached to every record logged from within it (asyncio
+# tasks each get their own copy)
+log_monitor: ContextVar[str | None] = ContextVar("log_monitor", default=None)
+log_phase: ContextVar[str | None] = ContextVar("log_phase", default=None)
+
+# arguments that cannot change between the logging call and their rendering
+_IMMUTABLE_ARGS: Final = (str, int, float, bytes, type(None), datetime)
+
 
 def _resolve_log_level(env_value: str | None) -> int:
     if not env_value:
@@ -41,10 +54,112 @@ class SimpleFormatter(logging.Formatter):
         return super().format(record)
 
 
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the monitor, phase and duration when known."""
+
+    fields: Final = ("monitor", "phase", "duration")
+
+    @override
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in self.fields:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _ContextFilter(logging.Filter):
+    """Copies the context variables onto the record, unless given as ``extra``."""
+
+    @override
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "monitor", None) is None:
+            record.monitor = log_monitor.get()
+        if getattr(record, "phase", None) is None:
+            record.phase = log_phase.get()
+        return True
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands the record to the listener thread, which formats and writes it: the caller
+    only pays for creating the record and queueing it. Records with mutable arguments
+    (lists, dicts, objects...) are the exception, their message is rendered right away
+    so that a later change to an argument does not show in the log.
+    """
+
+    @override
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # exc_info is safe to pass along within the process
+        args = record.args
+        if args and not (
+            isinstance(args, tuple)
+            and all(isinstance(a, _IMMUTABLE_ARGS) for a in args)
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+_stream_handler: logging.StreamHandler[TextIO] | None = None
+_queue_handler: logging.Handler | None = None
+_listener: logging.handlers.QueueListener | None = None
+
+
+def _make_formatter() -> logging.Formatter:
+    if os.getenv("LOG_FORMAT", "text").strip().lower() == "json":
+        return JsonFormatter()
+    return SimpleFormatter()
+
+
+def _start_listener(level: int) -> logging.Handler:
+    global _stream_handler, _queue_handler, _listener
+    if _queue_handler is not None:
+        return _queue_handler
+
+    _stream_handler = logging.StreamHandler(sys.stdout)
+    _stream_handler.setLevel(level)
+    _stream_handler.setFormatter(_make_formatter())
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, _stream_handler)
+    _listener.start()
+    _ = atexit.register(stop_logging)
+
+    _queue_handler = _LazyQueueHandler(log_queue)
+    _queue_handler.setLevel(level)
+    _queue_handler.addFilter(_ContextFilter())
+    return _queue_handler
+
+
+def stop_logging() -> None:
+    """Write out what is still queued and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def set_log_stream(stream: TextIO) -> None:
+    """Redirect the log output, e.g. to stderr when stdout carries results."""
+    if _stream_handler is not None:
+        _ = _stream_handler.setStream(stream)
+
+
 def get_logger(name: str = "izthere") -> logging.Logger:
     """
-    Returns a module-level logger that prints to stdout.
-    The configuration is applied only once (the first call).
+    Returns a module-level logger that prints to stdout (as JSON lines when
+    ``LOG_FORMAT=json``). Records are queued and written by a background thread, so
+    that logging does not block the event loop. The configuration is applied only
+    once (the first call).
     """
     logger = logging.getLogger(name)
 
@@ -55,11 +170,6 @@ def get_logger(name: str = "izthere") -> logging.Logger:
     chosen_level = _resolve_log_level(env_level)
 
     logger.setLevel(chosen_level)
-
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(chosen_level)
-    handler.setFormatter(SimpleFormatter())
-
-    logger.addHandler(handler)
+    logger.addHandler(_start_listener(chosen_level))
     logger.propagate = False  # avoid duplicate prints from root logger
     return logger
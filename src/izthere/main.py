@@ -1,93 +1,154 @@
+import argparse
 import asyncio
-import os
-import re
-from datetime import datetime, timezone
+import signal
+import sys
 from pathlib import Path
 from typing import Any
 
-import yaml
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
+from izthere.cli import run_once
+from izthere.engine import Engine
 from izthere.logger import get_logger
-from izthere.monitors.base import Monitor
-from izthere.notifiers.base import Notifier
+from izthere.metrics import close_metrics, configure_metrics
+from izthere.monitors.execution import configure_execution
+from izthere.services import (
+    close_services,
+    configure_services,
+    data_dir,
+    load_config,
+)
+from izthere.services import config_path as resolve_config_path
+from izthere.sharding import close_sharding, configure_sharding
 
 CONFIG_DIR = Path(__file__).parent / "config"
 
 logger = get_logger()
 
 
-def load_config(file_path: Path) -> Any:
-    """Simple safe loader – returns a list of dicts (empty list if file missing)."""
-    if not file_path.is_file():
-        return []
-    with file_path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+async def setup(config_file: str | None = None) -> None:
+    config_path = resolve_config_path(config_file)
+    configs: dict[str, Any] = load_config(config_path)
 
+    dispatcher = configure_services(configs)
+    execution_cfg: dict[str, Any] = configs.get("execution") or {}
+    execution = configure_execution(execution_cfg)
+    shard = await configure_sharding(configs.get("sharding"), data_dir(configs))
+    _ = await configure_metrics(configs.get("metrics"))
 
-async def setup() -> None:
-    config_path = Path(os.environ.get("IZTHERE_CONFIG_PATH", "./config.yaml"))
-    if not config_path.exists():
-        raise FileNotFoundError(
-            "Configuration file not found, set IZTHERE_CONFIG_PATH to a valid path"
+    scheduler = AsyncIOScheduler()
+    engine = Engine(scheduler, dispatcher, execution, shard)
+    await engine.apply(configs)
+
+    async def reload() -> None:
+        logger.info("reloading configuration from %s", config_path)
+        try:
+            await engine.apply(load_config(config_path))
+        except Exception as e:  # noqa: BLE001
+            logger.error("configuration not reloaded, keeping the running one: %s", e)
+
+    reloads: set[asyncio.Task[None]] = set()
+
+    def schedule_reload() -> None:
+        task = asyncio.create_task(reload())
+        reloads.add(task)
+        task.add_done_callback(reloads.discard)
+
+    loop = asyncio.get_running_loop()
+    if hasattr(signal, "SIGHUP"):
+        loop.add_signal_handler(signal.SIGHUP, schedule_reload)
+
+    watch_interval = (configs.get("reload") or {}).get("watch_interval_seconds")
+    if watch_interval:
+        last_mtime = config_path.stat().st_mtime
+
+        async def watch_config() -> None:
+            nonlocal last_mtime
+            mtime = config_path.stat().st_mtime
+            if mtime != last_mtime:
+                last_mtime = mtime
+                await reload()
+
+        _ = scheduler.add_job(
+            watch_config,
+            IntervalTrigger(seconds=watch_interval),
+            name="config_watch",
+            max_instances=1,
         )
-    configs: dict[str, Any] = load_config(config_path)
 
-    notifier_cfgs = configs.get("notifiers", [])
-    notifiers: dict[str, Notifier] = {
-        cfg["name"]: Notifier.from_config(cfg) for cfg in notifier_cfgs
-    }
+    stats_interval = execution_cfg.get("stats_interval_seconds")
+    if stats_interval:
 
-    monitor_cfgs = configs.get("monitors", [])
-    monitors: list[tuple[str, list[str], str, Monitor]] = [
-        (cfg["question"], cfg["notifiers"], cfg["schedule"], Monitor.from_config(cfg))
-        for cfg in monitor_cfgs
-    ]
+        def log_execution_stats() -> None:
+            logger.info("execution stats: %s", execution.stats())
 
-    scheduler = AsyncIOScheduler()
-    for question, notifier_names, schedule, monitor in monitors:
-        logger.debug(f"setting up monitor '{question}' with notifiers {notifier_names}")
-        associated_notifiers: list[Notifier] = []
-        for notifier_name in notifier_names:
-            notifier: Notifier | None = notifiers.get(notifier_name)
-            if notifier is None:
-                raise RuntimeError(
-                    f"Notifier '{notifier_name}' referenced but not defined"
-                )
-            associated_notifiers.append(notifier)
-
-        async def job(
-            m: Monitor = monitor,
-            ns: list[Notifier] = associated_notifiers,
-        ) -> None:
-            answer, extra = await m.run()
-            ts: datetime = datetime.now(timezone.utc)
-            for n in ns:
-                await n.notify(
-                    what=m.what, where=m.where, answer=answer, ts=ts, extra=extra
-                )
-
-        trigger: CronTrigger = CronTrigger.from_crontab(schedule)
-        now = datetime.now()
-        next_exec = trigger.get_next_fire_time(None, now)
-        logger.info(
-            f"loaded one monitor '{question}' with {len(associated_notifiers)} notifier(s) on schedule (cron) '{schedule}', next execution {next_exec}"
+        _ = scheduler.add_job(
+            log_execution_stats,
+            IntervalTrigger(seconds=stats_interval),
+            name="execution_stats",
         )
-        name = re.sub(r"[^a-z0-9_]+", "", re.sub(r"[ \t]+", "_", question.lower()))
-        _ = scheduler.add_job(job, trigger, name=name, max_instances=1)
-        logger.info(f"monitor '{question}' scheduled")
 
     scheduler.start()
     logger.info("🚀 notification engine started - press Ctrl+C to stop.")
     try:
         _ = await asyncio.Event().wait()  # keep the loop alive forever
     finally:
-        scheduler.shutdown()
-
-
-def main() -> None:
+        await shutdown(scheduler, engine)
+
+
+async def shutdown(scheduler: AsyncIOScheduler, engine: Engine) -> None:
+    scheduler.shutdown()
+    await close_metrics()
+    await close_sharding()
+    # notifiers flush their digests while the dispatcher still tracks and retries them
+    await engine.close()
+    await close_services()
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="izthere", description="Simple modular monitor/notifier for the web"
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    serve = commands.add_parser("serve", help="run the scheduler (default)")
+    _ = serve.add_argument("--config", help="overrides IZTHERE_CONFIG_PATH")
+
+    run = commands.add_parser(
+        "run", help="run monitors once, print their results as JSON and exit"
+    )
+    _ = run.add_argument("--config", help="overrides IZTHERE_CONFIG_PATH")
+    selection = run.add_mutually_exclusive_group(required=True)
+    _ = selection.add_argument("--all", action="store_true", help="every monitor")
+    _ = selection.add_argument(
+        "--match",
+        metavar="PATTERN",
+        help="monitors whose question or job name matches this regex (ignoring case)",
+    )
+    _ = run.add_argument(
+        "--dry-run", action="store_true", help="evaluate only, notify nobody"
+    )
+    _ = run.add_argument(
+        "--concurrency", type=int, default=8, help="monitors running at once"
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parser().parse_args(argv)
+    if args.command == "run":
+        sys.exit(
+            asyncio.run(
+                run_once(
+                    config_file=args.config,
+                    pattern=None if args.all else args.match,
+                    dry_run=args.dry_run,
+                    concurrency=args.concurrency,
+                )
+            )
+        )
     try:
-        asyncio.run(setup())
+        asyncio.run(setup(getattr(args, "config", None)))
     except KeyboardInterrupt:
         logger.info("stopped")
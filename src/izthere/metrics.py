@@ -0,0 +1,278 @@
+import asyncio
+import bisect
+import math
+from typing import Any, Final
+from urllib.parse import urlsplit
+
+from izthere.logger import get_logger
+from izthere.monitors.base import Monitor
+
+logger = get_logger()
+
+# seconds, from a cached answer to a slow page behind a slow host
+LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+LAG_BUCKETS: Final[tuple[float, ...]] = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0)
+
+_Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: _Labels, **extra: str) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name: str = name
+        self.help: str = help
+        self.labels: tuple[str, ...] = labels
+        self._values: dict[_Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name: str = name
+        self.help: str = help
+        self.labels: tuple[str, ...] = labels
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        # per label set: count of each bucket (not cumulative), +Inf last, then sum
+        self._counts: dict[_Labels, list[int]] = {}
+        self._sums: dict[_Labels, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[labels] = self._sums.get(labels, 0.0) + value
+
+    def count(self, *labels: str) -> int:
+        return sum(self._counts.get(labels, ()))
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, n in zip((*self.buckets, math.inf), counts):
+                cumulative += n
+                le = _format_labels(self.labels, labels, le=_format_value(bound))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            own = _format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{own} {_format_value(self._sums[labels])}")
+            lines.append(f"{self.name}_count{own} {cumulative}")
+        return lines
+
+
+class Metrics:
+    """
+    What the engine records about monitor runs and deliveries, rendered in the
+    Prometheus text format. Monitors are labelled with their job name and host so that
+    the ones eating the capacity stand out.
+    """
+
+    def __init__(self) -> None:
+        self.run_seconds: Histogram = Histogram(
+            "izthere_monitor_run_seconds",
+            "Duration of a monitor run.",
+            ("monitor", "type", "host"),
+        )
+        self.phase_seconds: Histogram = Histogram(
+            "izthere_monitor_phase_seconds",
+            "Duration of one phase (fetch, decode, extract, match...) of a run.",
+            ("monitor", "type", "phase"),
+        )
+        self.bytes_downloaded: Counter = Counter(
+            "izthere_monitor_downloaded_bytes_total",
+            "Body bytes downloaded by monitors.",
+            ("monitor", "host"),
+        )
+        self.runs: Counter = Counter(
+            "izthere_monitor_runs_total", "Completed monitor runs.", ("monitor", "type")
+        )
+        self.errors: Counter = Counter(
+            "izthere_monitor_errors_total",
+            "Failed monitor runs, by error type.",
+            ("monitor", "type", "error"),
+        )
+        self.scheduler_lag: Histogram = Histogram(
+            "izthere_scheduler_lag_seconds",
+            "Delay between the scheduled fire time of a monitor and its job firing.",
+            ("monitor",),
+            buckets=LAG_BUCKETS,
+        )
+        self.slot_wait: Histogram = Histogram(
+            "izthere_execution_slot_wait_seconds",
+            "Time a monitor run waited for an execution slot, jitter excluded.",
+            ("monitor",),
+            buckets=LAG_BUCKETS,
+        )
+        self.notify_seconds: Histogram = Histogram(
+            "izthere_notify_seconds",
+            "Duration of one delivery attempt.",
+            ("notifier",),
+        )
+        self.notify_errors: Counter = Counter(
+            "izthere_notify_errors_total",
+            "Failed delivery attempts, by error type.",
+            ("notifier", "error"),
+        )
+
+    def record_run(self, name: str, monitor: Monitor, seconds: float) -> None:
+        kind = monitor.monitor_type
+        host = urlsplit(monitor.where).hostname or ""
+        self.run_seconds.observe(seconds, name, kind, host)
+        for phase, elapsed in monitor.timings.items():
+            self.phase_seconds.observe(elapsed, name, kind, phase)
+        if monitor.bytes_downloaded:
+            self.bytes_downloaded.inc(name, host, amount=monitor.bytes_downloaded)
+        self.runs.inc(name, kind)
+        if monitor.error_type is not None:
+            self.errors.inc(name, kind, monitor.error_type)
+
+    def record_notify(
+        self, notifier_type: str, seconds: float, error: BaseException | None
+    ) -> None:
+        self.notify_seconds.observe(seconds, notifier_type)
+        if error is not None:
+            self.notify_errors.inc(notifier_type, type(error).__name__)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in (
+            self.run_seconds,
+            self.phase_seconds,
+            self.bytes_downloaded,
+            self.runs,
+            self.errors,
+            self.scheduler_lag,
+            self.slot_wait,
+            self.notify_seconds,
+            self.notify_errors,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Minimal HTTP server answering ``GET /metrics``, on the event loop."""
+
+    def __init__(self, metrics: Metrics, host: str, port: int) -> None:
+        self.metrics: Metrics = metrics
+        self.host: str = host
+        self.port: int = port
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # port 0 picks a free one
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10)
+            method, _, rest = request.decode("latin-1").partition(" ")
+            path = rest.split(" ", 1)[0].split("?", 1)[0]
+            if method == "GET" and path == "/metrics":
+                status = "200 OK"
+                body = self.metrics.render().encode()
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+_metrics: Metrics | None = None
+_server: MetricsServer | None = None
+
+
+async def configure_metrics(cfg: dict[str, Any] | None) -> Metrics | None:
+    """Start recording and serving ``/metrics``, from the ``metrics`` section."""
+    global _metrics, _server
+    cfg = cfg or {}
+    if not cfg.get("enabled", False):
+        return None
+
+    _metrics = Metrics()
+    _server = MetricsServer(
+        _metrics, cfg.get("host", "127.0.0.1"), cfg.get("port", 9464)
+    )
+    await _server.start()
+    logger.info("metrics served on http://%s:%s/metrics", _server.host, _server.port)
+    return _metrics
+
+
+def get_metrics() -> Metrics | None:
+    return _metrics
+
+
+async def close_metrics() -> None:
+    global _metrics, _server
+    if _server is not None:
+        await _server.close()
+        _server = None
+    _metrics = None
@@ -1,11 +1,38 @@
+import logging
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Any, ClassVar
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from typing import Any, ClassVar, Final
+
+from izthere.logger import get_logger, log_monitor, log_phase
+from izthere.monitors.state_store import MonitorState, get_state_store
+from izthere.plugins import load_plugin
+
+logger = get_logger()
+
+# built-in monitors, imported on first use so unused parsers are never loaded
+BUILTIN_MONITORS: Final[dict[str, str]] = {
+    "html_word": "izthere.monitors.html_word_monitor",
+    "xpath_word": "izthere.monitors.xpath_word_monitor",
+    "json_api": "izthere.monitors.json_parser_monitor",
+}
 
 
 class Monitor(ABC):
     _registry: ClassVar[dict[str, type["Monitor"]]] = {}
 
+    _last_checked: datetime | None = None
+    _state: MonitorState | None = None
+    _state_loaded: bool = False
+    _timings: dict[str, float] | None = None
+    # why the last run failed, None when it completed
+    last_error: str | None = None
+    # exception class behind ``last_error`` (``NoData`` for an empty answer)
+    error_type: str | None = None
+    bytes_downloaded: int = 0
+
     def __init_subclass__(
         cls, *, monitor_type: str | None = None, **kwargs: Any
     ) -> None:
@@ -36,6 +63,99 @@ class Monitor(ABC):
     @abstractmethod
     def where(self) -> str: ...
 
+    def _start_run(self) -> None:
+        """Reset the per-run bookkeeping, called first thing in ``run``."""
+        self._last_checked = datetime.now(UTC)
+        _ = log_monitor.set(self.what)
+        self._timings = {}
+        self.last_error = None
+        self.error_type = None
+        self.bytes_downloaded = 0
+
+    def _failed(
+        self, message: str, error: BaseException | None = None
+    ) -> tuple[bool, str]:
+        self.last_error = message
+        self.error_type = type(error).__name__ if error is not None else "NoData"
+        return False, message
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time one step of ``run`` (fetch, extract, match…), see ``timings``."""
+        token = log_phase.set(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._timings is None:
+                self._timings = {}
+            elapsed = time.perf_counter() - start
+            self._timings[name] = self._timings.get(name, 0.0) + elapsed
+            log_phase.reset(token)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "phase %s of '%s' took %.3fs",
+                    name,
+                    self.what,
+                    elapsed,
+                    extra={"phase": name, "duration": elapsed},
+                )
+
+    @property
+    def timings(self) -> dict[str, float]:
+        """Seconds spent in each phase of the last run."""
+        return dict(self._timings or {})
+
+    @property
+    def cache_key(self) -> str | None:
+        """
+        Digest of everything that shapes the answer (url, headers, keywords…), used to
+        reuse a previous answer when the target has not changed. ``None`` opts out.
+        """
+        return None
+
+    async def load_state(self) -> MonitorState | None:
+        """
+        Outcome of the last completed run, read from the state store the first time (so
+        that it survives restarts) and kept up to date in memory afterwards.
+        """
+        if not self._state_loaded:
+            self._state_loaded = True
+            store = get_state_store()
+            key = self.cache_key
+            if store is not None and key is not None:
+                self._state = await store.get(key)
+            if self._state is not None and self._last_checked is None:
+                self._last_checked = self._state.last_checked
+        return self._state
+
+    async def unchanged_state(self, digest: str) -> MonitorState | None:
+        """Previous state when it was computed from this very body, else ``None``."""
+        state = await self.load_state()
+        if state is not None and state.digest == digest:
+            return state
+        return None
+
+    async def save_state(
+        self, digest: str | None, answer: bool, extra: str | None
+    ) -> None:
+        self._state = MonitorState(
+            digest=digest,
+            answer=answer,
+            extra=extra,
+            last_checked=self._last_checked or datetime.now(UTC),
+        )
+        self._state_loaded = True
+        store = get_state_store()
+        key = self.cache_key
+        if store is not None and key is not None:
+            await store.put(key, self._state)
+
+    async def _keep_state(self, answer: bool, extra: str | None) -> None:
+        """Record a run that received no body (``304``), the digest still holds."""
+        state = await self.load_state()
+        await self.save_state(state.digest if state else None, answer, extra)
+
     @classmethod
     def from_config(cls, cfg: dict[str, Any]) -> "Monitor":
         """
@@ -46,7 +166,9 @@ class Monitor(ABC):
         if not monitor_type:
             raise ValueError("Monitor config missing required field 'type'")
 
-        concrete_cls: type[Monitor] | None = cls._registry.get(monitor_type)
+        concrete_cls: type[Monitor] | None = load_plugin(
+            cls._registry, BUILTIN_MONITORS, "izthere.monitors", monitor_type
+        )
         if concrete_cls is None:
             raise ValueError(f"Unsupported monitor type: {monitor_type}")
 
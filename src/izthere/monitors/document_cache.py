@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from izthere.logger import get_logger
+
+logger = get_logger()
+
+T = TypeVar("T")
+
+_Key = tuple[str, str]
+
+
+class DocumentCache:
+    """
+    Short-lived, in-memory cache of parsed documents (or values derived from them).
+
+    Entries are keyed by a parse ``kind`` and the body digest, so monitors watching the
+    same page in the same tick build one tree instead of one each. Cached values are
+    shared and must be treated as read-only.
+
+    ``get_or_parse`` is safe to call from parse executor threads (one thread parses a
+    given document, the others wait for it). ``get_or_compute`` is its event loop
+    counterpart and caches the in-flight computation itself.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 32) -> None:
+        self.ttl_seconds: float = ttl_seconds
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[_Key, tuple[float, Any]] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._parse_locks: dict[_Key, threading.Lock] = {}
+
+    def _lookup(self, key: _Key) -> tuple[bool, Any]:
+        with self._lock:
+            now = time.monotonic()
+            expired = [
+                k for k, (deadline, _) in self._entries.items() if deadline <= now
+            ]
+            for k in expired:
+                del self._entries[k]
+
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def _store(self, key: _Key, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            while len(self._entries) > self.max_entries:
+                _ = self._entries.popitem(last=False)
+
+    def _discard(self, key: _Key, value: Any) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is value:
+                del self._entries[key]
+
+    def get_or_parse(self, kind: str, digest: str, parse: Callable[[], T]) -> T:
+        key = (kind, digest)
+        found, value = self._lookup(key)
+        if found:
+            logger.debug("reusing parsed document (%s, %s)", kind, digest)
+            return value
+
+        with self._lock:
+            parse_lock = self._parse_locks.setdefault(key, threading.Lock())
+        try:
+            with parse_lock:
+                found, value = self._lookup(key)
+                if found:
+                    return value
+                value = parse()
+                self._store(key, value)
+                return value
+        finally:
+            with self._lock:
+                _ = self._parse_locks.pop(key, None)
+
+    async def get_or_compute(
+        self, kind: str, digest: str, compute: Callable[[], Awaitable[T]]
+    ) -> T:
+        key = (kind, digest)
+        found, future = self._lookup(key)
+        if found:
+            logger.debug("reusing parsed document (%s, %s)", kind, digest)
+        else:
+            future = asyncio.ensure_future(compute())
+            self._store(key, future)
+            future.add_done_callback(lambda done: self._forget_failure(key, done))
+
+        # a caller cancelled while waiting leaves the computation to the others
+        return await asyncio.shield(future)
+
+    def _forget_failure(self, key: _Key, future: "asyncio.Future[Any]") -> None:
+        # never cache a failure, the next monitor gets a fresh attempt
+        if future.cancelled() or future.exception() is not None:
+            self._discard(key, future)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: DocumentCache = DocumentCache()
+
+
+def configure_document_cache(cfg: dict[str, Any] | None = None) -> DocumentCache:
+    """(Re)create the process-wide cache from the ``document_cache`` config section."""
+    global _cache
+    cfg = cfg or {}
+    _cache = DocumentCache(
+        ttl_seconds=cfg.get("ttl_seconds", 30.0),
+        max_entries=cfg.get("max_entries", 32),
+    )
+    return _cache
+
+
+def get_document_cache() -> DocumentCache:
+    return _cache
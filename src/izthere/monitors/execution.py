@@ -0,0 +1,152 @@
+import asyncio
+import hashlib
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+from izthere.logger import get_logger
+
+logger = get_logger()
+
+
+@dataclass(frozen=True)
+class ExecutionStats:
+    waiting: int  # runs queued for a slot right now
+    in_flight: int
+    peak_waiting: int
+    runs: int  # runs that got a slot
+    mean_wait_seconds: float
+    max_wait_seconds: float
+
+
+class ExecutionScheduler:
+    """
+    Admission control for monitor runs, so that a cron minute shared by many monitors
+    does not start them all at once.
+
+    A run first sleeps its jitter, a delay within ``jitter_seconds`` derived from its name
+    (the same monitor always gets the same offset, so runs stay evenly spread), then
+    waits for one of ``max_in_flight`` global slots and one of ``max_per_host`` slots of
+    its host. Either limit is disabled when unset.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int | None = None,
+        max_per_host: int | None = None,
+        jitter_seconds: float = 0.0,
+    ) -> None:
+        self.max_in_flight: int | None = max_in_flight
+        self.max_per_host: int | None = max_per_host
+        self.jitter_seconds: float = jitter_seconds
+        self._slots: asyncio.Semaphore | None = (
+            asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        )
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._waiting: int = 0
+        self._in_flight: int = 0
+        self._peak_waiting: int = 0
+        self._runs: int = 0
+        self._wait_total: float = 0.0
+        self._wait_max: float = 0.0
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any]) -> "ExecutionScheduler":
+        return cls(
+            max_in_flight=cfg.get("max_in_flight"),
+            max_per_host=cfg.get("max_per_host"),
+            jitter_seconds=cfg.get("jitter_seconds", 0.0),
+        )
+
+    def jitter_for(self, name: str) -> float:
+        if self.jitter_seconds <= 0:
+            return 0.0
+        digest = hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest) / 2**64 * self.jitter_seconds
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore | None:
+        if not self.max_per_host:
+            return None
+        host = urlsplit(url).netloc
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.max_per_host)
+            self._host_slots[host] = slot
+        return slot
+
+    @asynccontextmanager
+    async def slot(self, name: str, url: str) -> AsyncIterator[float]:
+        """
+        Hold an execution slot for the monitor ``name`` watching ``url``, yields the
+        seconds spent waiting for it (jitter excluded).
+        """
+        delay = self.jitter_for(name)
+        if delay:
+            await asyncio.sleep(delay)
+
+        host_slot = self._host_slot(url)
+        queued_at = time.monotonic()
+        self._waiting += 1
+        self._peak_waiting = max(self._peak_waiting, self._waiting)
+        try:
+            # host first: a run stuck behind a busy host must not hold a global slot
+            if host_slot is not None:
+                _ = await host_slot.acquire()
+            try:
+                if self._slots is not None:
+                    _ = await self._slots.acquire()
+            except BaseException:
+                if host_slot is not None:
+                    host_slot.release()
+                raise
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - queued_at
+        self._runs += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        if waited >= 1:
+            logger.debug(
+                "monitor '%s' waited %.1fs for an execution slot", name, waited
+            )
+
+        self._in_flight += 1
+        try:
+            yield waited
+        finally:
+            self._in_flight -= 1
+            if host_slot is not None:
+                host_slot.release()
+            if self._slots is not None:
+                self._slots.release()
+
+    def stats(self) -> ExecutionStats:
+        return ExecutionStats(
+            waiting=self._waiting,
+            in_flight=self._in_flight,
+            peak_waiting=self._peak_waiting,
+            runs=self._runs,
+            mean_wait_seconds=self._wait_total / self._runs if self._runs else 0.0,
+            max_wait_seconds=self._wait_max,
+        )
+
+
+_scheduler: ExecutionScheduler | None = None
+
+
+def configure_execution(cfg: dict[str, Any] | None = None) -> ExecutionScheduler:
+    """(Re)create the process-wide execution scheduler from the ``execution`` section."""
+    global _scheduler
+    _scheduler = ExecutionScheduler.from_config(cfg or {})
+    return _scheduler
+
+
+def get_execution() -> ExecutionScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ExecutionScheduler()
+    return _scheduler
@@ -0,0 +1,104 @@
+from html.parser import HTMLParser
+from typing import ClassVar, override
+
+
+class VisibleTextStream(HTMLParser):
+    """
+    Incremental visible-text extractor fed with decoded HTML chunks.
+
+    Text inside script/style/noscript (and template, which BeautifulSoup leaves out of
+    its text too) is dropped as it streams, the rest is returned whitespace-normalized
+    the same way ``HtmlWordMonitor._extract_visible_text`` does (stripped strings
+    joined by a single space).
+    """
+
+    SKIPPED_TAGS: ClassVar[frozenset[str]] = frozenset(
+        {"script", "style", "noscript", "template"}
+    )
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._skip_depth: int = 0
+        # raw data of the current text node, a node can span several chunks
+        self._node: list[str] = []
+        self._pieces: list[str] = []
+        self._emitted: bool = False
+
+    def _end_node(self) -> None:
+        if not self._node:
+            return
+        text = " ".join("".join(self._node).split())
+        self._node = []
+        if text:
+            self._pieces.append(text)
+
+    @override
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._end_node()
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    @override
+    def handle_endtag(self, tag: str) -> None:
+        self._end_node()
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    @override
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._node.append(data)
+
+    @override
+    def handle_comment(self, data: str) -> None:
+        self._end_node()
+
+    @override
+    def handle_decl(self, decl: str) -> None:
+        self._end_node()
+
+    @override
+    def handle_pi(self, data: str) -> None:
+        self._end_node()
+
+    @override
+    def unknown_decl(self, data: str) -> None:
+        self._end_node()
+        # a CDATA section is a string of its own to BeautifulSoup
+        if data.startswith("CDATA[") and not self._skip_depth:
+            self._node.append(data[6:])
+            self._end_node()
+
+    def _drain(self) -> str:
+        if not self._pieces:
+            return ""
+        text = " ".join(self._pieces)
+        self._pieces = []
+        if self._emitted:
+            text = " " + text
+        self._emitted = True
+        return text
+
+    def feed_chunk(self, chunk: str) -> str:
+        """Parse ``chunk`` and return the visible text completed by it."""
+        self.feed(chunk)
+        return self._drain()
+
+    def truncate(self) -> str:
+        """
+        Flush the text node still open when the document is cut short. Unlike
+        ``finish`` the end is not the end of the text: its last word may go on.
+        """
+        raw = "".join(self._node)
+        self._node = []
+        text = " ".join(raw.split())
+        if text:
+            # trailing whitespace still tells the last word is complete
+            self._pieces.append(text + " " if raw[-1].isspace() else text)
+        return self._drain()
+
+    def finish(self) -> str:
+        """Flush buffered data at the end of the document."""
+        self.close()
+        self._end_node()
+        return self._drain()
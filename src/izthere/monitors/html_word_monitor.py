@@ -1,11 +1,20 @@
-import re
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Any, override
 
-from bs4 import BeautifulSoup  # <-- new dependency
-
 from izthere.logger import get_logger
-from izthere.monitors.web_utils import fetch_html
+from izthere.monitors.document_cache import get_document_cache
+from izthere.monitors.html_stream import VisibleTextStream
+from izthere.monitors.http_client import get_client_manager
+from izthere.monitors.keyword_matcher import KeywordMatcher, MatchMode
+from izthere.monitors.parse_executor import get_parse_executor
+from izthere.monitors.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    get_response_cache,
+    make_cache_key,
+)
+from izthere.monitors.text_extractors import TEXT_BACKENDS, TextBackend
+from izthere.monitors.web_utils import ResponseTooLarge, fetch, stream
 
 from .base import Monitor
 
@@ -25,16 +34,54 @@ class HtmlWordMonitor(Monitor, monitor_type="html_word"):
         keywords: list[str],
         timeout_seconds: int = 10,
         case_sensitive: bool = False,
+        match_mode: MatchMode = "substring",
         headers: dict[str, str] | None = None,
+        max_response_bytes: int | None = None,
+        streaming: bool = False,
+        max_bytes: int | None = None,
+        stop_on_first_match: bool = False,
+        text_backend: TextBackend = "bs4",
     ) -> None:
         self.question: str = name
         self.url: str = url
         self.keywords: list[str] = keywords
         self.case_sensitive: bool = case_sensitive
+        self.match_mode: MatchMode = match_mode
+        self.matcher: KeywordMatcher = KeywordMatcher(
+            keywords, case_sensitive=case_sensitive, mode=match_mode
+        )
         self.timeout: int = timeout_seconds
         self.headers: dict[str, str] | None = headers
+        # None: the http section's limit
+        self.max_response_bytes: int | None = max_response_bytes
+        self.streaming: bool = streaming
+        self.max_bytes: int | None = max_bytes
+        self.stop_on_first_match: bool = stop_on_first_match
+        self.text_backend: TextBackend = text_backend
         self._last_checked: datetime | None = None
 
+        if text_backend not in TEXT_BACKENDS:
+            raise ValueError(
+                f"text backend not valid {text_backend}, expected one of {list(TEXT_BACKENDS)}"
+            )
+
+        # max_bytes stops reading and answers, max_response_bytes fails the run: past
+        # the latter the former could never apply
+        limit = (
+            get_client_manager().max_response_bytes
+            if max_response_bytes is None
+            else max_response_bytes
+        )
+        if max_bytes and limit and max_bytes >= limit:
+            raise ValueError(
+                f"max_bytes ({max_bytes}) must be below max_response_bytes ({limit})"
+            )
+
+        if streaming and match_mode == "regex":
+            raise ValueError(
+                "streaming html_word monitors do not support regex keywords"
+            )
+
     @classmethod
     @override
     def from_config(cls, cfg: dict[str, Any]) -> "HtmlWordMonitor":
@@ -43,21 +90,19 @@ class HtmlWordMonitor(Monitor, monitor_type="html_word"):
             url=cfg["url"],
             keywords=cfg["keywords"],
             headers=cfg.get("headers"),
+            max_response_bytes=cfg.get("max_response_bytes"),
             timeout_seconds=cfg.get("timeout_seconds", 10),
             case_sensitive=cfg.get("case_sensitive", False),
+            match_mode=cfg.get("match_mode", "substring"),
+            streaming=cfg.get("streaming", False),
+            max_bytes=cfg.get("max_bytes"),
+            stop_on_first_match=cfg.get("stop_on_first_match", False),
+            text_backend=cfg.get("text_backend", "bs4"),
         )
 
     @staticmethod
-    def _extract_visible_text(html: str) -> str:
-        soup: BeautifulSoup = BeautifulSoup(html, "html.parser")
-
-        # initial trim of uninteresting invisible content
-        for element in soup(["script", "style", "noscript"]):
-            element.decompose()
-
-        # retrieve text we are interested in
-        text = soup.get_text(separator=" ", strip=True)
-        return re.sub(r"\s+", " ", text)
+    def _extract_visible_text(html: str, backend: TextBackend = "bs4") -> str:
+        return TEXT_BACKENDS[backend](html)
 
     @property
     @override
@@ -74,32 +119,178 @@ class HtmlWordMonitor(Monitor, monitor_type="html_word"):
     def where(self) -> str:
         return self.url
 
+    @property
+    @override
+    def cache_key(self) -> str:
+        return make_cache_key(
+            self.monitor_type,
+            self.url,
+            self.headers,
+            self.keywords,
+            self.case_sensitive,
+            self.match_mode,
+            self.streaming and self.stop_on_first_match,
+        )
+
     @override
     async def run(self) -> tuple[bool, str | None]:
-        logger.debug(f"[{self.monitor_type}] executing monitor '{self.question}'")
-        self._last_checked = datetime.now(timezone.utc)
+        logger.debug("[%s] executing monitor '%s'", self.monitor_type, self.question)
+        self._start_run()
+
+        cache = get_response_cache()
+        cached = await cache.get(self.cache_key) if cache else None
+        if self.streaming:
+            return await self._run_streaming(cache, cached)
 
         try:
-            html = await fetch_html(
-                url=self.url, timeout=self.timeout, headers=self.headers
+            with self.phase("fetch"):
+                resp = await fetch(
+                    url=self.url,
+                    timeout=self.timeout,
+                    headers=self.headers,
+                    validators=cached.validators if cached else None,
+                    max_bytes=self.max_response_bytes,
+                )
+        except ResponseTooLarge as e:
+            logger.warning("[%s] monitor '%s': %s", self.monitor_type, self.question, e)
+            return self._failed(str(e), e)
+        except Exception as e:  # noqa: BLE001
+            return self._failed(f"unexpected error fix me! {e}", e)
+        self.bytes_downloaded = resp.bytes_downloaded
+
+        if resp.not_modified and cached:
+            logger.info(
+                "[%s] monitor '%s' not modified, answer=%s",
+                self.monitor_type,
+                self.question,
+                cached.answer,
+            )
+            await self._keep_state(cached.answer, cached.extra)
+            return cached.answer, cached.extra
+
+        if not resp.content:
+            return self._failed("no data retrieved, fix me!")
+
+        if (state := await self.unchanged_state(resp.digest)) is not None:
+            logger.info(
+                "[%s] monitor '%s' body unchanged, answer=%s",
+                self.monitor_type,
+                self.question,
+                state.answer,
+            )
+            await self.save_state(resp.digest, state.answer, state.extra)
+            if cache:
+                await cache.put(
+                    self.cache_key, resp.validators, state.answer, state.extra
+                )
+            return state.answer, state.extra
+
+        with self.phase("extract"):
+            visible_text: str = await get_document_cache().get_or_compute(
+                f"visible_text:{self.text_backend}",
+                resp.digest,
+                lambda: get_parse_executor().run(
+                    _visible_text_job, resp.content, resp.encoding, self.text_backend
+                ),
             )
-        except Exception as e:
-            return False, f"unexpected error fix me! {e}"
 
-        if not html:
-            return False, "no data retrieved, fix me!"
+        with self.phase("match"):
+            matches = self.matcher.find(visible_text)
+        answer: bool = bool(matches)
+        extra = KeywordMatcher.describe(matches)
+        logger.info(
+            "[%s] monitor '%s' executed, answer=%s",
+            self.monitor_type,
+            self.question,
+            answer,
+        )
+        await self.save_state(resp.digest, answer, extra)
+        if cache:
+            await cache.put(self.cache_key, resp.validators, answer, extra)
+        return answer, extra
 
-        visible_text: str = self._extract_visible_text(html)
+    async def _run_streaming(
+        self, cache: ResponseCache | None, cached: CachedResponse | None
+    ) -> tuple[bool, str | None]:
+        """
+        Search the visible text while the page downloads and stop reading as soon as the
+        answer is known (all keywords found, or the first one with
+        ``stop_on_first_match``) or ``max_bytes`` have been read, counted once
+        decompressed like ``max_response_bytes``.
+        """
+        parser = VisibleTextStream()
+        scanner = self.matcher.scanner()
+        truncated = False
+        try:
+            with self.phase("stream"):
+                async with stream(
+                    url=self.url,
+                    timeout=self.timeout,
+                    headers=self.headers,
+                    validators=cached.validators if cached else None,
+                    max_bytes=self.max_response_bytes,
+                ) as resp:
+                    if resp.not_modified and cached:
+                        logger.info(
+                            "[%s] monitor '%s' not modified, answer=%s",
+                            self.monitor_type,
+                            self.question,
+                            cached.answer,
+                        )
+                        await self._keep_state(cached.answer, cached.extra)
+                        return cached.answer, cached.extra
 
-        if self.case_sensitive:
-            page_text = visible_text
-            search_keywords = self.keywords
-        else:
-            page_text = visible_text.lower()
-            search_keywords = [kw.lower() for kw in self.keywords]
+                    validators = resp.validators
+                    async for chunk in resp.aiter_text():
+                        scanner.feed(parser.feed_chunk(chunk))
+                        if scanner.found_all or (
+                            self.stop_on_first_match and scanner.found_any
+                        ):
+                            break
+                        if self.max_bytes and resp.bytes_read >= self.max_bytes:
+                            truncated = True
+                            # not final: a word touching the cut may go on past it
+                            scanner.feed(parser.truncate())
+                            break
+                    else:
+                        scanner.feed(parser.finish(), final=True)
+                    read = resp.bytes_read
+                    self.bytes_downloaded = resp.bytes_downloaded
+        except ResponseTooLarge as e:
+            logger.warning("[%s] monitor '%s': %s", self.monitor_type, self.question, e)
+            return self._failed(str(e), e)
+        except Exception as e:  # noqa: BLE001
+            return self._failed(f"unexpected error fix me! {e}", e)
 
-        answer: bool = any(kw in page_text for kw in search_keywords)
+        if not read:
+            return self._failed("no data retrieved, fix me!")
+
+        # a match cut off by an early stop is settled with what was seen so far, except
+        # at the max_bytes cut, where the page goes on
+        if not truncated:
+            scanner.close()
+        answer = scanner.found_any
+        extra = KeywordMatcher.describe(scanner.matches)
+        if truncated:
+            note = f"page truncated at {read} bytes (max_bytes={self.max_bytes})"
+            extra = f"{extra}, {note}" if extra else note
         logger.info(
-            f"[{self.monitor_type}] monitor '{self.question}' executed, answer={answer}"
+            "[%s] monitor '%s' executed (streamed %s bytes), answer=%s",
+            self.monitor_type,
+            self.question,
+            read,
+            answer,
         )
-        return answer, None
+        # the body is not hashed while streaming, identical pages are not skipped
+        await self.save_state(None, answer, extra)
+        if cache and not truncated:
+            await cache.put(self.cache_key, validators, answer, extra)
+        return answer, extra
+
+
+def _visible_text_job(
+    content: bytes, encoding: str | None, backend: TextBackend
+) -> str:
+    """Parse job, runs in the parse executor (possibly in another process)."""
+    html = content.decode(encoding or "utf-8", errors="replace")
+    return HtmlWordMonitor._extract_visible_text(html, backend)  # pyright: ignore[reportPrivateUsage]
@@ -0,0 +1,133 @@
+import asyncio
+import importlib.util
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, Final
+from urllib.parse import urlsplit
+
+import httpx
+
+from izthere.logger import get_logger
+
+logger = get_logger()
+
+# default cap on a response body, a runaway endpoint must not exhaust the memory
+DEFAULT_MAX_RESPONSE_BYTES: Final[int] = 50 * 1024 * 1024
+
+# (sorted headers, timeout) identifying one pooled client
+_ProfileKey = tuple[tuple[tuple[str, str], ...], float]
+
+
+class ClientManager:
+    """
+    Process-wide owner of pooled ``httpx.AsyncClient`` instances.
+
+    One client is kept per header/timeout profile so that monitors hitting the same
+    hosts reuse keep-alive connections (and HTTP/2 streams when enabled) instead of
+    paying a TCP + TLS handshake on every run.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_connections_per_host: int | None = None,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        max_response_bytes: int | None = DEFAULT_MAX_RESPONSE_BYTES,
+    ) -> None:
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning(
+                "http2 requested but the 'h2' package is not installed, falling back to HTTP/1.1"
+            )
+            http2 = False
+
+        self.limits: httpx.Limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_connections_per_host: int | None = max_connections_per_host
+        self.http2: bool = http2
+        self.max_response_bytes: int | None = max_response_bytes
+        self._clients: dict[_ProfileKey, httpx.AsyncClient] = {}
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any]) -> "ClientManager":
+        return cls(
+            max_connections=cfg.get("max_connections", 100),
+            max_keepalive_connections=cfg.get("max_keepalive_connections", 20),
+            max_connections_per_host=cfg.get("max_connections_per_host"),
+            keepalive_expiry=cfg.get("keepalive_expiry_seconds", 30.0),
+            http2=cfg.get("http2", False),
+            max_response_bytes=cfg.get(
+                "max_response_bytes", DEFAULT_MAX_RESPONSE_BYTES
+            ),
+        )
+
+    def client(
+        self, headers: dict[str, str] | None = None, timeout: float = 10
+    ) -> httpx.AsyncClient:
+        """Return the pooled client for this header/timeout profile, creating it once."""
+        key: _ProfileKey = (tuple(sorted((headers or {}).items())), float(timeout))
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                headers=headers,
+                timeout=timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._clients[key] = client
+            logger.debug("created pooled http client #%s", len(self._clients))
+        return client
+
+    @asynccontextmanager
+    async def host_slot(self, url: str) -> AsyncIterator[None]:
+        """Hold one of the per-host connection slots for the duration of a request."""
+        if not self.max_connections_per_host:
+            yield
+            return
+
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.max_connections_per_host)
+            self._host_slots[host] = slot
+        async with slot:
+            yield
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._host_slots.clear()
+        for client in clients:
+            await client.aclose()
+        logger.debug("closed %s pooled http client(s)", len(clients))
+
+
+_manager: ClientManager | None = None
+
+
+def configure_client_manager(cfg: dict[str, Any] | None = None) -> ClientManager:
+    """(Re)create the process-wide client manager from the ``http`` config section."""
+    global _manager
+    _manager = ClientManager.from_config(cfg or {})
+    return _manager
+
+
+def get_client_manager() -> ClientManager:
+    global _manager
+    if _manager is None:
+        _manager = ClientManager()
+    return _manager
+
+
+async def close_client_manager() -> None:
+    global _manager
+    if _manager is not None:
+        await _manager.aclose()
+        _manager = None
@@ -1,73 +1,39 @@
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from typing import Any, Callable
-
-from typing_extensions import override
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from datetime import datetime
+from typing import Any, override
 
 from izthere.logger import get_logger
 from izthere.monitors.base import Monitor
-from izthere.monitors.web_utils import fetch_json
+from izthere.monitors.json_stream import JSONItemStream
+from izthere.monitors.pagination import Pagination
+from izthere.monitors.predicates import (
+    ItemPredicate,
+    Predicate,
+    SubParser,
+    compile_all,
+    resolve_path,
+    split_path,
+)
+from izthere.monitors.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    get_response_cache,
+    make_cache_key,
+)
+from izthere.monitors.seen_store import SeenBatch, get_seen_store
+from izthere.monitors.web_utils import FetchResult, ResponseTooLarge, fetch, stream
 
 logger = get_logger()
 
 
-@dataclass
-class SubParser:
-    items_path: str
-    predicates: list["Predicate"] = field(default_factory=list)
-
-    @classmethod
-    def from_config(cls, data: dict[str, Any]) -> "SubParser":
-        return cls(
-            items_path=data["items_path"],
-            predicates=[Predicate.from_config(p) for p in data.get("predicates", [])],
-        )
-
-
-@dataclass
-class Predicate:
-    op: str
-    path: str | None = None
-    value: str | int | list[str] | None = None
-    # If op is 'sub_parser', this contains the nested configuration
-    parser: SubParser | None = None
-
-    @classmethod
-    def from_config(cls, data: dict[str, Any]) -> "Predicate":
-        parser_data: dict[str, Any] | None = data.get("parser")
-        return cls(
-            op=data.get("op", ""),
-            path=data.get("path"),
-            value=data.get("value"),
-            parser=SubParser.from_config(parser_data) if parser_data else None,
-        )
-
-
 class JSONParserMonitor(Monitor, monitor_type="json_api"):
     """
     A generic JSON API monitor that evaluates a list of predicates,
     including nested sub-parsers for array-based filtering.
     """
 
-    # map of predicates operator evaluation logic
-    OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
-        "equal_insensitive": lambda val, target: (
-            str(val).lower() == str(target).lower()
-        ),
-        "contains_insensitive": lambda val, target: (
-            str(target).lower() in str(val).lower()
-        ),
-        "contains_any_insensitive": lambda val, targets: any(
-            str(t).lower() in str(val).lower() for t in targets
-        ),
-        "any_item_contains_insensitive": lambda val, target: any(
-            str(target).lower() in str(item).lower() for item in val
-        ),
-        "any_item_contains_any_insensitive": lambda val, targets: any(
-            str(t).lower() in str(item).lower() for t in targets for item in val
-        ),
-    }
-
     def __init__(
         self,
         name: str,
@@ -77,16 +43,36 @@ class JSONParserMonitor(Monitor, monitor_type="json_api"):
         extras_path: str | None = None,
         timeout_seconds: int = 15,
         headers: dict[str, str] | None = None,
+        streaming: bool = False,
+        stop_on_first_match: bool = False,
+        identity_path: str | None = None,
+        max_response_bytes: int | None = None,
+        pagination: Pagination | None = None,
     ) -> None:
         self.question: str = name
         self.url: str = url
         self.items_path: str | None = items_path
         self.extras_path: str | None = extras_path
         self.predicates: list[Predicate] = predicates
+        # compiled once, invalid operators are reported at startup
+        self._match: ItemPredicate = compile_all(predicates)
+        self._items_path: tuple[str, ...] = split_path(items_path)
+        self._extras_path: tuple[str, ...] = split_path(extras_path)
         self.timeout_seconds: int = timeout_seconds
         self.headers: dict[str, str] | None = headers
+        self.streaming: bool = streaming
+        self.stop_on_first_match: bool = stop_on_first_match
+        # with an identity, items already seen unchanged by a previous run are skipped
+        self.identity_path: str | None = identity_path
+        self._identity_path: tuple[str, ...] = split_path(identity_path)
+        # None: the http section's limit
+        self.max_response_bytes: int | None = max_response_bytes
+        self.pagination: Pagination | None = pagination
         self._last_checked: datetime | None = None
 
+        if streaming and pagination is not None:
+            raise ValueError("streaming json_api monitors do not support pagination")
+
     @classmethod
     @override
     def from_config(cls, cfg: dict[str, Any]) -> "JSONParserMonitor":
@@ -98,93 +84,381 @@ class JSONParserMonitor(Monitor, monitor_type="json_api"):
             extras_path=cfg.get("extras_path"),
             headers=cfg.get("headers"),
             timeout_seconds=cfg.get("timeout_seconds", 15),
+            streaming=cfg.get("streaming", False),
+            stop_on_first_match=cfg.get("stop_on_first_match", False),
+            identity_path=cfg.get("identity_path"),
+            max_response_bytes=cfg.get("max_response_bytes"),
+            pagination=(
+                Pagination.from_config(cfg["pagination"])
+                if cfg.get("pagination")
+                else None
+            ),
         )
 
     def _evaluate_predicate(self, item: Any, pred: Predicate) -> bool:
-        if pred.op == "sub_parser" and pred.parser:
-            sub_items: Any | None = item.get(pred.parser.items_path)
-            if not sub_items:
-                return False
-
-            if isinstance(sub_items, list):
-                return any(
-                    all(
-                        self._evaluate_predicate(si, sp)
-                        for sp in pred.parser.predicates
-                    )
-                    for si in sub_items
-                )
-            elif isinstance(sub_items, dict):
-                return all(
-                    self._evaluate_predicate(sub_items, sp)
-                    for sp in pred.parser.predicates
-                )
-            else:
-                return False
-
-        actual_value = item.get(pred.path) if pred.path else item
-        op_func = self.OPERATORS.get(pred.op)
-
-        if not op_func:
-            raise ValueError(f"operator not valid {pred.op}")
-
-        res = op_func(actual_value, pred.value)
+        return pred.evaluate(item)
+
+    def _extract_extra(self, item: Any) -> str | None:
+        if not self._extras_path:
+            return None
+        extra_data = resolve_path(item, self._extras_path)
+        return str(extra_data) if extra_data else None
+
+    async def _begin_seen(self) -> SeenBatch | None:
+        store = get_seen_store()
+        if not self._identity_path or store is None:
+            return None
+        return await store.begin(self.cache_key, self._identity_path)
+
+    async def _commit_seen(self, seen: SeenBatch | None) -> None:
+        store = get_seen_store()
+        if seen is None or store is None:
+            return
+        try:
+            await store.commit(seen)
+        except Exception as e:  # noqa: BLE001
+            logger.error("Failed to record seen items of '%s': %s", self.question, e)
+            return
         logger.debug(
-            f"evaluation of predicate {pred.op} using actual={actual_value}, predicate_value={pred.value}, result={res}"
+            "[%s] monitor '%s' skipped %s already seen item(s)",
+            self.monitor_type,
+            self.question,
+            seen.skipped,
         )
-        return res
+
+    def _page_items(self, data: Any) -> list[Any]:
+        items = resolve_path(data, self._items_path) if isinstance(data, dict) else data
+        if isinstance(items, dict):
+            return [items]
+        return items if isinstance(items, list) else []
+
+    def _evaluate_items(
+        self, items: list[Any], seen: SeenBatch | None, matches: list[str]
+    ) -> bool:
+        """True when an item matches, their extras are added to ``matches``."""
+        found = False
+        for item in items:
+            if seen is not None and not seen.is_new(item):
+                continue
+            if self._match(item):
+                found = True
+                # extract the extras if any
+                extra_data = self._extract_extra(item)
+                if extra_data:
+                    matches.append(extra_data)
+                if self.stop_on_first_match:
+                    break
+        return found
+
+    def _replayable(
+        self, seen: SeenBatch | None, found: bool, extra: str | None
+    ) -> tuple[bool, str | None]:
+        # the answer for this same document next time: it holds no new item then, a 304
+        # or an identical body must not report them again
+        return (False, None) if seen is not None else (found, extra)
 
     @override
     async def run(self) -> tuple[bool, str | None]:
-        self._last_checked = datetime.now(timezone.utc)
+        self._start_run()
+
+        if self.pagination is not None:
+            return await self._run_paginated(self.pagination)
+
+        cache = get_response_cache()
+        cached = await cache.get(self.cache_key) if cache else None
+        if self.streaming:
+            return await self._run_streaming(cache, cached)
 
         try:
-            data: dict[str, Any] | list[dict[str, Any]] = await fetch_json(
-                url=self.url, timeout=self.timeout_seconds, headers=self.headers
-            )
-            if isinstance(data, dict):
-                items = data.get(self.items_path) if self.items_path else data
-            else:
-                items = data
+            with self.phase("fetch"):
+                resp = await fetch(
+                    url=self.url,
+                    timeout=self.timeout_seconds,
+                    headers=self.headers,
+                    validators=cached.validators if cached else None,
+                    max_bytes=self.max_response_bytes,
+                )
+            self.bytes_downloaded = resp.bytes_downloaded
+            if resp.not_modified and cached:
+                logger.info(
+                    "[%s] monitor '%s' not modified, answer=%s",
+                    self.monitor_type,
+                    self.question,
+                    cached.answer,
+                )
+                await self._keep_state(cached.answer, cached.extra)
+                return cached.answer, cached.extra
+
+            if (state := await self.unchanged_state(resp.digest)) is not None:
+                logger.info(
+                    "[%s] monitor '%s' body unchanged, answer=%s",
+                    self.monitor_type,
+                    self.question,
+                    state.answer,
+                )
+                await self.save_state(resp.digest, state.answer, state.extra)
+                if cache:
+                    await cache.put(
+                        self.cache_key, resp.validators, state.answer, state.extra
+                    )
+                return state.answer, state.extra
+
+            with self.phase("decode"):
+                data: dict[str, Any] | list[dict[str, Any]] = resp.json()
+                if isinstance(data, dict):
+                    items = resolve_path(data, self._items_path)
+                else:
+                    items = data
+
+        except ResponseTooLarge as e:
+            logger.warning("[%s] monitor '%s': %s", self.monitor_type, self.question, e)
+            return self._failed(str(e), e)
+        except Exception as e:  # noqa: BLE001
+            logger.error("Failed to fetch JSON from %s: %s", self.url, e)
+            return self._failed(f"unexpected error fix me! {e}", e)
+
+        if not items:
+            return self._failed("no data retrieved, fix me!")
 
-        except Exception as e:
-            logger.error(f"Failed to fetch JSON from {self.url}: {e}")
-            return False, f"unexpected error fix me! {e}"
+        if isinstance(items, dict):
+            items = [items]
 
+        found = False
         matches: list[str] = []
+        seen = await self._begin_seen()
+        with self.phase("evaluate"):
+            if isinstance(items, list):
+                found = self._evaluate_items(items, seen, matches)
+
+        extra = "\n".join(matches) if matches else None
+        await self._commit_seen(seen)
+        answer, replay_extra = self._replayable(seen, found, extra)
+        await self.save_state(resp.digest, answer, replay_extra)
+        if cache:
+            await cache.put(self.cache_key, resp.validators, answer, replay_extra)
+        return found, extra
+
+    async def _run_paginated(self, pagination: Pagination) -> tuple[bool, str | None]:
+        """
+        Walk the pages of the collection, evaluating each page as it arrives. With
+        ``stop_on_first_match`` pages are evaluated in page order and the walk stops at
+        the first matching item, the pages after it are not requested: as with a single
+        document, the items after the match are not checked against the seen items.
+        """
+        # extras by page, reported in page order whatever order the pages arrived in
+        matches: dict[int, list[str]] = {}
         found = False
-
-        if not items:
-            return False, "no data retrieved, fix me!"
-
-        if isinstance(items, list):
-            for item in items:
-                if all(self._evaluate_predicate(item, p) for p in self.predicates):
-                    found = True
-                    # extract the extras if any
-                    if self.extras_path:
-                        extras_sub_paths = self.extras_path.strip(".").split(".")
-                        extra_data = item
-                        for sp in extras_sub_paths:
-                            if not isinstance(extra_data, dict):
+        count = 0
+        try:
+            seen = await self._begin_seen()
+            pages = (
+                self._walk_sequential(pagination)
+                if pagination.sequential
+                else self._walk_window(pagination, ordered=self.stop_on_first_match)
+            )
+            async with aclosing(pages):
+                async for index, items in pages:
+                    count += len(items)
+                    with self.phase("evaluate"):
+                        page_matches = matches[index] = []
+                        found = self._evaluate_items(items, seen, page_matches) or found
+                    if found and self.stop_on_first_match:
+                        break
+        except ResponseTooLarge as e:
+            logger.warning("[%s] monitor '%s': %s", self.monitor_type, self.question, e)
+            return self._failed(str(e), e)
+        except Exception as e:  # noqa: BLE001
+            logger.error("Failed to fetch JSON from %s: %s", self.url, e)
+            return self._failed(f"unexpected error fix me! {e}", e)
+
+        if not count:
+            return self._failed("no data retrieved, fix me!")
+
+        extras = [m for index in sorted(matches) for m in matches[index]]
+        extra = "\n".join(extras) if extras else None
+        logger.info(
+            "[%s] monitor '%s' executed (%s pages, %s items), answer=%s",
+            self.monitor_type,
+            self.question,
+            len(matches),
+            count,
+            found,
+        )
+        await self._commit_seen(seen)
+        answer, replay_extra = self._replayable(seen, found, extra)
+        # several bodies: neither the validators nor a digest of one page apply
+        await self.save_state(None, answer, replay_extra)
+        return found, extra
+
+    async def _fetch_page(self, url: str) -> tuple[FetchResult, list[Any], Any]:
+        with self.phase("fetch"):
+            resp = await fetch(
+                url=url,
+                timeout=self.timeout_seconds,
+                headers=self.headers,
+                max_bytes=self.max_response_bytes,
+            )
+        self.bytes_downloaded += resp.bytes_downloaded
+        with self.phase("decode"):
+            data = resp.json()
+            items = self._page_items(data)
+        return resp, items, data
+
+    async def _walk_window(
+        self, pagination: Pagination, ordered: bool = False
+    ) -> AsyncGenerator[tuple[int, list[Any]], None]:
+        """
+        ``(page index, items)`` as the pages arrive, up to ``concurrency`` of them being
+        fetched (or held) at once. Pages past the first empty or short one are dropped.
+        When ``ordered`` a page arriving early is held until the pages before it are out.
+        """
+        pending: dict[asyncio.Task[tuple[FetchResult, list[Any], Any]], int] = {}
+        # pages arrived ahead of an earlier one, when ordered
+        ready: dict[int, list[Any]] = {}
+        scheduled = 0
+        next_index = 0
+        last: int | None = None
+        try:
+            while True:
+                while (
+                    last is None
+                    and scheduled < pagination.max_pages
+                    and len(pending) + len(ready) < pagination.concurrency
+                ):
+                    url = pagination.page_url(self.url, scheduled)
+                    pending[asyncio.create_task(self._fetch_page(url))] = scheduled
+                    scheduled += 1
+                if not pending:
+                    return
+
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                arrived = sorted((pending.pop(task), task) for task in done)
+                for index, task in arrived:
+                    if last is not None and index > last:
+                        _ = task.exception()
+                        continue
+                    _, items, _ = task.result()
+                    if pagination.is_last(len(items)):
+                        last = index
+                        for other, other_index in list(pending.items()):
+                            if other_index > last:
+                                _ = other.cancel()
+                                del pending[other]
+                        for other_index in [i for i in ready if i > last]:
+                            del ready[other_index]
+                    if not ordered:
+                        yield index, items
+                        continue
+                    ready[index] = items
+                    while next_index in ready:
+                        yield next_index, ready.pop(next_index)
+                        next_index += 1
+        finally:
+            for task in pending:
+                if not task.done():
+                    _ = task.cancel()
+                elif not task.cancelled():
+                    _ = task.exception()  # dropped, the walk is over
+
+    async def _walk_sequential(
+        self, pagination: Pagination
+    ) -> AsyncGenerator[tuple[int, list[Any]], None]:
+        """``(page index, items)``, following the cursors or Link headers."""
+        url: str | None = pagination.first_url(self.url)
+        for index in range(pagination.max_pages):
+            if url is None:
+                return
+            resp, items, data = await self._fetch_page(url)
+            yield index, items
+            if pagination.is_last(len(items)):
+                return
+            next_url = pagination.next_url(self.url, data, resp.next_link)
+            # a cursor pointing back at this page would loop until max_pages
+            url = next_url if next_url != url else None
+
+    async def _run_streaming(
+        self, cache: ResponseCache | None, cached: CachedResponse | None
+    ) -> tuple[bool, str | None]:
+        """
+        Evaluate items one by one while the document downloads, only one item is held in
+        memory at a time. With ``stop_on_first_match`` the download stops at the first
+        matching item.
+        """
+        parser = JSONItemStream(self._items_path)
+        found = False
+        count = 0
+        matches: list[str] = []
+        try:
+            seen = await self._begin_seen()
+            with self.phase("stream"):
+                async with stream(
+                    url=self.url,
+                    timeout=self.timeout_seconds,
+                    headers=self.headers,
+                    validators=cached.validators if cached else None,
+                    max_bytes=self.max_response_bytes,
+                ) as resp:
+                    if resp.not_modified and cached:
+                        logger.info(
+                            "[%s] monitor '%s' not modified, answer=%s",
+                            self.monitor_type,
+                            self.question,
+                            cached.answer,
+                        )
+                        await self._keep_state(cached.answer, cached.extra)
+                        return cached.answer, cached.extra
+
+                    validators = resp.validators
+                    chunks = resp.aiter_text()
+                    while not (found and self.stop_on_first_match) and not parser.done:
+                        chunk = await anext(chunks, None)
+                        batch = (
+                            parser.feed(chunk) if chunk is not None else parser.close()
+                        )
+                        for item in batch:
+                            count += 1
+                            if seen is not None and not seen.is_new(item):
+                                continue
+                            if not self._match(item):
+                                continue
+                            found = True
+                            extra_data = self._extract_extra(item)
+                            if extra_data:
+                                matches.append(extra_data)
+                            if self.stop_on_first_match:
                                 break
-                            extra_data = extra_data.get(sp) if extra_data else None
-                        if extra_data:
-                            matches.append(str(extra_data))
-        elif isinstance(items, dict):
-            if all(self._evaluate_predicate(items, p) for p in self.predicates):
-                found = True
-                if self.extras_path:
-                    extras_sub_paths = self.extras_path.split(".")
-                    extra_data = items
-                    for sp in extras_sub_paths:
-                        if not isinstance(extra_data, dict):
+                        if chunk is None:
                             break
-                        extra_data = extra_data.get(sp) if extra_data else None
-                    if extra_data:
-                        matches.append(str(extra_data))
-
-        return found, "\n".join(matches) if matches else None
+                    downloaded = resp.bytes_downloaded
+                    self.bytes_downloaded = downloaded
+        except ResponseTooLarge as e:
+            logger.warning("[%s] monitor '%s': %s", self.monitor_type, self.question, e)
+            return self._failed(str(e), e)
+        except Exception as e:  # noqa: BLE001
+            logger.error("Failed to fetch JSON from %s: %s", self.url, e)
+            return self._failed(f"unexpected error fix me! {e}", e)
+
+        if not count:
+            return self._failed("no data retrieved, fix me!")
+
+        extra = "\n".join(matches) if matches else None
+        logger.info(
+            "[%s] monitor '%s' executed (streamed %s items, %s bytes), answer=%s",
+            self.monitor_type,
+            self.question,
+            count,
+            downloaded,
+            found,
+        )
+        await self._commit_seen(seen)
+        answer, replay_extra = self._replayable(seen, found, extra)
+        # the body is not hashed while streaming, identical documents are not skipped
+        await self.save_state(None, answer, replay_extra)
+        if cache:
+            await cache.put(self.cache_key, validators, answer, replay_extra)
+        return found, extra
 
     @property
     @override
@@ -201,10 +475,28 @@ class JSONParserMonitor(Monitor, monitor_type="json_api"):
     def where(self) -> str:
         return self.url
 
+    @property
+    @override
+    def cache_key(self) -> str:
+        parts: list[Any] = [
+            self.monitor_type,
+            self.url,
+            self.headers,
+            self.items_path,
+            self.extras_path,
+            self.predicates,
+            self.stop_on_first_match,
+            self.identity_path,
+            self.pagination,
+        ]
+        # with identity_path the seen items, and the answers replayed from them, are what
+        # this monitor has reported: another one on the same endpoint keeps its own
+        if self.identity_path:
+            parts.append(self.question)
+        return make_cache_key(*parts)
 
-if __name__ == "__main__":
-    import asyncio
 
+if __name__ == "__main__":
     monitor = JSONParserMonitor(
         name="test",
         url="https://api.ashbyhq.com/posting-api/job-board/duck-duck-go",
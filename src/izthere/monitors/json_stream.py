@@ -0,0 +1,219 @@
+import json
+import re
+from json.decoder import scanstring  # pyright: ignore[reportAttributeAccessIssue]
+from typing import Any, Final
+
+# characters that matter while skipping over a value, everything else is jumped over
+_STRUCTURAL: Final[re.Pattern[str]] = re.compile(r'["\[\]{}]')
+_STRING_SPECIAL: Final[re.Pattern[str]] = re.compile(r'["\\]')
+_SCALAR_END: Final[re.Pattern[str]] = re.compile(r"[,\]}\s]")
+_WHITESPACE: Final[re.Pattern[str]] = re.compile(r"[ \t\n\r]*")
+
+_DECODER: Final[json.JSONDecoder] = json.JSONDecoder()
+
+
+class _ValueScanner:
+    """Finds where one JSON value ends, resumable when the buffer is incomplete."""
+
+    def __init__(self, buf: str, start: int) -> None:
+        self.start: int = start
+        self.depth: int = 0
+        first = buf[start]
+        self.scalar: bool = first not in '"[{'
+        self.in_string: bool = first == '"'
+        self.i: int = start + 1 if self.in_string else start
+
+    def shift(self, offset: int) -> None:
+        self.start -= offset
+        self.i -= offset
+
+    def scan(self, buf: str, final: bool) -> int | None:
+        """End index (exclusive) of the value, ``None`` if more data is needed."""
+        if self.scalar:
+            m = _SCALAR_END.search(buf, self.i)
+            if m is not None:
+                return m.start()
+            if final:
+                return len(buf)
+            self.i = len(buf)
+            return None
+
+        i = self.i
+        while True:
+            if self.in_string:
+                m = _STRING_SPECIAL.search(buf, i)
+                if m is None:
+                    self.i = len(buf)
+                    return None
+                j = m.start()
+                if buf[j] == "\\":
+                    if j + 1 >= len(buf):
+                        self.i = j
+                        return None
+                    i = j + 2
+                    continue
+                self.in_string = False
+                i = j + 1
+                if self.depth == 0:
+                    return i
+                continue
+
+            m = _STRUCTURAL.search(buf, i)
+            if m is None:
+                self.i = len(buf)
+                return None
+            j = m.start()
+            c = buf[j]
+            if c == '"':
+                self.in_string = True
+            elif c in "[{":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return j + 1
+            i = j + 1
+
+
+class JSONItemStream:
+    """
+    Incremental extractor of the items found under ``items_path`` in a JSON document.
+
+    Text is fed chunk by chunk and every complete element of the target array is
+    returned as soon as it has been read, so memory stays bounded by one item (plus a
+    chunk) instead of the whole document. Values outside of the path are skipped without
+    being decoded. Mirrors the non streaming lookup: a top-level array is used as is, an
+    object found at the path is a single item.
+    """
+
+    def __init__(self, items_path: tuple[str, ...]) -> None:
+        self.items_path: tuple[str, ...] = items_path
+        self._depth: int = 0  # number of path components already entered
+        self._state: str = "value"
+        self._key_matched: bool = False
+        self._scanner: _ValueScanner | None = None
+        self._buf: str = ""
+        self._pos: int = 0
+        self._received: bool = False
+
+    @property
+    def done(self) -> bool:
+        """Nothing else of interest can follow in the document."""
+        return self._state == "done"
+
+    def feed(self, chunk: str) -> list[Any]:
+        if chunk:
+            self._received = True
+        if self.done:
+            return []
+        self._buf += chunk
+        items: list[Any] = []
+        self._run(items, final=False)
+
+        # drop what was consumed, the buffer only keeps the value being read
+        if self._pos:
+            self._buf = self._buf[self._pos :]
+            if self._scanner is not None:
+                self._scanner.shift(self._pos)
+            self._pos = 0
+        return items
+
+    def close(self) -> list[Any]:
+        """Flush the end of the document, raises ``ValueError`` if it is truncated."""
+        items: list[Any] = []
+        if not self.done:
+            self._run(items, final=True)
+        if not self.done and self._received:
+            raise ValueError("truncated or malformed JSON document")
+        return items
+
+    def _skip_whitespace(self) -> bool:
+        """Move to the next significant character, ``False`` if the buffer ran out."""
+        m = _WHITESPACE.match(self._buf, self._pos)
+        self._pos = m.end() if m else self._pos
+        return self._pos < len(self._buf)
+
+    def _run(self, items: list[Any], final: bool) -> None:
+        path = self.items_path
+        while self._state != "done":
+            if self._scanner is None and not self._skip_whitespace():
+                return
+
+            buf, pos = self._buf, self._pos
+            state = self._state
+            if state == "value":
+                c = buf[pos]
+                if c == "[" and (self._depth == len(path) or self._depth == 0):
+                    self._pos += 1
+                    self._state = "items"
+                elif self._depth == len(path):
+                    self._scanner = _ValueScanner(buf, pos)
+                    self._state = "single"
+                elif c == "{":
+                    self._pos += 1
+                    self._state = "key"
+                else:
+                    self._state = "done"
+            elif state == "key":
+                c = buf[pos]
+                if c == ",":
+                    self._pos += 1
+                elif c == '"':
+                    try:
+                        key, end = scanstring(buf, pos + 1)
+                    except json.JSONDecodeError:
+                        if final:
+                            raise ValueError("malformed JSON object key") from None
+                        return
+                    self._key_matched = key == path[self._depth]
+                    self._pos = end
+                    self._state = "colon"
+                else:  # "}": the object ended without the key we are after
+                    self._state = "done"
+            elif state == "colon":
+                if buf[pos] != ":":
+                    raise ValueError(f"malformed JSON, expected ':' at {pos}")
+                self._pos += 1
+                if self._key_matched:
+                    self._depth += 1
+                    self._state = "value"
+                else:
+                    self._state = "skip"
+            elif state == "items":
+                c = buf[pos]
+                if c == "]":
+                    self._state = "done"
+                elif c == ",":
+                    self._pos += 1
+                else:
+                    self._state = "item"
+                    # fast path, the whole item is usually already buffered; unless the
+                    # value is followed by a delimiter it may be a cut number ("12|3",
+                    # "1.|5"), the resumable scanner then takes over
+                    try:
+                        value, end = _DECODER.raw_decode(buf, pos)
+                    except json.JSONDecodeError:
+                        continue
+                    if _SCALAR_END.match(buf, end) or (final and end == len(buf)):
+                        items.append(value)
+                        self._pos = end
+                        self._state = "items"
+            else:  # skip, item or single: read one whole value
+                if self._scanner is None:
+                    self._scanner = _ValueScanner(buf, pos)
+                end = self._scanner.scan(buf, final)
+                if end is None:
+                    return
+                start = self._scanner.start
+                self._scanner = None
+                self._pos = end
+                if state == "skip":
+                    self._state = "key"
+                elif state == "item":
+                    items.append(json.loads(buf[start:end]))
+                    self._state = "items"
+                else:
+                    value = json.loads(buf[start:end])
+                    if isinstance(value, dict):
+                        items.append(value)
+                    self._state = "done"
@@ -0,0 +1,273 @@
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import ClassVar, Final, Literal
+
+MatchMode = Literal["substring", "word", "regex"]
+
+MATCH_MODES: Final[tuple[str, ...]] = ("substring", "word", "regex")
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    keyword: str
+    position: int  # offset of the first occurrence in the searched text
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _is_whole_word(
+    text: str, start: int, end: int, *, at_start: bool = True, final: bool = True
+) -> bool:
+    """
+    Whether ``text[start:end]`` sits on word boundaries. When ``text`` is a window of a
+    longer stream, ``at_start``/``final`` tell if its edges are the real text edges
+    (otherwise a match touching an edge cannot be decided yet).
+    """
+    if start == 0:
+        before_ok = at_start
+    else:
+        before_ok = not _is_word_char(text[start - 1])
+    if end == len(text):
+        after_ok = final
+    else:
+        after_ok = not _is_word_char(text[end])
+    return before_ok and after_ok
+
+
+class _Automaton:
+    """Aho-Corasick automaton over a set of (already case-folded) literals."""
+
+    def __init__(self, needles: list[str]) -> None:
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[tuple[int, ...]] = [()]
+
+        for idx, needle in enumerate(needles):
+            state = 0
+            for c in needle:
+                nxt = self.goto[state].get(c)
+                if nxt is None:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                    nxt = len(self.goto) - 1
+                    self.goto[state][c] = nxt
+                state = nxt
+            self.out[state] += (idx,)
+
+        # breadth first so that every fail target is complete before it is used
+        queue: deque[int] = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and c not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(c, 0)
+                self.out[nxt] += self.out[self.fail[nxt]]
+
+    def step(self, state: int, c: str) -> int:
+        goto, fail = self.goto, self.fail
+        while state and c not in goto[state]:
+            state = fail[state]
+        return goto[state].get(c, 0)
+
+
+class KeywordMatcher:
+    """
+    Keyword set compiled once per monitor, reporting which keywords occur in a text.
+
+    ``substring`` and ``word`` modes search for literals (``word`` only accepts matches
+    on word boundaries), ``regex`` treats each keyword as a regular expression.
+    Literals are case-folded at compile time so a search folds the page text once.
+
+    Small literal sets are searched with one C-level ``str.find`` per keyword, larger
+    ones with an Aho-Corasick automaton that walks the text once regardless of the
+    number of keywords (it only wins past a few hundred keywords in CPython).
+    """
+
+    AUTOMATON_THRESHOLD: ClassVar[int] = 400
+
+    def __init__(
+        self,
+        keywords: list[str],
+        *,
+        case_sensitive: bool = False,
+        mode: MatchMode = "substring",
+    ) -> None:
+        if mode not in MATCH_MODES:
+            raise ValueError(
+                f"match mode not valid {mode}, expected one of {MATCH_MODES}"
+            )
+        if not keywords:
+            raise ValueError("at least one keyword is required")
+
+        self.keywords: list[str] = keywords
+        self.case_sensitive: bool = case_sensitive
+        self.mode: MatchMode = mode
+
+        self._patterns: list[re.Pattern[str]] = []
+        self._needles: list[str] = []
+        self._automaton: _Automaton | None = None
+
+        if mode == "regex":
+            flags = 0 if case_sensitive else re.IGNORECASE
+            try:
+                self._patterns = [re.compile(kw, flags) for kw in keywords]
+            except re.error as e:
+                raise ValueError(f"invalid keyword regex: {e}") from e
+        else:
+            self._needles = [kw if case_sensitive else kw.lower() for kw in keywords]
+            if len(self._needles) >= self.AUTOMATON_THRESHOLD:
+                self._automaton = _Automaton(self._needles)
+
+    def fold(self, text: str) -> str:
+        """Case-fold ``text`` the way the literals were folded at compile time."""
+        if self.case_sensitive or self.mode == "regex":
+            return text
+        return text.lower()
+
+    def find(self, text: str) -> list[KeywordMatch]:
+        """First occurrence of every keyword found in ``text``, ordered by position."""
+        if self.mode == "regex":
+            matches = [
+                KeywordMatch(kw, m.start())
+                for kw, pattern in zip(self.keywords, self._patterns)
+                if (m := pattern.search(text))
+            ]
+        else:
+            found = self._search(self.fold(text), set(range(len(self.keywords))))
+            matches = [KeywordMatch(self.keywords[i], pos) for i, pos in found.items()]
+        return sorted(matches, key=lambda m: m.position)
+
+    def scanner(self) -> "KeywordScanner":
+        """Incremental search over text arriving in chunks (literal modes only)."""
+        return KeywordScanner(self)
+
+    def _search(
+        self,
+        haystack: str,
+        pending: set[int],
+        *,
+        at_start: bool = True,
+        final: bool = True,
+    ) -> dict[int, int]:
+        """Keyword index -> first position, for the ``pending`` literals in ``haystack``."""
+        if self._automaton is not None:
+            return self._search_with_automaton(haystack, pending, at_start, final)
+        return self._search_with_scans(haystack, pending, at_start, final)
+
+    def _search_with_scans(
+        self, haystack: str, pending: set[int], at_start: bool, final: bool
+    ) -> dict[int, int]:
+        whole_word = self.mode == "word"
+        found: dict[int, int] = {}
+        for idx in pending:
+            needle = self._needles[idx]
+            pos = haystack.find(needle)
+            while (
+                pos != -1
+                and whole_word
+                and not _is_whole_word(
+                    haystack, pos, pos + len(needle), at_start=at_start, final=final
+                )
+            ):
+                pos = haystack.find(needle, pos + 1)
+            if pos != -1:
+                found[idx] = pos
+        return found
+
+    def _search_with_automaton(
+        self, haystack: str, pending: set[int], at_start: bool, final: bool
+    ) -> dict[int, int]:
+        assert self._automaton is not None
+        automaton = self._automaton
+        whole_word = self.mode == "word"
+        remaining = len(pending)
+        found: dict[int, int] = {}
+
+        state = 0
+        for i, c in enumerate(haystack):
+            state = automaton.step(state, c)
+            for idx in automaton.out[state]:
+                if idx in found or idx not in pending:
+                    continue
+                start = i - len(self._needles[idx]) + 1
+                if whole_word and not _is_whole_word(
+                    haystack, start, i + 1, at_start=at_start, final=final
+                ):
+                    continue
+                found[idx] = start
+                remaining -= 1
+            if not remaining:
+                break
+
+        return found
+
+    @staticmethod
+    def describe(matches: list[KeywordMatch]) -> str | None:
+        """Human readable summary for a monitor ``extra``."""
+        if not matches:
+            return None
+        return "matched: " + ", ".join(f"{m.keyword} (@{m.position})" for m in matches)
+
+
+class KeywordScanner:
+    """
+    Stateful search of a ``KeywordMatcher`` over text fed in chunks.
+
+    The tail of the previous chunk is carried over so keywords spanning two chunks
+    are still found, and positions are reported relative to the whole stream.
+    """
+
+    def __init__(self, matcher: KeywordMatcher) -> None:
+        if matcher.mode == "regex":
+            raise ValueError("incremental search is not supported in regex match mode")
+        self.matcher: KeywordMatcher = matcher
+        self._pending: set[int] = set(range(len(matcher.keywords)))
+        self._found: dict[int, int] = {}
+        # longest needle plus one character to check the word boundary before it
+        self._overlap: int = max(len(n) for n in matcher._needles) + 1  # pyright: ignore[reportPrivateUsage]
+        self._carry: str = ""
+        self._offset: int = 0  # stream position of the first character of _carry
+
+    def feed(self, text: str, *, final: bool = False) -> None:
+        if not self._pending:
+            return
+
+        window = self._carry + self.matcher.fold(text)
+        found = self.matcher._search(  # pyright: ignore[reportPrivateUsage]
+            window, self._pending, at_start=self._offset == 0, final=final
+        )
+        for idx, pos in found.items():
+            self._found[idx] = self._offset + pos
+        self._pending -= found.keys()
+
+        self._carry = window[-self._overlap :]
+        self._offset += len(window) - len(self._carry)
+
+    def close(self) -> None:
+        """Signal the end of the stream (decides matches touching the last chunk)."""
+        self.feed("", final=True)
+
+    @property
+    def found_any(self) -> bool:
+        return bool(self._found)
+
+    @property
+    def found_all(self) -> bool:
+        return not self._pending
+
+    @property
+    def matches(self) -> list[KeywordMatch]:
+        return sorted(
+            (
+                KeywordMatch(self.matcher.keywords[i], pos)
+                for i, pos in self._found.items()
+            ),
+            key=lambda m: m.position,
+        )
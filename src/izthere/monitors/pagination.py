@@ -0,0 +1,117 @@
+from dataclasses import dataclass, field
+from typing import Any, Final, Literal
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from izthere.monitors.predicates import resolve_path, split_path
+
+Strategy = Literal["page", "offset", "cursor", "link"]
+
+STRATEGIES: Final[tuple[Strategy, ...]] = ("page", "offset", "cursor", "link")
+
+# query parameter driving each strategy when none is configured
+_DEFAULT_PARAMS: Final[dict[Strategy, str]] = {
+    "page": "page",
+    "offset": "offset",
+    "cursor": "cursor",
+    "link": "",
+}
+
+
+def with_query(url: str, **params: Any) -> str:
+    """``url`` with ``params`` added to (or replaced in) its query string."""
+    parts = urlsplit(url)
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k not in params
+    ]
+    query.extend((k, str(v)) for k, v in params.items())
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+@dataclass
+class Pagination:
+    """
+    How a ``json_api`` monitor walks through the pages of a collection.
+
+    ``page`` and ``offset`` urls are known upfront, so up to ``concurrency`` pages are
+    fetched at once; ``cursor`` (the next cursor read at ``cursor_path`` in a page) and
+    ``link`` (the ``rel="next"`` Link header) only learn the next url from the current
+    page and are walked one page at a time. The walk ends on an empty page, a page
+    shorter than ``page_size``, a missing cursor or link, or after ``max_pages``.
+    """
+
+    strategy: Strategy
+    param: str = ""
+    start: int = 0
+    page_size: int | None = None
+    size_param: str | None = None
+    cursor_path: str | None = None
+    max_pages: int = 10
+    concurrency: int = 4
+    _cursor_path: tuple[str, ...] = field(
+        default=(), init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.strategy not in STRATEGIES:
+            raise ValueError(
+                f"pagination strategy not valid {self.strategy}, expected one of {list(STRATEGIES)}"
+            )
+        if self.strategy == "offset" and not self.page_size:
+            raise ValueError("offset pagination requires page_size")
+        if self.strategy == "cursor" and not self.cursor_path:
+            raise ValueError("cursor pagination requires cursor_path")
+        if self.max_pages < 1 or self.concurrency < 1:
+            raise ValueError("pagination max_pages and concurrency must be at least 1")
+        self.param = self.param or _DEFAULT_PARAMS[self.strategy]
+        self._cursor_path = split_path(self.cursor_path)
+
+    @classmethod
+    def from_config(cls, data: dict[str, Any]) -> "Pagination":
+        strategy = data.get("strategy", "")
+        return cls(
+            strategy=strategy,
+            param=data.get("param", ""),
+            # pages are usually numbered from 1, offsets from 0
+            start=data.get("start", 1 if strategy == "page" else 0),
+            page_size=data.get("page_size"),
+            size_param=data.get(
+                "size_param", "limit" if strategy == "offset" else None
+            ),
+            cursor_path=data.get("cursor_path"),
+            max_pages=data.get("max_pages", 10),
+            concurrency=data.get("concurrency", 4),
+        )
+
+    @property
+    def sequential(self) -> bool:
+        return self.strategy in ("cursor", "link")
+
+    def _sized(self, url: str) -> str:
+        if self.size_param and self.page_size:
+            return with_query(url, **{self.size_param: self.page_size})
+        return url
+
+    def first_url(self, url: str) -> str:
+        if self.sequential:
+            return self._sized(url)
+        return self.page_url(url, 0)
+
+    def page_url(self, url: str, index: int) -> str:
+        """Url of the ``index``-th page (from 0), for ``page`` and ``offset``."""
+        step = (self.page_size or 1) if self.strategy == "offset" else 1
+        return self._sized(with_query(url, **{self.param: self.start + index * step}))
+
+    def next_url(self, url: str, data: Any, link: str | None) -> str | None:
+        """Url of the page after ``data`` for ``cursor`` and ``link``, if any."""
+        if self.strategy == "link":
+            return link
+        cursor = resolve_path(data, self._cursor_path)
+        if cursor is None or cursor == "":
+            return None
+        return self._sized(with_query(url, **{self.param: cursor}))
+
+    def is_last(self, count: int) -> bool:
+        """Whether a page holding ``count`` items ends the collection."""
+        return count == 0 or (self.page_size is not None and count < self.page_size)
@@ -0,0 +1,86 @@
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Final, Literal, TypeVar
+
+from izthere.logger import get_logger
+
+logger = get_logger()
+
+T = TypeVar("T")
+
+ExecutorMode = Literal["inline", "thread", "process"]
+
+EXECUTOR_MODES: Final[tuple[str, ...]] = ("inline", "thread", "process")
+
+
+class ParseExecutor:
+    """
+    Runs CPU-bound extraction jobs (HTML parsing, xpath evaluation) for the monitors.
+
+    ``inline`` runs them on the event loop like before, ``thread`` and ``process`` hand
+    them to a pool so fetches and notifications keep flowing while a large page parses.
+    Jobs must be module-level functions taking and returning picklable values (raw bytes
+    in, extracted text out) so that they can cross a process boundary.
+    """
+
+    def __init__(self, mode: ExecutorMode = "inline", max_workers: int | None = None):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(
+                f"parse executor mode not valid {mode}, expected one of {EXECUTOR_MODES}"
+            )
+        self.mode: ExecutorMode = mode
+        self.max_workers: int = max_workers or os.cpu_count() or 1
+        self._pool: Executor | None = None
+        if mode == "thread":
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="izthere-parse"
+            )
+        elif mode == "process":
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    @classmethod
+    def from_config(cls, cfg: dict[str, Any]) -> "ParseExecutor":
+        return cls(mode=cfg.get("mode", "inline"), max_workers=cfg.get("max_workers"))
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self._pool is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+_executor: ParseExecutor | None = None
+
+
+def configure_parse_executor(cfg: dict[str, Any] | None = None) -> ParseExecutor:
+    """(Re)create the process-wide executor from the ``parse_executor`` config section."""
+    global _executor
+    shutdown_parse_executor()
+    _executor = ParseExecutor.from_config(cfg or {})
+    if _executor.mode == "inline":
+        logger.info("parse executor mode=%s", _executor.mode)
+    else:
+        logger.info(
+            "parse executor mode=%s workers=%s", _executor.mode, _executor.max_workers
+        )
+    return _executor
+
+
+def get_parse_executor() -> ParseExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ParseExecutor()
+    return _executor
+
+
+def shutdown_parse_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
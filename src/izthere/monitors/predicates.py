@@ -0,0 +1,195 @@
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Final
+
+from izthere.logger import get_logger
+
+logger = get_logger()
+
+ItemPredicate = Callable[[Any], bool]
+
+# operator name -> factory building the check for one (already lowered) target
+OperatorFactory = Callable[[Any], Callable[[Any], bool]]
+
+
+def split_path(path: str | None) -> tuple[str, ...]:
+    """``"a.b.c"`` -> ``("a", "b", "c")``, an empty path selects the item itself."""
+    if not path:
+        return ()
+    return tuple(p for p in path.strip(".").split(".") if p)
+
+
+def resolve_path(item: Any, path: tuple[str, ...]) -> Any:
+    for key in path:
+        if not isinstance(item, dict):
+            return None
+        item = item.get(key)
+    return item
+
+
+def _lowered(value: Any) -> str:
+    return str(value).lower()
+
+
+def _lowered_all(values: Any) -> tuple[str, ...]:
+    # iterated as is: a string target is a set of characters, None is invalid
+    try:
+        return tuple(_lowered(v) for v in values)
+    except TypeError:
+        raise ValueError(f"operator needs a list value, got {values!r}") from None
+
+
+def _equal_insensitive(target: Any) -> Callable[[Any], bool]:
+    t = _lowered(target)
+    return lambda val: _lowered(val) == t
+
+
+def _contains_insensitive(target: Any) -> Callable[[Any], bool]:
+    t = _lowered(target)
+    return lambda val: t in _lowered(val)
+
+
+def _contains_any_insensitive(targets: Any) -> Callable[[Any], bool]:
+    ts = _lowered_all(targets)
+
+    def check(val: Any) -> bool:
+        v = _lowered(val)
+        return any(t in v for t in ts)
+
+    return check
+
+
+def _any_item_contains_insensitive(target: Any) -> Callable[[Any], bool]:
+    t = _lowered(target)
+    # ``val`` is iterated as is: a string by character, a dict by key, None raises
+    return lambda val: any(t in _lowered(item) for item in val)
+
+
+def _any_item_contains_any_insensitive(targets: Any) -> Callable[[Any], bool]:
+    ts = _lowered_all(targets)
+
+    def check(val: Any) -> bool:
+        if not ts:
+            return False  # ``val`` is not even iterated
+        items = [_lowered(item) for item in val]
+        return any(t in item for t in ts for item in items)
+
+    return check
+
+
+# map of predicates operator evaluation logic
+OPERATORS: Final[dict[str, OperatorFactory]] = {
+    "equal_insensitive": _equal_insensitive,
+    "contains_insensitive": _contains_insensitive,
+    "contains_any_insensitive": _contains_any_insensitive,
+    "any_item_contains_insensitive": _any_item_contains_insensitive,
+    "any_item_contains_any_insensitive": _any_item_contains_any_insensitive,
+}
+
+
+@dataclass
+class SubParser:
+    items_path: str
+    predicates: list["Predicate"] = field(default_factory=list)
+
+    @classmethod
+    def from_config(cls, data: dict[str, Any]) -> "SubParser":
+        return cls(
+            items_path=data["items_path"],
+            predicates=[Predicate.from_config(p) for p in data.get("predicates", [])],
+        )
+
+
+@dataclass
+class Predicate:
+    op: str
+    path: str | None = None
+    value: str | int | list[str] | None = None
+    # If op is 'sub_parser', this contains the nested configuration
+    parser: SubParser | None = None
+    _compiled: ItemPredicate | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_config(cls, data: dict[str, Any]) -> "Predicate":
+        parser_data: dict[str, Any] | None = data.get("parser")
+        return cls(
+            op=data.get("op", ""),
+            path=data.get("path"),
+            value=data.get("value"),
+            parser=SubParser.from_config(parser_data) if parser_data else None,
+        )
+
+    def compile(self) -> ItemPredicate:
+        """Closure evaluating this predicate against one item, built once."""
+        if self._compiled is None:
+            self._compiled = compile_predicate(self)
+        return self._compiled
+
+    def evaluate(self, item: Any) -> bool:
+        return self.compile()(item)
+
+
+def compile_all(predicates: list[Predicate]) -> ItemPredicate:
+    """Single closure that is true when every predicate holds for the item."""
+    checks = tuple(p.compile() for p in predicates)
+    if len(checks) == 1:
+        return checks[0]
+    return lambda item: all(check(item) for check in checks)
+
+
+def compile_predicate(pred: Predicate) -> ItemPredicate:
+    """
+    Turn a ``Predicate`` tree into nested closures: operator names are validated,
+    constant targets lowered and dotted paths split here, once, instead of on every
+    evaluated item.
+    """
+    if pred.op == "sub_parser":
+        if pred.parser is None:
+            raise ValueError("sub_parser predicate requires a 'parser'")
+        return _compile_sub_parser(pred.parser)
+
+    factory = OPERATORS.get(pred.op)
+    if factory is None:
+        raise ValueError(f"operator not valid {pred.op}")
+
+    path = split_path(pred.path)
+    check = factory(pred.value)
+
+    def evaluate(item: Any) -> bool:
+        return check(resolve_path(item, path))
+
+    if not logger.isEnabledFor(logging.DEBUG):
+        return evaluate
+
+    def evaluate_logged(item: Any) -> bool:
+        res = evaluate(item)
+        logger.debug(
+            "evaluation of predicate %s using actual=%s, predicate_value=%s, result=%s",
+            pred.op,
+            resolve_path(item, path),
+            pred.value,
+            res,
+        )
+        return res
+
+    return evaluate_logged
+
+
+def _compile_sub_parser(parser: SubParser) -> ItemPredicate:
+    path = split_path(parser.items_path)
+    match = compile_all(parser.predicates)
+
+    def evaluate(item: Any) -> bool:
+        sub_items = resolve_path(item, path)
+        if not sub_items:
+            return False
+        if isinstance(sub_items, list):
+            return any(match(si) for si in sub_items)
+        if isinstance(sub_items, dict):
+            return match(sub_items)
+        return False
+
+    return evaluate
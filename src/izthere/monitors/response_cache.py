@@ -0,0 +1,167 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from izthere.logger import get_logger
+from izthere.monitors.web_utils import Validators
+
+logger = get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    answer INTEGER NOT NULL,
+    extra TEXT,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Stable digest of everything that influences a monitor's answer."""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    validators: Validators
+    answer: bool
+    extra: str | None
+
+
+class ResponseCache:
+    """
+    On-disk (SQLite) store of HTTP validators and the last evaluated answer per monitor.
+
+    Entries are keyed by ``Monitor.cache_key`` so two monitors watching the same URL with
+    different keywords never share an answer. The table is bounded to ``max_entries``,
+    least recently used entries are evicted first. The database is in WAL mode and
+    worked on in a thread, off the event loop; reads only note the access time, it is
+    written with the next ``put``.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 10_000) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path: Path = path
+        self.max_entries: int = max_entries
+        self._conn: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        _ = self._conn.execute("PRAGMA journal_mode=WAL")
+        _ = self._conn.execute("PRAGMA synchronous=NORMAL")
+        _ = self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._lock: threading.Lock = threading.Lock()
+        # key -> access time of the hits not written yet
+        self._accessed: dict[str, float] = {}
+
+    async def get(self, key: str) -> CachedResponse | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(
+        self, key: str, validators: Validators, answer: bool, extra: str | None
+    ) -> None:
+        await asyncio.to_thread(self._put, key, validators, answer, extra)
+
+    def _get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, answer, extra FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+
+        etag, last_modified, answer, extra = row
+        return CachedResponse(
+            validators=Validators(etag=etag, last_modified=last_modified),
+            answer=bool(answer),
+            extra=extra,
+        )
+
+    def _put(
+        self, key: str, validators: Validators, answer: bool, extra: str | None
+    ) -> None:
+        with self._lock, self._conn:
+            self._write_accessed()
+            if not (validators.etag or validators.last_modified):
+                # nothing to revalidate with next time, such an entry would never be used
+                _ = self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return
+
+            _ = self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    validators.etag,
+                    validators.last_modified,
+                    int(answer),
+                    extra,
+                    time.time(),
+                ),
+            )
+            self._evict()
+
+    def _write_accessed(self) -> None:
+        if self._accessed:
+            accessed, self._accessed = self._accessed, {}
+            _ = self._conn.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                [(at, key) for key, at in accessed.items()],
+            )
+
+    def _evict(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            _ = self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                + "(SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+            logger.debug("evicted %s response cache entries", overflow)
+
+    def close(self) -> None:
+        with self._lock:
+            with self._conn:
+                self._write_accessed()
+            self._conn.close()
+
+
+_cache: ResponseCache | None = None
+
+
+def configure_response_cache(
+    cfg: dict[str, Any] | None, data_dir: Path
+) -> ResponseCache | None:
+    """Open the process-wide response cache from the ``cache`` config section."""
+    global _cache
+    close_response_cache()
+    cfg = cfg or {}
+    if not cfg.get("enabled", True):
+        logger.info("response cache disabled")
+        return None
+
+    path = Path(cfg.get("path", data_dir / "response_cache.sqlite3"))
+    _cache = ResponseCache(path, max_entries=cfg.get("max_entries", 10_000))
+    logger.debug("response cache opened at %s", path)
+    return _cache
+
+
+def get_response_cache() -> ResponseCache | None:
+    return _cache
+
+
+def close_response_cache() -> None:
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from izthere.logger import get_logger
+from izthere.monitors.predicates import resolve_path
+
+logger = get_logger()
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS seen_items (
+        scope TEXT NOT NULL,
+        item_id TEXT NOT NULL,
+        item_hash TEXT NOT NULL,
+        last_seen REAL NOT NULL,
+        PRIMARY KEY (scope, item_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS seen_items_last_seen ON seen_items (last_seen)",
+)
+
+
+def item_digest(item: Any) -> str:
+    raw = json.dumps(item, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SeenBatch:
+    """
+    Items of one monitor run checked against what previous runs have seen.
+    Every item carrying an identity is queued for a single batched write.
+    """
+
+    def __init__(
+        self, scope: str, identity_path: tuple[str, ...], previous: dict[str, str]
+    ) -> None:
+        self.scope: str = scope
+        self.identity_path: tuple[str, ...] = identity_path
+        self.previous: dict[str, str] = previous
+        self.pending: list[tuple[str, str]] = []
+        self.skipped: int = 0
+
+    def is_new(self, item: Any) -> bool:
+        """``False`` for an item already seen unchanged, it needs no evaluation."""
+        identity = resolve_path(item, self.identity_path)
+        if identity is None:
+            return True  # cannot be tracked, always evaluated
+
+        item_id = str(identity)
+        digest = item_digest(item)
+        self.pending.append((item_id, digest))
+        if self.previous.get(item_id) == digest:
+            self.skipped += 1
+            return False
+        return True
+
+
+class SeenItemStore:
+    """
+    Persistent index of the items json_api monitors have already processed, in SQLite
+    (WAL mode). Entries not seen for ``ttl_seconds`` are evicted. Database work runs in a
+    thread so that large indexes do not stall the event loop.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float = 30 * 24 * 3600) -> None:
+        self.path: Path = path
+        self.ttl_seconds: float = ttl_seconds
+        self._conn: sqlite3.Connection | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # opened on first use, configs without identity_path never create the file
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            _ = conn.execute("PRAGMA journal_mode=WAL")
+            _ = conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                _ = conn.execute(statement)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _load(self, scope: str) -> dict[str, str]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT item_id, item_hash FROM seen_items WHERE scope = ?", (scope,)
+            )
+            return dict(rows.fetchall())
+
+    def _write(self, batch: SeenBatch) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:  # one transaction for the whole run
+                _ = conn.executemany(
+                    "INSERT OR REPLACE INTO seen_items VALUES (?, ?, ?, ?)",
+                    [(batch.scope, i, h, now) for i, h in batch.pending],
+                )
+                evicted = conn.execute(
+                    "DELETE FROM seen_items WHERE last_seen < ?",
+                    (now - self.ttl_seconds,),
+                ).rowcount
+        if evicted:
+            logger.debug("evicted %s expired seen item(s)", evicted)
+
+    async def begin(self, scope: str, identity_path: tuple[str, ...]) -> SeenBatch:
+        previous = await asyncio.to_thread(self._load, scope)
+        return SeenBatch(scope, identity_path, previous)
+
+    async def commit(self, batch: SeenBatch) -> None:
+        if batch.pending:
+            await asyncio.to_thread(self._write, batch)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_store: SeenItemStore | None = None
+
+
+def configure_seen_store(cfg: dict[str, Any] | None, data_dir: Path) -> SeenItemStore:
+    """Create the process-wide store from the ``seen_items`` config section."""
+    global _store
+    close_seen_store()
+    cfg = cfg or {}
+    _store = SeenItemStore(
+        Path(cfg.get("path", data_dir / "seen_items.sqlite3")),
+        ttl_seconds=cfg.get("ttl_days", 30) * 24 * 3600,
+    )
+    return _store
+
+
+def get_seen_store() -> SeenItemStore | None:
+    return _store
+
+
+def close_seen_store() -> None:
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
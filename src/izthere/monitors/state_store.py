@@ -0,0 +1,121 @@
+import asyncio
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from izthere.logger import get_logger
+
+logger = get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS monitor_state (
+    key TEXT PRIMARY KEY,
+    digest TEXT,
+    answer INTEGER NOT NULL,
+    extra TEXT,
+    last_checked REAL NOT NULL
+)
+"""
+
+
+@dataclass(frozen=True)
+class MonitorState:
+    """Outcome of the last completed run of a monitor."""
+
+    digest: str | None  # body the answer was computed from, None when unknown
+    answer: bool
+    extra: str | None
+    last_checked: datetime
+
+
+class StateStore:
+    """
+    On-disk (SQLite, WAL mode) state of every monitor, keyed by ``Monitor.cache_key``,
+    so that a restarted process knows what was last answered and can skip identical
+    bodies. Database work runs in a thread, off the event loop.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path: Path = path
+        self._conn: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False)
+        _ = self._conn.execute("PRAGMA journal_mode=WAL")
+        _ = self._conn.execute("PRAGMA synchronous=NORMAL")
+        _ = self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._lock: threading.Lock = threading.Lock()
+
+    def _get(self, key: str) -> MonitorState | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest, answer, extra, last_checked FROM monitor_state "
+                + "WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        digest, answer, extra, last_checked = row
+        return MonitorState(
+            digest=digest,
+            answer=bool(answer),
+            extra=extra,
+            last_checked=datetime.fromtimestamp(last_checked, UTC),
+        )
+
+    def _put(self, key: str, state: MonitorState) -> None:
+        with self._lock, self._conn:
+            _ = self._conn.execute(
+                "INSERT OR REPLACE INTO monitor_state VALUES (?, ?, ?, ?, ?)",
+                (
+                    key,
+                    state.digest,
+                    int(state.answer),
+                    state.extra,
+                    state.last_checked.timestamp(),
+                ),
+            )
+
+    async def get(self, key: str) -> MonitorState | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, state: MonitorState) -> None:
+        await asyncio.to_thread(self._put, key, state)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_store: StateStore | None = None
+
+
+def configure_state_store(
+    cfg: dict[str, Any] | None, data_dir: Path
+) -> StateStore | None:
+    """Open the process-wide state store from the ``state`` config section."""
+    global _store
+    close_state_store()
+    cfg = cfg or {}
+    if not cfg.get("enabled", True):
+        logger.info("monitor state persistence disabled")
+        return None
+
+    path = Path(cfg.get("path", data_dir / "state.sqlite3"))
+    _store = StateStore(path)
+    logger.debug("monitor state store opened at %s", path)
+    return _store
+
+
+def get_state_store() -> StateStore | None:
+    return _store
+
+
+def close_state_store() -> None:
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
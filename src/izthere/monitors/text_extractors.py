@@ -0,0 +1,103 @@
+import re
+from collections.abc import Callable, Iterator
+from typing import Final, Literal
+
+import lxml.html
+from bs4 import BeautifulSoup
+from lxml import etree  # pyright: ignore[reportAttributeAccessIssue]
+
+TextBackend = Literal["bs4", "lxml"]
+
+# invisible content, its text never reaches the keyword search
+SKIPPED_TAGS: Final[frozenset[str]] = frozenset({"script", "style", "noscript"})
+
+_WHITESPACE: Final[re.Pattern[str]] = re.compile(r"\s+")
+
+
+def extract_visible_text_bs4(html: str) -> str:
+    """Reference extractor, BeautifulSoup with the pure-Python ``html.parser``."""
+    soup: BeautifulSoup = BeautifulSoup(html, "html.parser")
+
+    # initial trim of uninteresting invisible content
+    for element in soup(list(SKIPPED_TAGS)):
+        element.decompose()
+
+    # retrieve text we are interested in
+    text = soup.get_text(separator=" ", strip=True)
+    return _WHITESPACE.sub(" ", text)
+
+
+def parse_html_lxml(html: str) -> lxml.html.HtmlElement:
+    try:
+        return lxml.html.fromstring(html)
+    except ValueError:
+        # str input carrying an xml encoding declaration, libxml2 wants bytes for it
+        parser = lxml.html.HTMLParser(encoding="utf-8")
+        return lxml.html.fromstring(html.encode("utf-8"), parser=parser)
+
+
+def _cdata(node: etree._Element) -> str | None:  # pyright: ignore[reportPrivateUsage]
+    """Content of a CDATA section, which libxml2 turns into a comment in HTML."""
+    text = node.text or ""
+    if text.startswith("[CDATA[") and text.endswith("]]"):
+        return text[7:-2]
+    return None
+
+
+def _lxml_strings(root: lxml.html.HtmlElement) -> Iterator[str]:
+    """
+    Text and tails in document order, the way BeautifulSoup sees its strings: comments,
+    processing instructions, skipped tags and ``template`` contents are left out but
+    their tails still count as separate strings, CDATA sections are strings too.
+    """
+    # CDATA before the document element, out of the walked tree
+    top = root.getroottree().getroot()
+    for node in reversed(list(top.itersiblings(preceding=True))):
+        if (cdata := _cdata(node)) is not None:
+            yield cdata
+
+    hidden = 0
+    for event, node in etree.iterwalk(root, events=("start", "end", "comment", "pi")):
+        if event in ("comment", "pi"):
+            if hidden:
+                continue
+            if event == "comment" and (cdata := _cdata(node)) is not None:
+                yield cdata
+            if node.tail:
+                yield node.tail
+            continue
+
+        is_hidden = node.tag in SKIPPED_TAGS or node.tag == "template"
+        if event == "start":
+            if is_hidden:
+                hidden += 1
+            elif not hidden and node.text:
+                yield node.text
+        else:
+            if is_hidden:
+                hidden -= 1
+            if not hidden and node.tail and node is not root:
+                yield node.tail
+
+
+def extract_visible_text_lxml(html: str) -> str:
+    """
+    libxml2-based extractor, same output as the bs4 one at a fraction of the cost
+    (both parsers recover from broken markup in their own way, so badly malformed
+    pages can still differ slightly). Known differences: like a browser, libxml2 keeps
+    the content of ``textarea``, ``xmp`` and ``plaintext`` as raw text, markup
+    included, where ``html.parser`` parses tags in it, and it ends a CDATA section at
+    its first ``>``.
+    """
+    try:
+        root = parse_html_lxml(html)
+    except etree.ParserError:  # nothing but whitespace
+        return ""
+    text = " ".join(s for raw in _lxml_strings(root) if (s := raw.strip()))
+    return _WHITESPACE.sub(" ", text)
+
+
+TEXT_BACKENDS: Final[dict[TextBackend, Callable[[str], str]]] = {
+    "bs4": extract_visible_text_bs4,
+    "lxml": extract_visible_text_lxml,
+}
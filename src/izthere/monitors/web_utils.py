@@ -1,25 +1,288 @@
+import asyncio
+import codecs
+import hashlib
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Any
+from urllib.parse import urljoin
 
 import httpx
 
 from izthere.logger import get_logger
+from izthere.monitors.http_client import get_client_manager
 
 logger = get_logger()
 
 
+class ResponseTooLarge(Exception):
+    """The body is over the allowed size, the download was aborted."""
+
+    def __init__(self, url: str, limit: int) -> None:
+        super().__init__(
+            f"response of {url} over max_response_bytes={limit}, download aborted"
+        )
+        self.url: str = url
+        self.limit: int = limit
+
+
+def _check_length(resp: httpx.Response, limit: int | None) -> None:
+    # a declared length over the limit fails before reading anything
+    declared = resp.headers.get("Content-Length", "")
+    if limit and declared.isdigit() and int(declared) > limit:
+        raise ResponseTooLarge(str(resp.url), limit)
+
+
+async def _bounded_bytes(
+    resp: httpx.Response, limit: int | None
+) -> AsyncIterator[bytes]:
+    """
+    Decompressed body chunks, failing once more than ``limit`` bytes were produced.
+    The decompressed size is what is bounded: a small compressed body can inflate
+    to a lot.
+    """
+    _check_length(resp, limit)
+    total = 0
+    async for chunk in resp.aiter_bytes():
+        total += len(chunk)
+        if limit and total > limit:
+            raise ResponseTooLarge(str(resp.url), limit)
+        yield chunk
+
+
+@dataclass(frozen=True)
+class Validators:
+    """HTTP cache validators sent back to the server on a conditional GET."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def as_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    url: str
+    status_code: int
+    content: bytes
+    encoding: str | None
+    validators: Validators
+    bytes_downloaded: int = 0  # on the wire, compressed
+    next_link: str | None = None  # Link: <...>; rel="next"
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == 304
+
+    @cached_property
+    def digest(self) -> str:
+        """Content digest, identifies the body across monitors sharing a response."""
+        return hashlib.blake2b(self.content, digest_size=16).hexdigest()
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+# (url, sorted headers, timeout, validators, max bytes) of a request that can be shared
+_FetchKey = tuple[
+    str, tuple[tuple[str, str], ...], float, Validators | None, int | None
+]
+
+_inflight: dict[_FetchKey, "asyncio.Future[FetchResult]"] = {}
+# callers waiting on each in-flight request, the last one to give up cancels it
+_waiters: dict["asyncio.Future[FetchResult]", int] = {}
+
+
+async def fetch(
+    url: str,
+    timeout: int = 10,
+    headers: dict[str, str] | None = None,
+    validators: Validators | None = None,
+    max_bytes: int | None = None,
+) -> FetchResult:
+    """
+    GET ``url`` through the shared client pool.
+    When ``validators`` are given the request is conditional and a ``304`` is returned
+    as a ``FetchResult`` with ``not_modified`` set and an empty body.
+
+    The body is read as a stream and the download aborted with ``ResponseTooLarge``
+    past ``max_bytes`` (the ``http`` section's ``max_response_bytes`` by default).
+    Compressed responses (gzip, brotli, zstd) are decoded on the fly, ``content`` holds
+    the raw decompressed bytes.
+
+    Concurrent calls for the same url, headers, timeout and validators are coalesced
+    into a single in-flight request whose result is shared by every caller. Cancelling
+    a caller only cancels the request once no other caller waits for it.
+    """
+    if max_bytes is None:
+        max_bytes = get_client_manager().max_response_bytes
+    key: _FetchKey = (
+        url,
+        tuple(sorted((headers or {}).items())),
+        float(timeout),
+        validators,
+        max_bytes,
+    )
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _fetch(url, timeout, headers, validators, max_bytes)
+        )
+        _inflight[key] = task
+    else:
+        logger.debug("joining in-flight request for %s", url)
+    _waiters[task] = _waiters.get(task, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    finally:
+        _waiters[task] -= 1
+        if not _waiters[task]:
+            del _waiters[task]
+            if _inflight.get(key) is task:
+                del _inflight[key]
+            if not task.done():
+                _ = task.cancel()
+
+
+def _next_link(resp: httpx.Response) -> str | None:
+    link = resp.links.get("next", {}).get("url")
+    return urljoin(str(resp.url), link) if link else None
+
+
+async def _fetch(
+    url: str,
+    timeout: int,
+    headers: dict[str, str] | None,
+    validators: Validators | None,
+    max_bytes: int | None,
+) -> FetchResult:
+    manager = get_client_manager()
+    request_headers = validators.as_headers() if validators else None
+    async with (
+        manager.host_slot(url),
+        manager.client(headers, timeout).stream(
+            "GET", url, headers=request_headers
+        ) as resp,
+    ):
+        if resp.status_code != 304:
+            _ = resp.raise_for_status()
+        chunks = [chunk async for chunk in _bounded_bytes(resp, max_bytes)]
+
+    return FetchResult(
+        url=url,
+        status_code=resp.status_code,
+        content=b"".join(chunks),
+        encoding=resp.encoding,
+        validators=Validators(
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        ),
+        bytes_downloaded=resp.num_bytes_downloaded,
+        next_link=_next_link(resp),
+    )
+
+
+@dataclass
+class StreamedResponse:
+    """Response whose body is read incrementally by the caller."""
+
+    url: str
+    status_code: int
+    validators: Validators
+    max_bytes: int | None
+    _response: httpx.Response
+    # decompressed bytes handed over so far, the unit max_bytes is counted in
+    bytes_read: int = field(default=0, init=False)
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == 304
+
+    @property
+    def bytes_downloaded(self) -> int:
+        """On the wire, compressed."""
+        return self._response.num_bytes_downloaded
+
+    async def aiter_bytes(self) -> AsyncIterator[bytes]:
+        """Decompressed body chunks, raises ``ResponseTooLarge`` past ``max_bytes``."""
+        async for chunk in _bounded_bytes(self._response, self.max_bytes):
+            self.bytes_read += len(chunk)
+            yield chunk
+
+    async def aiter_text(self) -> AsyncIterator[str]:
+        decoder = codecs.getincrementaldecoder(self._response.encoding or "utf-8")(
+            errors="replace"
+        )
+        async for chunk in self.aiter_bytes():
+            if text := decoder.decode(chunk):
+                yield text
+        if text := decoder.decode(b"", final=True):
+            yield text
+
+
+@asynccontextmanager
+async def stream(
+    url: str,
+    timeout: int = 10,
+    headers: dict[str, str] | None = None,
+    validators: Validators | None = None,
+    max_bytes: int | None = None,
+) -> AsyncIterator[StreamedResponse]:
+    """
+    Like ``fetch`` but hands the body over chunk by chunk. Leaving the context early
+    stops the download. Streams are never coalesced, each caller reads its own body.
+    """
+    manager = get_client_manager()
+    if max_bytes is None:
+        max_bytes = manager.max_response_bytes
+    request_headers = validators.as_headers() if validators else None
+    async with (
+        manager.host_slot(url),
+        manager.client(headers, timeout).stream(
+            "GET", url, headers=request_headers
+        ) as resp,
+    ):
+        if resp.status_code != 304:
+            _ = resp.raise_for_status()
+        yield StreamedResponse(
+            url=url,
+            status_code=resp.status_code,
+            validators=Validators(
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+            ),
+            max_bytes=max_bytes,
+            _response=resp,
+        )
+
+
 async def fetch_json(
-    url: str, timeout: int = 10, headers: dict[str, str] | None = None
+    url: str,
+    timeout: int = 10,
+    headers: dict[str, str] | None = None,
+    max_bytes: int | None = None,
 ) -> dict[str, Any] | list[dict[str, Any]]:
-    async with httpx.AsyncClient(headers=headers, timeout=timeout) as client:
-        resp: httpx.Response = await client.get(url)
-        _ = resp.raise_for_status()
-        return resp.json()
+    resp = await fetch(url, timeout=timeout, headers=headers, max_bytes=max_bytes)
+    return resp.json()
 
 
 async def fetch_html(
-    url: str, timeout: int = 10, headers: dict[str, str] | None = None
+    url: str,
+    timeout: int = 10,
+    headers: dict[str, str] | None = None,
+    max_bytes: int | None = None,
 ) -> str:
-    async with httpx.AsyncClient(headers=headers, timeout=timeout) as client:
-        resp: httpx.Response = await client.get(url)
-        _ = resp.raise_for_status()
-        return resp.text
+    resp = await fetch(url, timeout=timeout, headers=headers, max_bytes=max_bytes)
+    return resp.text
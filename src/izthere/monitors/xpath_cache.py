@@ -0,0 +1,15 @@
+from functools import lru_cache
+
+from lxml import etree  # pyright: ignore[reportAttributeAccessIssue]
+
+
+@lru_cache(maxsize=1024)
+def compile_xpath(expression: str) -> etree.XPath:
+    """
+    Compile ``expression`` once per process, monitors sharing an expression share the
+    compiled object (lxml serializes evaluations of one ``XPath`` across threads).
+    """
+    try:
+        return etree.XPath(expression)
+    except etree.XPathSyntaxError as e:
+        raise ValueError(f"invalid xpath {expression!r}: {e}") from e
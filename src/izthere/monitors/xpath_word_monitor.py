@@ -1,14 +1,19 @@
 import asyncio
 import re
-from datetime import datetime, timezone
-from typing import Any
+from datetime import datetime
+from typing import Any, override
 
 import lxml.html
-from typing_extensions import override
 
 from izthere.logger import get_logger
 from izthere.monitors.base import Monitor
-from izthere.monitors.web_utils import fetch_html
+from izthere.monitors.document_cache import get_document_cache
+from izthere.monitors.keyword_matcher import KeywordMatcher, MatchMode
+from izthere.monitors.parse_executor import get_parse_executor
+from izthere.monitors.response_cache import get_response_cache, make_cache_key
+from izthere.monitors.text_extractors import parse_html_lxml
+from izthere.monitors.web_utils import ResponseTooLarge, fetch
+from izthere.monitors.xpath_cache import compile_xpath
 
 logger = get_logger()
 
@@ -16,6 +21,7 @@ logger = get_logger()
 class XpathWordMonitor(Monitor, monitor_type="xpath_word"):
     """
     Detects the presence of one or more keywords in the *visible* text of an HTML tag in a page (provided as xpath).
+    Several xpaths can be given, they are all evaluated against one parsed tree.
     """
 
     def __init__(
@@ -23,19 +29,32 @@ class XpathWordMonitor(Monitor, monitor_type="xpath_word"):
         *,
         name: str,
         url: str,
-        xpath: str,
+        xpath: str | list[str],
         keywords: list[str],
         timeout_seconds: int = 10,
         case_sensitive: bool = False,
+        match_mode: MatchMode = "substring",
         headers: dict[str, str] | None = None,
+        max_response_bytes: int | None = None,
     ) -> None:
         self.question: str = name
         self.url: str = url
-        self.xpath: str = xpath
+        self.xpaths: list[str] = [xpath] if isinstance(xpath, str) else list(xpath)
+        if not self.xpaths:
+            raise ValueError("at least one xpath is required")
+        # compile now so that an invalid expression fails at startup, not at first fire
+        for expression in self.xpaths:
+            _ = compile_xpath(expression)
         self.keywords: list[str] = keywords
         self.case_sensitive: bool = case_sensitive
+        self.match_mode: MatchMode = match_mode
+        self.matcher: KeywordMatcher = KeywordMatcher(
+            keywords, case_sensitive=case_sensitive, mode=match_mode
+        )
         self.timeout: int = timeout_seconds
         self.headers: dict[str, str] | None = headers
+        # None: the http section's limit
+        self.max_response_bytes: int | None = max_response_bytes
         self._last_checked: datetime | None = None
 
     @classmethod
@@ -47,14 +66,21 @@ class XpathWordMonitor(Monitor, monitor_type="xpath_word"):
             xpath=cfg["xpath"],
             keywords=cfg["keywords"],
             headers=cfg.get("headers"),
+            max_response_bytes=cfg.get("max_response_bytes"),
             timeout_seconds=cfg.get("timeout_seconds", 10),
             case_sensitive=cfg.get("case_sensitive", False),
+            match_mode=cfg.get("match_mode", "substring"),
         )
 
     @staticmethod
-    def _extract_from_xpath(html: str, xpath: str) -> str:
-        tree = lxml.html.fromstring(html)
-        matches = tree.xpath(xpath)
+    def _parse_tree(html: str) -> lxml.html.HtmlElement:
+        return parse_html_lxml(html)
+
+    @staticmethod
+    def _extract_from_xpath(tree: lxml.html.HtmlElement, xpath: str) -> str:
+        matches = compile_xpath(xpath)(tree)
+        if not isinstance(matches, list):  # string()/count() style expressions
+            matches = [matches]
 
         texts: list[str] = []
         for node in matches:
@@ -81,37 +107,114 @@ class XpathWordMonitor(Monitor, monitor_type="xpath_word"):
     def where(self) -> str:
         return self.url
 
+    @property
+    @override
+    def cache_key(self) -> str:
+        return make_cache_key(
+            self.monitor_type,
+            self.url,
+            self.headers,
+            self.xpaths,
+            self.keywords,
+            self.case_sensitive,
+            self.match_mode,
+        )
+
     @override
     async def run(self) -> tuple[bool, str | None]:
-        logger.debug(f"[{self.monitor_type}] executing monitor '{self.question}'")
-        self._last_checked = datetime.now(timezone.utc)
+        logger.debug("[%s] executing monitor '%s'", self.monitor_type, self.question)
+        self._start_run()
+        cache = get_response_cache()
+        cached = await cache.get(self.cache_key) if cache else None
         try:
-            html = await fetch_html(
-                url=self.url, timeout=self.timeout, headers=self.headers
+            with self.phase("fetch"):
+                resp = await fetch(
+                    url=self.url,
+                    timeout=self.timeout,
+                    headers=self.headers,
+                    validators=cached.validators if cached else None,
+                    max_bytes=self.max_response_bytes,
+                )
+        except ResponseTooLarge as e:
+            logger.warning("[%s] monitor '%s': %s", self.monitor_type, self.question, e)
+            return self._failed(str(e), e)
+        except Exception as e:  # noqa: BLE001
+            return self._failed(f"unexpected error fix me! {e}", e)
+        self.bytes_downloaded = resp.bytes_downloaded
+
+        if resp.not_modified and cached:
+            logger.info(
+                "[%s] monitor '%s' not modified, answer=%s",
+                self.monitor_type,
+                self.question,
+                cached.answer,
+            )
+            await self._keep_state(cached.answer, cached.extra)
+            return cached.answer, cached.extra
+
+        if not resp.content:
+            return self._failed("no data retrieved, fix me!")
+
+        if (state := await self.unchanged_state(resp.digest)) is not None:
+            logger.info(
+                "[%s] monitor '%s' body unchanged, answer=%s",
+                self.monitor_type,
+                self.question,
+                state.answer,
+            )
+            await self.save_state(resp.digest, state.answer, state.extra)
+            if cache:
+                await cache.put(
+                    self.cache_key, resp.validators, state.answer, state.extra
+                )
+            return state.answer, state.extra
+
+        with self.phase("extract"):
+            visible_text: str = await get_parse_executor().run(
+                _xpath_text_job,
+                resp.content,
+                resp.encoding,
+                resp.digest,
+                tuple(self.xpaths),
             )
-        except Exception as e:
-            return False, f"unexpected error fix me! {e}"
-
-        if not html:
-            return False, "no data retrieved, fix me!"
-
-        visible_text: str = self._extract_from_xpath(html, self.xpath)
-
-        logger.debug(f"[{self.monitor_type}] visible text in xpath={visible_text}")
 
-        if self.case_sensitive:
-            haystack = visible_text
-            needles = self.keywords
-        else:
-            haystack = visible_text.lower()
-            needles = [kw.lower() for kw in self.keywords]
+        logger.debug("[%s] visible text in xpath=%s", self.monitor_type, visible_text)
 
-        answer = any(needle in haystack for needle in needles)
+        with self.phase("match"):
+            matches = self.matcher.find(visible_text)
+        answer = bool(matches)
+        extra = KeywordMatcher.describe(matches)
 
         logger.info(
-            f"[{self.monitor_type}] monitor '{self.question}' executed, answer={answer}"
+            "[%s] monitor '%s' executed, answer=%s",
+            self.monitor_type,
+            self.question,
+            answer,
         )
-        return answer, None
+        await self.save_state(resp.digest, answer, extra)
+        if cache:
+            await cache.put(self.cache_key, resp.validators, answer, extra)
+        return answer, extra
+
+
+def _xpath_text_job(
+    content: bytes, encoding: str | None, digest: str, xpaths: tuple[str, ...]
+) -> str:
+    """Parse job, runs in the parse executor (possibly in another process)."""
+    # the tree is shared with other monitors on this page (in this process),
+    # xpath evaluation is read-only
+    tree = get_document_cache().get_or_parse(
+        "lxml",
+        digest,
+        lambda: XpathWordMonitor._parse_tree(  # pyright: ignore[reportPrivateUsage]
+            content.decode(encoding or "utf-8", errors="replace")
+        ),
+    )
+    texts = (
+        XpathWordMonitor._extract_from_xpath(tree, xpath)  # pyright: ignore[reportPrivateUsage]
+        for xpath in xpaths
+    )
+    return " ".join(t for t in texts if t)
 
 
 if __name__ == "__main__":
@@ -1,3 +1 @@
-from izthere.notifiers.telegram_notifier import (
-    TelegramNotifier,  # noqa: F401  # pyright: ignore[reportUnusedImport]
-)
+# implementations are imported on first use by Notifier.from_config, see BUILTIN_NOTIFIERS
@@ -1,11 +1,22 @@
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, ClassVar
+from typing import Any, ClassVar, Final
+
+from izthere.plugins import load_plugin
+
+# built-in notifiers, imported on first use
+BUILTIN_NOTIFIERS: Final[dict[str, str]] = {
+    "telegram": "izthere.notifiers.telegram_notifier",
+}
 
 
 class Notifier(ABC):
     _registry: ClassVar[dict[str, type["Notifier"]]] = {}
 
+    # do not send a result identical to the previous one of the same monitor
+    skip_unchanged: bool = False
+
     def __init_subclass__(
         cls, *, notifier_type: str | None = None, **kwargs: Any
     ) -> None:
@@ -22,10 +33,16 @@ class Notifier(ABC):
         answer: bool,
         ts: datetime,
         extra: str | None = None,
-    ) -> None:
-        """Send a human-readable notification."""
+    ) -> asyncio.Future[None] | None:
+        """
+        Send a human-readable notification. A notifier batching results returns once
+        this one is queued, with a future resolved (or failed) when the batch is sent.
+        """
         ...
 
+    async def close(self) -> None:
+        """Flush and release whatever the notifier holds, called on shutdown."""
+
     @classmethod
     def from_config(cls, cfg: dict[str, Any]) -> "Notifier":
         """
@@ -35,7 +52,9 @@ class Notifier(ABC):
         if not notifier_type:
             raise ValueError("Notifier config missing required field 'type'")
 
-        concrete_cls: type[Notifier] | None = cls._registry.get(notifier_type)
+        concrete_cls: type[Notifier] | None = load_plugin(
+            cls._registry, BUILTIN_NOTIFIERS, "izthere.notifiers", notifier_type
+        )
         if concrete_cls is None:
             raise ValueError(f"Unsupported notifier type: {notifier_type}")
 
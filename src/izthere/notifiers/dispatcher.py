@@ -0,0 +1,288 @@
+import asyncio
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from izthere.hooks import observe
+from izthere.logger import get_logger, log_monitor
+from izthere.metrics import get_metrics
+from izthere.notifiers.base import Notifier
+
+logger = get_logger()
+
+
+@dataclass(frozen=True)
+class Notification:
+    what: str
+    where: str
+    answer: bool
+    ts: datetime
+    extra: str | None = None
+
+
+# notifiers still to reach, the result, and which attempt this is (from 1)
+_Delivery = tuple[tuple[Notifier, ...], Notification, int]
+
+
+class NotificationDispatcher:
+    """
+    Delivers monitor results off the monitors' critical path.
+
+    Results are put on a bounded queue drained by ``workers`` tasks; each one is sent to
+    its notifiers concurrently and a failed delivery is put back on the queue after an
+    exponential backoff (``backoff_seconds`` doubled per attempt, capped at
+    ``max_backoff_seconds``), a worker never sits out the backoff. A notifier batching
+    results (``notify`` returning a future) frees the worker right away, its outcome is
+    handled once the future resolves. When the queue is full ``submit`` waits for room,
+    slowing producers down instead of buffering without limit.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 1000,
+        workers: int = 4,
+        max_attempts: int = 5,
+        backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 60.0,
+    ) -> None:
+        self.workers: int = workers
+        self.max_attempts: int = max_attempts
+        self.backoff_seconds: float = backoff_seconds
+        self.max_backoff_seconds: float = max_backoff_seconds
+        self._queue: asyncio.Queue[_Delivery] = asyncio.Queue(maxsize=queue_size)
+        self._tasks: list[asyncio.Task[None]] = []
+        # deliveries waiting out their backoff before going back on the queue
+        self._retries: set[asyncio.Task[None]] = set()
+        # deliveries handed to a notifier's batch, not sent yet
+        self._deferred: set[asyncio.Future[None]] = set()
+
+    def start(self) -> None:
+        """Spawn the workers, must be called from the running event loop."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"notification-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() + len(self._deferred)
+
+    async def submit(
+        self, notifiers: Sequence[Notifier], notification: Notification
+    ) -> None:
+        """Enqueue a result, returns as soon as it is queued (waits while full)."""
+        if not notifiers:
+            return
+        if self._queue.full():
+            logger.warning(
+                "notification queue full (%s), waiting for room", self._queue.maxsize
+            )
+        await self._queue.put((tuple(notifiers), notification, 1))
+
+    async def send(
+        self, notifiers: Sequence[Notifier], notification: Notification
+    ) -> bool:
+        """
+        Deliver a result right away, bypassing the queue (retries included), for callers
+        that wait for the outcome. ``True`` when every notifier got it.
+        """
+        delivered = await asyncio.gather(
+            *(self._deliver(n, notification) for n in notifiers)
+        )
+        return all(delivered)
+
+    async def _work(self) -> None:
+        while True:
+            notifiers, notification, attempt = await self._queue.get()
+            try:
+                outcomes = await asyncio.gather(
+                    *(
+                        self._attempt(n, notification, attempt, wait=False)
+                        for n in notifiers
+                    )
+                )
+                failed = tuple(n for n, ok in zip(notifiers, outcomes) if ok is None)
+                if failed:
+                    self._retry_later((failed, notification, attempt + 1))
+            finally:
+                self._queue.task_done()
+
+    def _retry_later(self, delivery: _Delivery) -> None:
+        task = asyncio.create_task(self._requeue(delivery))
+        self._retries.add(task)
+        task.add_done_callback(self._retries.discard)
+
+    async def _requeue(self, delivery: _Delivery) -> None:
+        await asyncio.sleep(self._backoff(delivery[2] - 1))
+        await self._queue.put(delivery)
+
+    def _backoff(self, attempt: int) -> float:
+        return min(self.backoff_seconds * 2 ** (attempt - 1), self.max_backoff_seconds)
+
+    async def _deliver(self, notifier: Notifier, notification: Notification) -> bool:
+        for attempt in range(1, self.max_attempts + 1):
+            delivered = await self._attempt(notifier, notification, attempt)
+            if delivered is not None:
+                return delivered
+            await asyncio.sleep(self._backoff(attempt))
+        return False
+
+    async def _attempt(
+        self,
+        notifier: Notifier,
+        notification: Notification,
+        attempt: int,
+        wait: bool = True,
+    ) -> bool | None:
+        """
+        Try once, ``None`` when the delivery is to be retried after a backoff. Without
+        ``wait`` a delivery the notifier batches counts as done here, ``_settle`` retries
+        it later if the batch fails.
+        """
+        # gather runs each delivery in its own task, this does not leak to the caller
+        _ = log_monitor.set(notification.what)
+        start = time.perf_counter()
+        try:
+            with observe(
+                "notifier", notifier.notifier_type, notification.where, notifier
+            ):
+                pending = await notifier.notify(
+                    what=notification.what,
+                    where=notification.where,
+                    answer=notification.answer,
+                    ts=notification.ts,
+                    extra=notification.extra,
+                )
+                if pending is not None and wait:
+                    await pending
+        except Exception as e:  # noqa: BLE001
+            self._record(notifier, start, e)
+            return self._failed(notifier, notification, attempt, e)
+        if pending is not None and not wait:
+            self._deferred.add(pending)
+            pending.add_done_callback(
+                lambda sent: self._settle(sent, notifier, notification, attempt, start)
+            )
+            return True
+        self._record(notifier, start, None)
+        return True
+
+    def _settle(
+        self,
+        sent: asyncio.Future[None],
+        notifier: Notifier,
+        notification: Notification,
+        attempt: int,
+        start: float,
+    ) -> None:
+        """Outcome of a batched delivery, retried like any other when it failed."""
+        self._deferred.discard(sent)
+        error = asyncio.CancelledError() if sent.cancelled() else sent.exception()
+        self._record(notifier, start, error)
+        if error is None:
+            return
+        if self._failed(notifier, notification, attempt, error) is not None:
+            return
+        if not self._tasks:
+            logger.error(
+                "[%s] dropping '%s', the dispatcher is closed",
+                notifier.notifier_type,
+                notification.what,
+            )
+            return
+        self._retry_later(((notifier,), notification, attempt + 1))
+
+    def _failed(
+        self,
+        notifier: Notifier,
+        notification: Notification,
+        attempt: int,
+        error: BaseException,
+    ) -> bool | None:
+        """Log a failed attempt, ``None`` when it is to be retried, ``False`` if not."""
+        if attempt >= self.max_attempts:
+            logger.error(
+                "[%s] giving up on '%s' after %s attempt(s): %s",
+                notifier.notifier_type,
+                notification.what,
+                attempt,
+                error,
+            )
+            return False
+        logger.warning(
+            "[%s] delivery of '%s' failed (attempt %s/%s), retrying in %.1fs: %s",
+            notifier.notifier_type,
+            notification.what,
+            attempt,
+            self.max_attempts,
+            self._backoff(attempt),
+            error,
+        )
+        return None
+
+    @staticmethod
+    def _record(notifier: Notifier, start: float, error: BaseException | None) -> None:
+        metrics = get_metrics()
+        if metrics is not None:
+            elapsed = time.perf_counter() - start
+            metrics.record_notify(notifier.notifier_type, elapsed, error)
+
+    async def close(self, timeout: float | None = None) -> None:
+        """Give queued results ``timeout`` seconds to go out, then stop the workers."""
+        if self._tasks:
+            try:
+                await asyncio.wait_for(self._drain(), timeout)
+            except TimeoutError:
+                logger.warning(
+                    "dropping %s undelivered notification(s)",
+                    self._queue.qsize() + len(self._retries) + len(self._deferred),
+                )
+        tasks = [*self._retries, *self._tasks]
+        for task in tasks:
+            _ = task.cancel()
+        _ = await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _drain(self) -> None:
+        # a retry goes back on the queue once its backoff is over, and a batched
+        # delivery may fail into a retry: wait for all of them
+        while True:
+            await self._queue.join()
+            if not self._retries and not self._deferred:
+                return
+            _ = await asyncio.wait({*self._retries, *self._deferred})
+
+
+_dispatcher: NotificationDispatcher | None = None
+_drain_timeout: float = 10.0
+
+
+def configure_dispatcher(cfg: dict[str, Any] | None) -> NotificationDispatcher:
+    """Create and start the process-wide dispatcher from the ``dispatch`` section."""
+    global _dispatcher, _drain_timeout
+    cfg = cfg or {}
+    _dispatcher = NotificationDispatcher(
+        queue_size=cfg.get("queue_size", 1000),
+        workers=cfg.get("workers", 4),
+        max_attempts=cfg.get("max_attempts", 5),
+        backoff_seconds=cfg.get("backoff_seconds", 1.0),
+        max_backoff_seconds=cfg.get("max_backoff_seconds", 60.0),
+    )
+    _drain_timeout = cfg.get("drain_timeout_seconds", 10.0)
+    _dispatcher.start()
+    return _dispatcher
+
+
+def get_dispatcher() -> NotificationDispatcher | None:
+    return _dispatcher
+
+
+async def close_dispatcher() -> None:
+    global _dispatcher
+    if _dispatcher is not None:
+        await _dispatcher.close(_drain_timeout)
+        _dispatcher = None
@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Async token bucket: up to ``capacity`` calls at once, refilled at ``rate`` tokens per
+    second. ``acquire`` waits for a token, callers are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("token bucket needs a positive rate and a capacity >= 1")
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self._tokens: float = capacity
+        self._updated: float = time.monotonic()
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:  # FIFO, a waiter keeps its turn while sleeping
+            self._refill()
+            # pause() may push the tokens back while sleeping, check again
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for ``seconds`` (server asked to slow down)."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - seconds * self.rate
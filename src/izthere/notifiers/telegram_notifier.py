@@ -1,26 +1,258 @@
-import html
-from datetime import datetime, timezone
-from typing import Any, override
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import Any, Final, override
 from urllib.parse import urlparse
 
 from telegram import Bot
+from telegram.error import RetryAfter
 from telegram.helpers import escape_markdown
 
 from izthere.logger import get_logger
 from izthere.notifiers.base import Notifier
+from izthere.notifiers.rate_limit import TokenBucket
 
 logger = get_logger()
 
+MAX_MESSAGE_LENGTH: Final[int] = 4096
+# Telegram allows about 30 messages per second per bot across all chats
+BOT_MESSAGES_PER_SECOND: Final[float] = 30.0
+MAX_RETRY_AFTER: Final[int] = 3
+DIGEST_SEPARATOR: Final[str] = "\n\n────────\n\n"
+
+
+def split_message(text: str, limit: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """
+    Cut a MarkdownV2 message in parts of at most ``limit`` characters, on line breaks
+    (entities never span lines here) and otherwise never inside an escape sequence.
+    """
+    parts: list[str] = []
+    current = ""
+    for line in text.split("\n"):
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            parts.append(current)
+        while len(line) > limit:
+            head = line[:limit]
+            # odd trailing backslashes: the last one escapes the next character
+            cut = limit - (len(head) - len(head.rstrip("\\"))) % 2
+            parts.append(line[:cut])
+            line = line[cut:]
+        current = line
+    if current:
+        parts.append(current)
+    return parts
+
+
+def pack_messages(texts: list[str], limit: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """Merge messages into as few as possible, a message is split only when too long."""
+    return [message for message, _ in _pack(texts, limit)]
+
+
+def _pack(texts: list[str], limit: int) -> list[tuple[str, set[int]]]:
+    """``pack_messages``, with the indexes of the texts each message carries."""
+    messages: list[tuple[str, set[int]]] = []
+    current = ""
+    owners: set[int] = set()
+    for i, text in enumerate(texts):
+        for part in split_message(text, limit):
+            candidate = f"{current}{DIGEST_SEPARATOR}{part}" if current else part
+            if len(candidate) <= limit:
+                current = candidate
+                owners.add(i)
+            else:
+                messages.append((current, owners))
+                current, owners = part, {i}
+    if current:
+        messages.append((current, owners))
+    return messages
+
+
+def _retry_after_seconds(error: RetryAfter) -> float:
+    delay = error.retry_after
+    return delay.total_seconds() if isinstance(delay, timedelta) else float(delay)
+
+
+_bots: dict[tuple[str, str | None], Bot] = {}
+_bot_limits: dict[str, TokenBucket] = {}
+_chats: dict[tuple[str, str], "_Chat"] = {}
+
+
+def _get_bot(token: str, api_url: str | None = None) -> tuple[Bot, TokenBucket]:
+    """One ``Bot`` (and connection pool) per token, shared by every notifier using it."""
+    key = (token, api_url)
+    if key not in _bots:
+        if api_url:
+            _bots[key] = Bot(token=token, base_url=f"{api_url.rstrip('/')}/bot")
+        else:
+            _bots[key] = Bot(token=token)
+    if token not in _bot_limits:
+        _bot_limits[token] = TokenBucket(
+            BOT_MESSAGES_PER_SECOND, capacity=BOT_MESSAGES_PER_SECOND
+        )
+    return _bots[key], _bot_limits[token]
+
+
+class _Chat:
+    """
+    Everything sent to one chat with one bot: rate limited by a token bucket and,
+    in digest mode, buffered for a short window then merged into few messages.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        chat_id: str,
+        per_minute: float,
+        burst: int,
+        api_url: str | None = None,
+    ) -> None:
+        self.bot, self.bot_limit = _get_bot(token, api_url)
+        self.chat_id: str = chat_id
+        self.limit: TokenBucket = TokenBucket(per_minute / 60, capacity=burst)
+        # queued text, and the future notify returned for it, resolved once it is sent
+        self._digest: list[tuple[str, asyncio.Future[None]]] = []
+        self._timer: asyncio.Task[None] | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def send(self, text: str) -> None:
+        for part in split_message(text):
+            await self._send_part(part)
+
+    async def _send_part(self, text: str) -> None:
+        attempt = 0
+        while True:
+            await self.limit.acquire()
+            await self.bot_limit.acquire()
+            try:
+                _ = await self.bot.send_message(
+                    chat_id=self.chat_id, text=text, parse_mode="MarkdownV2"
+                )
+                return
+            except RetryAfter as e:
+                attempt += 1
+                if attempt > MAX_RETRY_AFTER:
+                    raise
+                delay = _retry_after_seconds(e)
+                logger.warning(
+                    "[telegram] flood control on chat_id=%s, retrying in %ss",
+                    self.chat_id,
+                    delay,
+                )
+                self.limit.pause(delay)
+
+    def add_to_digest(self, text: str, window: float) -> asyncio.Future[None]:
+        """Queue ``text``, the future is resolved once the digest holding it is sent."""
+        sent: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._digest.append((text, sent))
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after(window))
+            self._tasks.add(self._timer)
+            self._timer.add_done_callback(self._tasks.discard)
+        return sent
+
+    async def _flush_after(self, window: float) -> None:
+        await asyncio.sleep(window)  # cancelled by close() to flush right away
+        await self._flush()
+
+    async def _flush(self) -> None:
+        entries, self._digest = self._digest, []
+        self._timer = None
+        messages = _pack([text for text, _ in entries], MAX_MESSAGE_LENGTH)
+        errors: dict[int, Exception] = {}
+        for i, (message, owners) in enumerate(messages):
+            try:
+                await self._send_part(message)
+            except Exception as e:  # noqa: BLE001
+                logger.error(
+                    "Failed to send Telegram digest to chat_id=%s (%s of %s): %s",
+                    self.chat_id,
+                    i + 1,
+                    len(messages),
+                    e,
+                )
+                errors.update(dict.fromkeys(owners, e))
+        # the notify calls waiting on failed entries raise, for the dispatcher to retry
+        for i, (_, sent) in enumerate(entries):
+            if sent.done():
+                continue
+            if i in errors:
+                sent.set_exception(errors[i])
+            else:
+                sent.set_result(None)
+        if len(errors) < len(entries):
+            logger.info(
+                "[telegram] sent a digest of %s result(s) in %s message(s) to chat_id=%s",
+                len(entries) - len(errors),
+                len(messages),
+                self.chat_id,
+            )
+
+    async def close(self) -> None:
+        if self._timer is not None:
+            _ = self._timer.cancel()
+            await self._flush()
+        _ = await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def _get_chat(
+    token: str,
+    chat_id: str,
+    per_minute: float,
+    burst: int,
+    api_url: str | None = None,
+) -> _Chat:
+    key = (token, chat_id)
+    chat = _chats.get(key)
+    if chat is None or chat.bot is not _get_bot(token, api_url)[0]:
+        chat = _chats[key] = _Chat(token, chat_id, per_minute, burst, api_url)
+    elif (chat.limit.rate, chat.limit.capacity) != (per_minute / 60, burst):
+        chat.limit = TokenBucket(per_minute / 60, capacity=burst)  # config reloaded
+    return chat
+
 
 class TelegramNotifier(Notifier, notifier_type="telegram"):
-    def __init__(self, *, bot_token: str, chat_id: str):
-        self.bot: Bot = Bot(token=bot_token)
+    """
+    Notifiers sharing a token share one ``Bot``, and those sharing a chat share its rate
+    limit (``messages_per_minute``, ``burst``) and its digest. With
+    ``digest_window_seconds`` results for the chat are buffered that long and sent
+    merged instead of one message each. ``api_url`` points the bot to another Bot API
+    server than ``https://api.telegram.org`` (self-hosted, or a stand-in for tests).
+    """
+
+    def __init__(
+        self,
+        *,
+        bot_token: str,
+        chat_id: str,
+        skip_unchanged: bool = False,
+        messages_per_minute: float = 20,
+        burst: int = 3,
+        digest_window_seconds: float = 0,
+        api_url: str | None = None,
+    ):
+        self._chat: _Chat = _get_chat(
+            bot_token, chat_id, messages_per_minute, burst, api_url
+        )
+        self.bot: Bot = self._chat.bot
         self.chat_id: str = chat_id
+        self.skip_unchanged = skip_unchanged
+        self.digest_window_seconds: float = digest_window_seconds
 
     @classmethod
     @override
     def from_config(cls, cfg: dict[str, Any]) -> "TelegramNotifier":
-        return cls(bot_token=cfg["bot_token"], chat_id=cfg["chat_id"])
+        return cls(
+            bot_token=cfg["bot_token"],
+            chat_id=cfg["chat_id"],
+            skip_unchanged=cfg.get("skip_unchanged", False),
+            messages_per_minute=cfg.get("messages_per_minute", 20),
+            burst=cfg.get("burst", 3),
+            digest_window_seconds=cfg.get("digest_window_seconds", 0),
+            api_url=cfg.get("api_url"),
+        )
 
     @override
     async def notify(
@@ -30,10 +262,10 @@ class TelegramNotifier(Notifier, notifier_type="telegram"):
         answer: bool,
         ts: datetime,
         extra: str | None = None,
-    ) -> None:
+    ) -> asyncio.Future[None] | None:
         status = "✅ Yes" if answer else "❌ No"
 
-        local_ts = datetime.now(timezone.utc).astimezone()
+        local_ts = datetime.now(UTC).astimezone()
         tz_name = local_ts.tzname()
 
         parsed_where = urlparse(where)
@@ -52,10 +284,19 @@ class TelegramNotifier(Notifier, notifier_type="telegram"):
         if extra:
             text = "\n\n".join([text, f"*Extra:* {escape_markdown(extra, version=2)}"])
 
-        try:
-            _ = await self.bot.send_message(
-                chat_id=self.chat_id, text=text, parse_mode="MarkdownV2"
+        if self.digest_window_seconds > 0:
+            sent = self._chat.add_to_digest(text, self.digest_window_seconds)
+            logger.debug(
+                "[%s] queued what=%s for the digest of chat_id=%s",
+                self.notifier_type,
+                what,
+                self.chat_id,
             )
+            # delivered (or failed) once the digest is sent, the caller does not wait
+            return sent
+
+        try:
+            await self._chat.send(text)
         except Exception:
             logger.exception(
                 "Failed to send Telegram message to chat_id=%s for what=%s",
@@ -65,5 +306,14 @@ class TelegramNotifier(Notifier, notifier_type="telegram"):
             raise
         else:
             logger.info(
-                f"[{self.notifier_type}] notified what={what}, answer={answer} to chat_id={self.chat_id}"
+                "[%s] notified what=%s, answer=%s to chat_id=%s",
+                self.notifier_type,
+                what,
+                answer,
+                self.chat_id,
             )
+        return None
+
+    @override
+    async def close(self) -> None:
+        await self._chat.close()
@@ -0,0 +1,39 @@
+import importlib
+from importlib.metadata import entry_points
+from typing import Any
+
+from izthere.logger import get_logger
+
+logger = get_logger()
+
+
+def load_plugin(
+    registry: dict[str, type[Any]],
+    builtins: dict[str, str],
+    group: str,
+    type_name: str,
+) -> type[Any] | None:
+    """
+    Return the class registered for ``type_name``, importing its module on first use.
+
+    Built-in implementations are listed in ``builtins`` (type -> module path) and
+    register themselves through ``__init_subclass__`` once imported. Third-party ones are
+    looked up in the ``group`` entry points, whose name is the type and whose value is
+    the class (``package.module:Class``).
+    """
+    concrete = registry.get(type_name)
+    if concrete is not None:
+        return concrete
+
+    module = builtins.get(type_name)
+    if module is not None:
+        _ = importlib.import_module(module)
+        return registry.get(type_name)
+
+    for ep in entry_points(group=group, name=type_name):
+        loaded = ep.load()
+        logger.debug("loaded plugin '%s' from %s", type_name, ep.value)
+        # a plugin registering under another type name is still usable by its ep name
+        _ = registry.setdefault(type_name, loaded)
+        return registry[type_name]
+    return None
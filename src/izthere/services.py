@@ -0,0 +1,81 @@
+import os
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from izthere.hooks import close_hooks, configure_hooks
+from izthere.monitors.document_cache import configure_document_cache
+from izthere.monitors.http_client import close_client_manager, configure_client_manager
+from izthere.monitors.parse_executor import (
+    configure_parse_executor,
+    shutdown_parse_executor,
+)
+from izthere.monitors.response_cache import (
+    close_response_cache,
+    configure_response_cache,
+)
+from izthere.monitors.seen_store import close_seen_store, configure_seen_store
+from izthere.monitors.state_store import close_state_store, configure_state_store
+from izthere.notifiers.dispatcher import (
+    NotificationDispatcher,
+    close_dispatcher,
+    configure_dispatcher,
+)
+
+
+def load_config(file_path: Path) -> Any:
+    """Simple safe loader – returns a list of dicts (empty list if file missing)."""
+    if not file_path.is_file():
+        return []
+    with file_path.open("r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def config_path(override: str | None = None) -> Path:
+    path = Path(override or os.environ.get("IZTHERE_CONFIG_PATH", "./config.yaml"))
+    if not path.exists():
+        raise FileNotFoundError(
+            "Configuration file not found, set IZTHERE_CONFIG_PATH to a valid path"
+        )
+    return path
+
+
+def data_dir(configs: dict[str, Any]) -> Path:
+    directory: str = (
+        os.environ.get("IZTHERE_DATA_DIR") or configs.get("data_dir") or "./.izthere"
+    )
+    return Path(directory)
+
+
+def configure_services(
+    configs: dict[str, Any], persist: bool = True
+) -> NotificationDispatcher:
+    """
+    Set up the process-wide pools and stores the monitors and notifiers rely on, shared
+    by the daemon and one-shot runs. Returns the started dispatcher.
+
+    Without ``persist`` the response cache, seen items and state stores are left
+    closed: monitors evaluate from scratch and leave no trace for the next run.
+    """
+    directory = data_dir(configs)
+    _ = configure_client_manager(configs.get("http"))
+    if persist:
+        _ = configure_response_cache(configs.get("cache"), directory)
+        _ = configure_seen_store(configs.get("seen_items"), directory)
+        _ = configure_state_store(configs.get("state"), directory)
+    _ = configure_document_cache(configs.get("document_cache"))
+    _ = configure_parse_executor(configs.get("parse_executor"))
+    _ = configure_hooks(configs.get("hooks"), configs.get("profiling"), directory)
+    return configure_dispatcher(configs.get("dispatch"))
+
+
+async def close_services() -> None:
+    """Undo ``configure_services``, queued notifications get a chance to go out."""
+    await close_dispatcher()
+    await close_client_manager()
+    close_response_cache()
+    close_seen_store()
+    close_state_store()
+    shutdown_parse_executor()
+    close_hooks()
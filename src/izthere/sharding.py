@@ -0,0 +1,255 @@
+import asyncio
+import bisect
+import hashlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from izthere.logger import get_logger
+
+logger = get_logger()
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS members (
+        worker_id TEXT PRIMARY KEY,
+        heartbeat_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS firings (
+        job TEXT NOT NULL,
+        fire_time TEXT NOT NULL,
+        worker_id TEXT NOT NULL,
+        claimed_at REAL NOT NULL,
+        PRIMARY KEY (job, fire_time)
+    ) WITHOUT ROWID
+    """,
+)
+
+
+def _position(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest())
+
+
+class HashRing:
+    """
+    Consistent hashing of monitor names over workers. Every worker is placed on the ring
+    ``vnodes`` times, so a worker joining or leaving only moves about ``1/N`` of the
+    monitors and the rest keep their owner.
+    """
+
+    def __init__(self, members: list[str], vnodes: int = 64) -> None:
+        self.members: tuple[str, ...] = tuple(sorted(set(members)))
+        points = sorted(
+            (_position(f"{member}#{i}"), member)
+            for member in self.members
+            for i in range(vnodes)
+        )
+        self._positions: list[int] = [p for p, _ in points]
+        self._owners: list[str] = [m for _, m in points]
+
+    def owner(self, key: str) -> str | None:
+        if not self._owners:
+            return None
+        i = bisect.bisect(self._positions, _position(key)) % len(self._positions)
+        return self._owners[i]
+
+
+class LeaseStore:
+    """
+    Coordination state shared by the workers of a fleet, in a SQLite database they can
+    all reach: live members (refreshed by heartbeats) and the claims that make a trigger
+    fire on a single worker.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path: Path = path
+        self._lock: threading.Lock = threading.Lock()
+        self._conn: sqlite3.Connection = sqlite3.connect(
+            path, timeout=10, check_same_thread=False, isolation_level=None
+        )
+        _ = self._conn.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            _ = self._conn.execute(statement)
+
+    def heartbeat(self, worker_id: str, lease_seconds: float) -> list[str]:
+        """Renew ``worker_id`` and return the workers whose lease is still valid."""
+        now = time.time()
+        with self._lock:
+            _ = self._conn.execute(
+                "INSERT OR REPLACE INTO members VALUES (?, ?)", (worker_id, now)
+            )
+            rows = self._conn.execute(
+                "SELECT worker_id FROM members WHERE heartbeat_at >= ?",
+                (now - lease_seconds,),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def leave(self, worker_id: str) -> None:
+        with self._lock:
+            _ = self._conn.execute(
+                "DELETE FROM members WHERE worker_id = ?", (worker_id,)
+            )
+
+    def claim(self, job: str, fire_time: str, worker_id: str) -> bool:
+        """``True`` for the first worker claiming this firing of ``job``."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO firings VALUES (?, ?, ?, ?)",
+                (job, fire_time, worker_id, time.time()),
+            )
+            return cursor.rowcount == 1
+
+    def prune(self, older_than_seconds: float) -> None:
+        cutoff = time.time() - older_than_seconds
+        with self._lock:
+            _ = self._conn.execute(
+                "DELETE FROM firings WHERE claimed_at < ?", (cutoff,)
+            )
+            _ = self._conn.execute(
+                "DELETE FROM members WHERE heartbeat_at < ?", (cutoff,)
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ShardCoordinator:
+    """
+    Splits the monitors of a shared config between the workers of a fleet.
+
+    Every worker schedules every monitor; when a trigger fires, the owner of the monitor
+    on the hash ring claims the firing right away while the other workers only try after
+    ``claim_grace_seconds``, covering for an owner that died or has a different view of
+    the membership. The claim table lets exactly one of them run it.
+    """
+
+    def __init__(
+        self,
+        store: LeaseStore,
+        worker_id: str,
+        heartbeat_seconds: float = 10.0,
+        lease_seconds: float = 30.0,
+        claim_grace_seconds: float = 5.0,
+    ) -> None:
+        self.store: LeaseStore = store
+        self.worker_id: str = worker_id
+        self.heartbeat_seconds: float = heartbeat_seconds
+        self.lease_seconds: float = lease_seconds
+        self.claim_grace_seconds: float = claim_grace_seconds
+        self.ring: HashRing = HashRing([worker_id])
+        self._task: asyncio.Task[None] | None = None
+
+    async def refresh(self) -> None:
+        members = await asyncio.to_thread(
+            self.store.heartbeat, self.worker_id, self.lease_seconds
+        )
+        if self.worker_id not in members:
+            members.append(self.worker_id)
+        ring = HashRing(members)
+        if ring.members != self.ring.members:
+            logger.info(
+                "shard membership changed: %s worker(s) %s",
+                len(ring.members),
+                list(ring.members),
+            )
+        self.ring = ring
+
+    async def start(self) -> None:
+        await self.refresh()
+        self._task = asyncio.create_task(self._heartbeat_loop(), name="shard-heartbeat")
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await self.refresh()
+                # claims are only compared within a trigger, a day of history is plenty
+                await asyncio.to_thread(self.store.prune, 24 * 3600)
+            except Exception as e:  # noqa: BLE001
+                logger.error("shard heartbeat failed: %s", e)
+
+    def owns(self, name: str) -> bool:
+        return self.ring.owner(name) == self.worker_id
+
+    async def claim(self, name: str, fire_time: datetime) -> bool:
+        """Wait for our turn and try to take this firing of the monitor ``name``."""
+        if not self.owns(name):
+            await asyncio.sleep(self.claim_grace_seconds)
+        won = await asyncio.to_thread(
+            self.store.claim, name, fire_time.isoformat(), self.worker_id
+        )
+        if won and not self.owns(name):
+            logger.info("took over monitor '%s' for %s", name, fire_time.isoformat())
+        return won
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            _ = self._task.cancel()
+            _ = await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        # leaving right away lets the others rebalance without waiting for the lease
+        await asyncio.to_thread(self.store.leave, self.worker_id)
+        self.store.close()
+
+
+def firing_time(due: datetime | None = None) -> datetime:
+    """
+    Identify a cron firing across workers from the time it was due (now if unknown):
+    cron triggers fire on whole minutes, rounding to the nearest one absorbs clock skew
+    below 30 seconds between workers.
+    """
+    now = (due or datetime.now(UTC)).astimezone(UTC)
+    rounded = now.replace(second=0, microsecond=0)
+    if now - rounded >= timedelta(seconds=30):
+        rounded += timedelta(minutes=1)
+    return rounded
+
+
+_coordinator: ShardCoordinator | None = None
+
+
+async def configure_sharding(
+    cfg: dict[str, Any] | None, data_dir: Path
+) -> ShardCoordinator | None:
+    """Join the fleet described by the ``sharding`` config section, if enabled."""
+    global _coordinator
+    cfg = cfg or {}
+    if not cfg.get("enabled", False):
+        return None
+
+    worker_id: str = (
+        os.environ.get("IZTHERE_WORKER_ID")
+        or cfg.get("worker_id")
+        or f"{socket.gethostname()}-{os.getpid()}"
+    )
+    store = LeaseStore(Path(cfg.get("path", data_dir / "shards.sqlite3")))
+    _coordinator = ShardCoordinator(
+        store,
+        worker_id,
+        heartbeat_seconds=cfg.get("heartbeat_seconds", 10.0),
+        lease_seconds=cfg.get("lease_seconds", 30.0),
+        claim_grace_seconds=cfg.get("claim_grace_seconds", 5.0),
+    )
+    await _coordinator.start()
+    logger.info("sharding enabled, worker id %s", worker_id)
+    return _coordinator
+
+
+def get_sharding() -> ShardCoordinator | None:
+    return _coordinator
+
+
+async def close_sharding() -> None:
+    global _coordinator
+    if _coordinator is not None:
+        await _coordinator.stop()
+        _coordinator = None
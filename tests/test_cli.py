@@ -0,0 +1,235 @@
+import asyncio
+import json
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any, ClassVar, override
+
+import httpx
+import pytest
+import yaml
+
+from izthere import logger
+from izthere.cli import EXIT_FAILED, EXIT_OK, EXIT_USAGE, run_once
+from izthere.logger import set_log_stream
+from izthere.monitors.http_client import ClientManager
+from izthere.notifiers.base import Notifier
+
+
+class RecordingNotifier(Notifier):
+    """Records what it is sent, or fails every time with ``fail: true``."""
+
+    notifier_type = "recording"
+    sent: ClassVar[list[str]] = []
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail: bool = fail
+
+    @classmethod
+    @override
+    def from_config(cls, cfg: dict[str, Any]) -> "RecordingNotifier":
+        return cls(fail=cfg.get("fail", False))
+
+    @override
+    async def notify(
+        self,
+        what: str,
+        where: str,
+        answer: bool,
+        ts: datetime,
+        extra: str | None = None,
+    ) -> None:
+        if self.fail:
+            raise ConnectionError("unreachable")
+        self.sent.append(what)
+
+
+async def serve(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/down":
+        return httpx.Response(500)
+    return httpx.Response(200, content=b"<p>backend engineer</p>")
+
+
+@pytest.fixture(autouse=True)
+def stubs(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[str]]:
+    """Pages served by ``serve`` and the ``recording`` notifier type."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(serve))
+    monkeypatch.setattr(
+        ClientManager, "client", lambda self, headers=None, timeout=10: client
+    )
+    monkeypatch.setitem(Notifier._registry, "recording", RecordingNotifier)  # pyright: ignore[reportPrivateUsage]
+    monkeypatch.setattr(RecordingNotifier, "sent", [])
+    yield RecordingNotifier.sent
+    asyncio.run(client.aclose())
+
+
+def monitor(question: str, path: str = "/careers") -> dict[str, Any]:
+    return {
+        "question": question,
+        "type": "html_word",
+        "url": f"http://pages.test{path}",
+        "keywords": ["backend"],
+        "schedule": "*/5 * * * *",
+        "notifiers": ["rec"],
+    }
+
+
+def config(
+    tmp_path: Path,
+    monitors: list[dict[str, Any]],
+    notifier: dict[str, Any] | None = None,
+) -> str:
+    path = tmp_path / "config.yaml"
+    configs = {
+        "data_dir": str(tmp_path / "data"),
+        "dispatch": {"max_attempts": 1},
+        "notifiers": [{"name": "rec", "type": "recording", **(notifier or {})}],
+        "monitors": monitors,
+    }
+    _ = path.write_text(yaml.safe_dump(configs))
+    return str(path)
+
+
+def run(
+    capsys: pytest.CaptureFixture[str], config_file: str, **options: Any
+) -> tuple[int, dict[str, Any] | None]:
+    # run_once sends the logs to the stderr of this test, put them back afterwards
+    stream_handler = logger._stream_handler  # pyright: ignore[reportPrivateUsage]
+    previous = stream_handler.stream if stream_handler is not None else None
+    try:
+        status = asyncio.run(run_once(config_file, **options))
+    finally:
+        if previous is not None:
+            set_log_stream(previous)
+    out = capsys.readouterr().out
+    return status, json.loads(out) if out else None
+
+
+def test_report_of_a_successful_run(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], stubs: list[str]
+) -> None:
+    config_file = config(tmp_path, [monitor("Is Backend hiring")])
+
+    status, report = run(capsys, config_file)
+
+    assert status == EXIT_OK
+    assert report is not None
+    assert report["dry_run"] is False
+    [result] = report["monitors"]
+    assert {k: v for k, v in result.items() if k != "timings"} == {
+        "name": "is_backend_hiring",
+        "question": "Is Backend hiring",
+        "type": "html_word",
+        "url": "http://pages.test/careers",
+        "answer": True,
+        "extra": "matched: backend (@0)",
+        "error": None,
+        "notifiers": ["rec"],
+        "delivered": True,
+    }
+    assert {"load", "run", "fetch", "notify"} <= set(result["timings"])
+    summary = report["summary"]
+    assert {k: v for k, v in summary.items() if k != "seconds"} == {
+        "total": 1,
+        "matched": 1,
+        "failed": [],
+        "undelivered": [],
+    }
+    assert stubs == ["Is Backend hiring"]
+
+
+def test_failed_monitor_exits_with_1(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monitors = [monitor("Is Backend hiring"), monitor("Is it up", path="/down")]
+
+    status, report = run(capsys, config(tmp_path, monitors))
+
+    assert status == EXIT_FAILED
+    assert report is not None
+    assert report["summary"]["failed"] == ["is_it_up"]
+    assert report["summary"]["total"] == 2
+
+
+def test_undelivered_notification_exits_with_1(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    config_file = config(tmp_path, [monitor("Is Backend hiring")], {"fail": True})
+
+    status, report = run(capsys, config_file)
+
+    assert status == EXIT_FAILED
+    assert report is not None
+    assert report["monitors"][0]["delivered"] is False
+    assert report["summary"]["undelivered"] == ["is_backend_hiring"]
+
+
+def test_selection_by_pattern(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monitors = [monitor("Is Backend hiring"), monitor("Is it up", path="/down")]
+
+    # matched against the question and the job name, ignoring case
+    status, report = run(capsys, config(tmp_path, monitors), pattern="BACKEND_h")
+
+    assert status == EXIT_OK
+    assert report is not None
+    assert [r["name"] for r in report["monitors"]] == ["is_backend_hiring"]
+
+
+@pytest.mark.parametrize(
+    ("monitors", "pattern"),
+    [
+        ([monitor("Is Backend hiring")], "frontend"),
+        ([{**monitor("Is Backend hiring"), "notifiers": ["missing"]}], None),
+    ],
+)
+def test_usage_errors_exit_with_2(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monitors: list[dict[str, Any]],
+    pattern: str | None,
+) -> None:
+    status, report = run(capsys, config(tmp_path, monitors), pattern=pattern)
+
+    assert (status, report) == (EXIT_USAGE, None)
+
+
+def test_monitor_that_cannot_be_built_fails_alone(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monitors = [{**monitor("Is it up"), "type": "nope"}, monitor("Is Backend hiring")]
+
+    status, report = run(capsys, config(tmp_path, monitors))
+
+    assert status == EXIT_FAILED
+    assert report is not None
+    broken, working = report["monitors"]
+    assert broken["error"].startswith("invalid monitor")
+    assert working["answer"] is True
+
+
+def test_missing_config_exits_with_2(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert run(capsys, str(tmp_path / "missing.yaml")) == (EXIT_USAGE, None)
+
+
+def test_dry_run_neither_notifies_nor_persists(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], stubs: list[str]
+) -> None:
+    config_file = config(tmp_path, [monitor("Is Backend hiring")])
+
+    status, report = run(capsys, config_file, dry_run=True)
+
+    assert status == EXIT_OK
+    assert report is not None
+    assert report["dry_run"] is True
+    [result] = report["monitors"]
+    assert result["answer"] is True
+    # routed, but not sent
+    assert result["notifiers"] == ["rec"]
+    assert "delivered" not in result
+    assert stubs == []
+    data = tmp_path / "data"
+    assert not data.exists() or not any(data.glob("*.sqlite3"))
@@ -0,0 +1,184 @@
+import asyncio
+import itertools
+import time
+from datetime import UTC, datetime
+from typing import Any, override
+
+from izthere.notifiers.base import Notifier
+from izthere.notifiers.dispatcher import Notification, NotificationDispatcher
+
+
+class FlakyNotifier(Notifier):
+    """Fails its first ``failures`` calls, each call taking ``delay`` seconds."""
+
+    # built directly, not registered as a type configs could use
+    notifier_type = "flaky"
+
+    def __init__(self, failures: int = 0, delay: float = 0) -> None:
+        self.failures: int = failures
+        self.delay: float = delay
+        self.calls: list[tuple[str, float]] = []
+        self.delivered: list[str] = []
+
+    @override
+    async def notify(
+        self,
+        what: str,
+        where: str,
+        answer: bool,
+        ts: datetime,
+        extra: str | None = None,
+    ) -> None:
+        self.calls.append((what, time.monotonic()))
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("unreachable")
+        self.delivered.append(what)
+
+
+def notification(what: str = "job") -> Notification:
+    return Notification(
+        what=what,
+        where="https://example.com",
+        answer=True,
+        ts=datetime.now(UTC),
+    )
+
+
+def dispatcher(**options: Any) -> NotificationDispatcher:
+    settings: dict[str, Any] = {"backoff_seconds": 0.05, "max_backoff_seconds": 1}
+    return NotificationDispatcher(**{**settings, **options})
+
+
+def test_failed_delivery_is_retried_with_backoff() -> None:
+    notifier = FlakyNotifier(failures=2)
+
+    async def scenario() -> None:
+        d = dispatcher()
+        d.start()
+        await d.submit([notifier], notification())
+        await d.close(timeout=5)
+
+    asyncio.run(scenario())
+
+    assert notifier.delivered == ["job"]
+    times = [t for _, t in notifier.calls]
+    gaps = [b - a for a, b in itertools.pairwise(times)]
+    # 0.05s then 0.1s, doubled on every attempt
+    assert len(gaps) == 2
+    assert 0.04 <= gaps[0] < gaps[1]
+    assert gaps[1] >= 0.09
+
+
+def test_gives_up_after_max_attempts() -> None:
+    notifier = FlakyNotifier(failures=10)
+
+    async def scenario() -> None:
+        d = dispatcher(max_attempts=3)
+        d.start()
+        await d.submit([notifier], notification())
+        await d.close(timeout=5)
+
+    asyncio.run(scenario())
+
+    assert len(notifier.calls) == 3
+    assert notifier.delivered == []
+
+
+def test_only_the_failed_notifiers_are_retried() -> None:
+    failing, working = FlakyNotifier(failures=1), FlakyNotifier()
+
+    async def scenario() -> None:
+        d = dispatcher()
+        d.start()
+        await d.submit([failing, working], notification())
+        await d.close(timeout=5)
+
+    asyncio.run(scenario())
+
+    assert failing.delivered == ["job"]
+    assert len(failing.calls) == 2
+    assert len(working.calls) == 1
+
+
+def test_backoff_does_not_hold_a_worker() -> None:
+    failing, other = FlakyNotifier(failures=1), FlakyNotifier()
+
+    async def scenario() -> float:
+        d = dispatcher(workers=1, backoff_seconds=0.5)
+        d.start()
+        start = time.monotonic()
+        await d.submit([failing], notification("failing"))
+        await d.submit([other], notification("other"))
+        while not other.delivered:
+            await asyncio.sleep(0.01)
+        elapsed = time.monotonic() - start
+        await d.close(timeout=5)
+        return elapsed
+
+    # the only worker delivers the other result while the first one waits out its backoff
+    assert asyncio.run(scenario()) < 0.3
+    assert failing.delivered == ["failing"]
+
+
+def test_close_drains_the_queue_and_pending_retries() -> None:
+    notifiers = [FlakyNotifier(failures=i % 2, delay=0.01) for i in range(10)]
+
+    async def scenario() -> None:
+        d = dispatcher(workers=2)
+        d.start()
+        for i, notifier in enumerate(notifiers):
+            await d.submit([notifier], notification(f"job {i}"))
+        await d.close(timeout=5)
+
+    asyncio.run(scenario())
+
+    assert [n.delivered for n in notifiers] == [[f"job {i}"] for i in range(10)]
+
+
+def test_close_drops_what_is_left_after_the_timeout() -> None:
+    notifier = FlakyNotifier(failures=10)
+
+    async def scenario() -> list[asyncio.Task[Any]]:
+        d = dispatcher(backoff_seconds=10, max_backoff_seconds=10)
+        d.start()
+        await d.submit([notifier], notification())
+        await d.close(timeout=0.1)
+        await asyncio.sleep(0)
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    # the retry waiting out its backoff is cancelled with the workers
+    assert asyncio.run(scenario()) == []
+    assert len(notifier.calls) == 1
+
+
+def test_send_waits_for_the_outcome() -> None:
+    flaky, down = FlakyNotifier(failures=1), FlakyNotifier(failures=10)
+
+    async def scenario() -> tuple[bool, bool]:
+        d = dispatcher(max_attempts=2)
+        return (
+            await d.send([flaky], notification()),
+            await d.send([flaky, down], notification()),
+        )
+
+    assert asyncio.run(scenario()) == (True, False)
+    assert len(down.calls) == 2
+
+
+def test_full_queue_slows_the_producer_down() -> None:
+    notifier = FlakyNotifier(delay=0.05)
+
+    async def scenario() -> float:
+        d = dispatcher(workers=1, queue_size=1)
+        d.start()
+        start = time.monotonic()
+        for i in range(4):
+            await d.submit([notifier], notification(f"job {i}"))
+        elapsed = time.monotonic() - start
+        await d.close(timeout=5)
+        return elapsed
+
+    assert asyncio.run(scenario()) >= 0.05
+    assert notifier.delivered == [f"job {i}" for i in range(4)]
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from izthere.monitors.document_cache import DocumentCache
+
+
+class Computation:
+    """Counts its calls, each one taking ``delay`` seconds and failing if ``error``."""
+
+    def __init__(self, delay: float = 0.05, error: Exception | None = None) -> None:
+        self.delay: float = delay
+        self.error: Exception | None = error
+        self.calls: int = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return f"tree {self.calls}"
+
+
+def test_concurrent_callers_share_one_computation() -> None:
+    cache, compute = DocumentCache(), Computation()
+
+    async def scenario() -> list[str]:
+        return await asyncio.gather(
+            *(cache.get_or_compute("tree", "digest", compute) for _ in range(5))
+        )
+
+    assert asyncio.run(scenario()) == ["tree 1"] * 5
+    assert compute.calls == 1
+
+
+def test_cancelled_caller_leaves_the_computation_to_the_others() -> None:
+    cache, compute = DocumentCache(), Computation()
+
+    async def scenario() -> tuple[str, str]:
+        first = asyncio.create_task(cache.get_or_compute("tree", "digest", compute))
+        second = asyncio.create_task(cache.get_or_compute("tree", "digest", compute))
+        await asyncio.sleep(0.01)
+        _ = first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # a caller arriving after the cancellation still joins the same computation
+        third = await cache.get_or_compute("tree", "digest", compute)
+        return await second, third
+
+    assert asyncio.run(scenario()) == ("tree 1", "tree 1")
+    assert compute.calls == 1
+
+
+def test_failed_computation_is_not_cached() -> None:
+    cache = DocumentCache()
+    failing = Computation(error=ValueError("broken page"))
+
+    async def scenario() -> str:
+        results = await asyncio.gather(
+            cache.get_or_compute("tree", "digest", failing),
+            cache.get_or_compute("tree", "digest", failing),
+            return_exceptions=True,
+        )
+        assert [type(r) for r in results] == [ValueError, ValueError]
+        return await cache.get_or_compute("tree", "digest", Computation())
+
+    assert asyncio.run(scenario()) == "tree 1"
+    assert failing.calls == 1
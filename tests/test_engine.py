@@ -0,0 +1,208 @@
+import asyncio
+import copy
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from izthere.engine import Engine
+from izthere.monitors.execution import ExecutionScheduler
+from izthere.notifiers.dispatcher import NotificationDispatcher
+
+CONFIG: dict[str, Any] = {
+    "notifiers": [
+        {"name": "alerts", "type": "telegram", "bot_token": "1:test", "chat_id": "1"},
+        {"name": "digest", "type": "telegram", "bot_token": "1:test", "chat_id": "2"},
+    ],
+    "monitors": [
+        {
+            "question": "Is Backend hiring",
+            "type": "html_word",
+            "url": "https://example.com/backend",
+            "keywords": ["backend"],
+            "schedule": "*/5 * * * *",
+            "notifiers": ["alerts"],
+        },
+        {
+            "question": "Is Frontend hiring",
+            "type": "html_word",
+            "url": "https://example.com/frontend",
+            "keywords": ["frontend"],
+            "schedule": "0 * * * *",
+            "notifiers": ["alerts", "digest"],
+        },
+    ],
+}
+
+
+def reload(
+    change: Callable[[dict[str, Any]], None],
+    check: Callable[[Engine, dict[str, Any]], None],
+) -> None:
+    """Apply ``CONFIG``, then ``CONFIG`` changed by ``change``, and ``check`` the engine."""
+
+    async def scenario() -> None:
+        scheduler = AsyncIOScheduler()
+        scheduler.start(paused=True)
+        engine = Engine(scheduler, NotificationDispatcher(), ExecutionScheduler())
+        try:
+            await engine.apply(copy.deepcopy(CONFIG))
+            before = {
+                "notifiers": dict(engine.notifiers),
+                "monitors": dict(engine.monitors),
+                "triggers": {j.id: str(j.trigger) for j in scheduler.get_jobs()},
+            }
+            configs = copy.deepcopy(CONFIG)
+            change(configs)
+            await engine.apply(configs)
+            check(engine, before)
+        finally:
+            scheduler.shutdown(wait=False)
+            await engine.close()
+
+    asyncio.run(scenario())
+
+
+def jobs(engine: Engine) -> dict[str, str]:
+    return {j.id: str(j.trigger) for j in engine.scheduler.get_jobs()}
+
+
+def test_unchanged_config_keeps_everything() -> None:
+    def check(engine: Engine, before: dict[str, Any]) -> None:
+        assert engine.notifiers == before["notifiers"]
+        for name, m in engine.monitors.items():
+            assert m is before["monitors"][name]
+        for name, n in engine.notifiers.items():
+            assert n is before["notifiers"][name]
+        assert jobs(engine) == before["triggers"]
+
+    reload(lambda _: None, check)
+
+
+def test_changed_monitor_and_notifier_are_rebuilt() -> None:
+    def change(configs: dict[str, Any]) -> None:
+        configs["monitors"][0]["keywords"] = ["backend", "python"]
+        configs["notifiers"][1]["skip_unchanged"] = True
+
+    def check(engine: Engine, before: dict[str, Any]) -> None:
+        monitors, notifiers = before["monitors"], before["notifiers"]
+        assert engine.monitors["is_backend_hiring"] is not monitors["is_backend_hiring"]
+        assert engine.monitors["is_frontend_hiring"] is monitors["is_frontend_hiring"]
+        assert engine.notifiers["digest"] is not notifiers["digest"]
+        assert engine.notifiers["digest"].skip_unchanged
+        assert engine.notifiers["alerts"] is notifiers["alerts"]
+        # the rebuilt monitor keeps its job, looked up by name on every run
+        assert jobs(engine) == before["triggers"]
+
+    reload(change, check)
+
+
+def test_routing_change_keeps_the_monitor() -> None:
+    def change(configs: dict[str, Any]) -> None:
+        configs["monitors"][0]["notifiers"] = ["digest"]
+
+    def check(engine: Engine, before: dict[str, Any]) -> None:
+        assert (
+            engine.monitors["is_backend_hiring"]
+            is before["monitors"]["is_backend_hiring"]
+        )
+        assert engine.routes["is_backend_hiring"] == ["digest"]
+
+    reload(change, check)
+
+
+def test_schedule_change_reschedules_the_job() -> None:
+    def change(configs: dict[str, Any]) -> None:
+        configs["monitors"][1]["schedule"] = "30 8 * * *"
+
+    def check(engine: Engine, before: dict[str, Any]) -> None:
+        triggers = jobs(engine)
+        assert triggers["is_backend_hiring"] == before["triggers"]["is_backend_hiring"]
+        assert (
+            triggers["is_frontend_hiring"] != before["triggers"]["is_frontend_hiring"]
+        )
+        assert "hour='8'" in triggers["is_frontend_hiring"]
+        monitor = engine.monitors["is_frontend_hiring"]
+        assert monitor is before["monitors"]["is_frontend_hiring"]
+
+    reload(change, check)
+
+
+def test_removed_monitor_and_notifier_are_dropped() -> None:
+    def change(configs: dict[str, Any]) -> None:
+        del configs["monitors"][1]
+        del configs["notifiers"][1]
+
+    def check(engine: Engine, before: dict[str, Any]) -> None:
+        assert set(jobs(engine)) == {"is_backend_hiring"}
+        assert set(engine.monitors) == {"is_backend_hiring"}
+        assert set(engine.notifiers) == {"alerts"}
+        assert set(engine.routes) == {"is_backend_hiring"}
+
+    reload(change, check)
+
+
+def test_added_monitor_is_scheduled() -> None:
+    def change(configs: dict[str, Any]) -> None:
+        configs["monitors"].append(
+            {**configs["monitors"][0], "question": "Is Data hiring"}
+        )
+
+    def check(engine: Engine, before: dict[str, Any]) -> None:
+        assert set(jobs(engine)) == {*before["triggers"], "is_data_hiring"}
+        assert (
+            engine.monitors["is_backend_hiring"]
+            is before["monitors"]["is_backend_hiring"]
+        )
+
+    reload(change, check)
+
+
+def break_notifier_reference(configs: dict[str, Any]) -> None:
+    configs["monitors"][0]["keywords"] = ["changed"]
+    configs["monitors"][1]["notifiers"] = ["missing"]
+
+
+def break_schedule(configs: dict[str, Any]) -> None:
+    del configs["monitors"][0]
+    configs["monitors"][0]["schedule"] = "not a cron"
+
+
+def define_twice(configs: dict[str, Any]) -> None:
+    configs["monitors"].append(configs["monitors"][0])
+
+
+@pytest.mark.parametrize(
+    "change", [break_notifier_reference, break_schedule, define_twice]
+)
+def test_invalid_config_is_rejected_as_a_whole(
+    change: Callable[[dict[str, Any]], None],
+) -> None:
+    async def scenario() -> None:
+        scheduler = AsyncIOScheduler()
+        scheduler.start(paused=True)
+        engine = Engine(scheduler, NotificationDispatcher(), ExecutionScheduler())
+        try:
+            await engine.apply(copy.deepcopy(CONFIG))
+            monitors, notifiers = dict(engine.monitors), dict(engine.notifiers)
+            triggers = jobs(engine)
+
+            configs = copy.deepcopy(CONFIG)
+            change(configs)
+            with pytest.raises((ValueError, RuntimeError)):
+                await engine.apply(configs)
+
+            # nothing of the broken config was applied
+            assert engine.monitors == monitors
+            assert all(engine.monitors[n] is m for n, m in monitors.items())
+            assert engine.notifiers == notifiers
+            assert jobs(engine) == triggers
+            # and the running config is still the one diffed against
+            await engine.apply(copy.deepcopy(CONFIG))
+            assert all(engine.monitors[n] is m for n, m in monitors.items())
+        finally:
+            scheduler.shutdown(wait=False)
+            await engine.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,130 @@
+import asyncio
+import gzip
+import re
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+
+from izthere.monitors.html_word_monitor import HtmlWordMonitor
+from izthere.monitors.http_client import close_client_manager, configure_client_manager
+from izthere.monitors.keyword_matcher import MatchMode
+
+URL = "http://pages.test/bundle"
+HEAD = b"<p>video edit"
+TAIL = b"ing tools</p>"
+
+
+def run(
+    m: HtmlWordMonitor, chunks: list[bytes], headers: dict[str, str] | None = None
+) -> tuple[bool, str | None]:
+    async def body() -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body(), headers=headers)
+
+    async def scenario() -> tuple[bool, str | None]:
+        manager = configure_client_manager()
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        manager.client = lambda headers=None, timeout=10: client  # pyright: ignore[reportAttributeAccessIssue]
+        try:
+            return await m.run()
+        finally:
+            await client.aclose()
+            await close_client_manager()
+
+    return asyncio.run(scenario())
+
+
+def monitor(mode: MatchMode, max_bytes: int | None = None) -> HtmlWordMonitor:
+    return HtmlWordMonitor(
+        name="bundle",
+        url=URL,
+        keywords=["edit"],
+        match_mode=mode,
+        streaming=True,
+        max_bytes=max_bytes,
+    )
+
+
+def test_word_at_the_end_of_the_page_matches() -> None:
+    assert run(monitor("word"), [HEAD]) == (True, "matched: edit (@6)")
+
+
+def test_word_cut_by_max_bytes_is_left_undecided() -> None:
+    # "edit" ends the downloaded part, the page goes on with "ing"
+    found, extra = run(monitor("word", max_bytes=len(HEAD)), [HEAD, TAIL])
+    assert not found
+    assert extra == f"page truncated at {len(HEAD)} bytes (max_bytes={len(HEAD)})"
+
+
+@pytest.mark.parametrize("mode", ["word", "substring"])
+def test_whole_page_is_searched_without_max_bytes(mode: MatchMode) -> None:
+    found, _ = run(monitor(mode), [HEAD, TAIL])
+    assert found is (mode == "substring")
+
+
+def test_substring_cut_by_max_bytes_matches() -> None:
+    found, extra = run(monitor("substring", max_bytes=len(HEAD)), [HEAD, TAIL])
+    assert found
+    assert extra is not None and extra.startswith("matched: edit (@6), page truncated")
+
+
+def test_word_before_whitespace_at_the_cut_matches() -> None:
+    head = HEAD + b" "
+    found, _ = run(monitor("word", max_bytes=len(head)), [head, b"tools</p>"])
+    assert found
+
+
+def test_max_bytes_counts_decompressed_bytes() -> None:
+    # a few hundred bytes on the wire, the word sits far past max_bytes once inflated
+    page = gzip.compress(b"<p>" + b"video " * 20_000 + b"edit</p>")
+    chunks = [page[i : i + 64] for i in range(0, len(page), 64)]
+
+    found, extra = run(
+        monitor("word", max_bytes=1000), chunks, {"Content-Encoding": "gzip"}
+    )
+
+    assert not found
+    assert extra is not None
+    truncated = re.fullmatch(r"page truncated at (\d+) bytes \(max_bytes=1000\)", extra)
+    assert truncated and 1000 <= int(truncated[1]) < 120_000
+
+
+def test_max_bytes_must_be_below_max_response_bytes() -> None:
+    with pytest.raises(ValueError):
+        _ = HtmlWordMonitor.from_config(
+            {
+                "question": "bundle",
+                "url": URL,
+                "keywords": ["edit"],
+                "streaming": True,
+                "max_bytes": 1000,
+                "max_response_bytes": 1000,
+            }
+        )
+    # 0 is no limit
+    _ = HtmlWordMonitor(
+        name="bundle", url=URL, keywords=["edit"], max_bytes=1000, max_response_bytes=0
+    )
+
+
+def test_max_bytes_is_checked_against_the_http_limit() -> None:
+    _ = configure_client_manager({"max_response_bytes": 1000})
+    try:
+        with pytest.raises(ValueError, match=r"max_response_bytes \(1000\)"):
+            _ = HtmlWordMonitor(
+                name="bundle", url=URL, keywords=["edit"], max_bytes=1000
+            )
+        # the monitor's own limit takes over the http section's
+        _ = HtmlWordMonitor(
+            name="bundle",
+            url=URL,
+            keywords=["edit"],
+            max_bytes=1000,
+            max_response_bytes=2000,
+        )
+    finally:
+        asyncio.run(close_client_manager())
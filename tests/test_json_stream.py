@@ -0,0 +1,119 @@
+import json
+import random
+from typing import Any
+
+import pytest
+
+from izthere.monitors.json_stream import JSONItemStream
+from izthere.monitors.predicates import resolve_path
+
+KEYS = ["jobs", "data", "items", "id", "title", "a", "b", "", 'k"ey', "é", "\\"]
+STRINGS = ["", "x", "backend", 'quo"te', "back\\slash", "new\nline", "tab\t", "é☺", "😀",
+           "[{", "]}", ",:", "\u0000", "/"]  # fmt: skip
+
+
+def random_value(rng: random.Random, depth: int = 0) -> Any:
+    kind = rng.randint(0, 9 if depth < 4 else 5)
+    if kind == 0:
+        return None
+    if kind == 1:
+        return rng.choice([True, False])
+    if kind == 2:
+        return rng.randint(-(10**12), 10**12)
+    if kind == 3:
+        return rng.choice([0.5, -1.25e-7, 3.0e21, 1e100, -0.0, 123.456])
+    if kind in (4, 5):
+        return rng.choice(STRINGS)
+    if kind in (6, 7):
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    # distinct keys: with duplicates json.loads keeps the last one, the stream the first
+    keys = rng.sample(KEYS, rng.randint(0, 4))
+    return {k: random_value(rng, depth + 1) for k in keys}
+
+
+def random_document(rng: random.Random, path: tuple[str, ...]) -> Any:
+    """A document where ``path`` is often present, leading to an array or an object."""
+    if rng.random() < 0.15:
+        return [random_value(rng, 1) for _ in range(rng.randint(0, 6))]
+    target = rng.choice(
+        [
+            [random_value(rng, 1) for _ in range(rng.randint(0, 8))],
+            random_value(rng, 1),
+        ]
+    )
+    doc: Any = target
+    for key in reversed(path):
+        wrapper = random_value(rng, 3)
+        wrapper = wrapper if isinstance(wrapper, dict) else {}
+        wrapper.pop(key, None)
+        # the key of interest anywhere among the others, or missing altogether
+        if rng.random() < 0.9:
+            entries = list(wrapper.items())
+            entries.insert(rng.randint(0, len(entries)), (key, doc))
+            wrapper = dict(entries)
+        doc = wrapper
+    return doc
+
+
+def dumps(rng: random.Random, doc: Any) -> str:
+    indent = rng.choice([None, None, 0, 2])
+    separators = rng.choice([(",", ":"), (", ", ": "), (" ,\n", " :\t")])
+    if indent is not None:
+        separators = (separators[0].rstrip(), separators[1])
+    return json.dumps(
+        doc, indent=indent, separators=separators, ensure_ascii=rng.random() < 0.5
+    )
+
+
+def expected_items(doc: Any, path: tuple[str, ...]) -> list[Any]:
+    """What the non streaming lookup of ``JSONParserMonitor`` evaluates."""
+    if isinstance(doc, list):
+        return doc
+    found = resolve_path(doc, path)
+    if isinstance(found, dict):
+        return [found]
+    return found if isinstance(found, list) else []
+
+
+def stream_items(text: str, path: tuple[str, ...], rng: random.Random) -> list[Any]:
+    parser = JSONItemStream(path)
+    items: list[Any] = []
+    pos = 0
+    while pos < len(text):
+        size = rng.choice([1, 2, 3, rng.randint(1, 64)])
+        items.extend(parser.feed(text[pos : pos + size]))
+        pos += size
+    items.extend(parser.close())
+    return items
+
+
+@pytest.mark.parametrize("path", [(), ("jobs",), ("data", "items"), ("a", "b", "id")])
+def test_random_documents_and_chunks_match_json_loads(path: tuple[str, ...]) -> None:
+    rng = random.Random(f"json-stream-{path}")
+    for _ in range(750):
+        doc = random_document(rng, path)
+        text = dumps(rng, doc)
+        expected = expected_items(json.loads(text), path)
+        assert stream_items(text, path, rng) == expected, text
+
+
+def test_numbers_cut_by_chunks() -> None:
+    text = '{"jobs": [123, -4.5e10, 0.25, true, null, "x"]}'
+    for cut in range(1, len(text)):
+        parser = JSONItemStream(("jobs",))
+        items = parser.feed(text[:cut]) + parser.feed(text[cut:]) + parser.close()
+        assert items == [123, -4.5e10, 0.25, True, None, "x"]
+
+
+def test_stops_reading_after_the_items() -> None:
+    parser = JSONItemStream(("jobs",))
+    assert parser.feed('{"jobs": [1, 2]') == [1, 2]
+    assert parser.done
+    assert parser.feed(', "rest": [') == []
+
+
+def test_truncated_document_raises() -> None:
+    parser = JSONItemStream(("jobs",))
+    _ = parser.feed('{"jobs": [{"id": 1}, {"id"')
+    with pytest.raises(ValueError):
+        _ = parser.close()
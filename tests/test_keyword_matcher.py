@@ -0,0 +1,131 @@
+import random
+
+import pytest
+
+from izthere.monitors.keyword_matcher import KeywordMatcher, MatchMode
+
+ALPHABET = "abcAB _-"
+MODES: list[MatchMode] = ["substring", "word"]
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def reference(
+    keywords: list[str], text: str, mode: MatchMode, case_sensitive: bool
+) -> list[tuple[int, str]]:
+    """(position, keyword) of the first acceptable occurrence, with plain ``str.find``."""
+    haystack = text if case_sensitive else text.lower()
+    matches: list[tuple[int, str]] = []
+    for keyword in keywords:
+        needle = keyword if case_sensitive else keyword.lower()
+        pos = haystack.find(needle)
+        while pos != -1 and mode == "word":
+            end = pos + len(needle)
+            before = pos == 0 or not _is_word_char(haystack[pos - 1])
+            after = end == len(haystack) or not _is_word_char(haystack[end])
+            if before and after:
+                break
+            pos = haystack.find(needle, pos + 1)
+        if pos != -1:
+            matches.append((pos, keyword))
+    return sorted(matches)
+
+
+def found(matcher: KeywordMatcher, text: str) -> list[tuple[int, str]]:
+    return sorted((m.position, m.keyword) for m in matcher.find(text))
+
+
+def scanned(
+    matcher: KeywordMatcher, text: str, sizes: list[int]
+) -> list[tuple[int, str]]:
+    scanner = matcher.scanner()
+    pos = 0
+    for size in sizes:
+        scanner.feed(text[pos : pos + size])
+        pos += size
+    scanner.feed(text[pos:])
+    scanner.close()
+    return sorted((m.position, m.keyword) for m in scanner.matches)
+
+
+def random_text(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def random_keywords(rng: random.Random, count: int) -> list[str]:
+    # mostly short words so that many of them occur, with the odd duplicate
+    return [random_text(rng, rng.randint(1, 6)).strip() or "a" for _ in range(count)]
+
+
+def check(
+    rng: random.Random, keywords: list[str], mode: MatchMode, case_sensitive: bool
+) -> None:
+    matcher = KeywordMatcher(keywords, case_sensitive=case_sensitive, mode=mode)
+    for _ in range(30):
+        text = random_text(rng, rng.randint(0, 200))
+        expected = reference(keywords, text, mode, case_sensitive)
+        assert found(matcher, text) == expected, text
+        sizes = [rng.randint(1, 9) for _ in range(len(text) // 3)]
+        assert scanned(matcher, text, sizes) == expected, (text, sizes)
+
+
+@pytest.mark.parametrize("case_sensitive", [False, True])
+@pytest.mark.parametrize("mode", MODES)
+def test_scans_match_find_loop(mode: MatchMode, case_sensitive: bool) -> None:
+    rng = random.Random(f"scans-{mode}-{case_sensitive}")
+    for _ in range(20):
+        keywords = random_keywords(rng, rng.randint(1, 12))
+        check(rng, keywords, mode, case_sensitive)
+
+
+@pytest.mark.parametrize("case_sensitive", [False, True])
+@pytest.mark.parametrize("mode", MODES)
+def test_automaton_matches_find_loop(mode: MatchMode, case_sensitive: bool) -> None:
+    rng = random.Random(f"automaton-{mode}-{case_sensitive}")
+    for _ in range(3):
+        count = KeywordMatcher.AUTOMATON_THRESHOLD + rng.randint(0, 50)
+        keywords = random_keywords(rng, count)
+        matcher = KeywordMatcher(keywords, case_sensitive=case_sensitive, mode=mode)
+        assert matcher._automaton is not None  # pyright: ignore[reportPrivateUsage]
+        check(rng, keywords, mode, case_sensitive)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_automaton_on_small_sets(
+    monkeypatch: pytest.MonkeyPatch, mode: MatchMode
+) -> None:
+    # few keywords exercise the fail links of the automaton more than hundreds do
+    monkeypatch.setattr(KeywordMatcher, "AUTOMATON_THRESHOLD", 1)
+    rng = random.Random(f"small-automaton-{mode}")
+    for _ in range(20):
+        check(rng, random_keywords(rng, rng.randint(1, 8)), mode, False)
+
+
+@pytest.mark.parametrize("threshold", [1, KeywordMatcher.AUTOMATON_THRESHOLD])
+@pytest.mark.parametrize("mode", MODES)
+def test_keyword_across_chunk_boundary(
+    monkeypatch: pytest.MonkeyPatch, threshold: int, mode: MatchMode
+) -> None:
+    monkeypatch.setattr(KeywordMatcher, "AUTOMATON_THRESHOLD", threshold)
+    text = "we are looking for video editing tools"
+    matcher = KeywordMatcher(["Video Editing", "tools"], mode=mode)
+    expected = [(text.index("video"), "Video Editing"), (text.index("tools"), "tools")]
+    for cut in range(1, len(text)):
+        assert scanned(matcher, text, [cut]) == expected
+
+
+def test_word_mode_waits_for_next_chunk() -> None:
+    # "edit" ends the first chunk, the next one decides it is part of "editing"
+    matcher = KeywordMatcher(["edit"], mode="word")
+    scanner = matcher.scanner()
+    scanner.feed("video edit")
+    scanner.feed("ing")
+    scanner.close()
+    assert not scanner.found_any
+
+    scanner = matcher.scanner()
+    scanner.feed("video edit")
+    scanner.close()
+    assert [m.position for m in scanner.matches] == [6]
@@ -0,0 +1,63 @@
+import asyncio
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from izthere.engine import Engine
+from izthere.main import shutdown
+from izthere.monitors.execution import configure_execution
+from izthere.notifiers.dispatcher import Notification
+from izthere.notifiers.telegram_notifier import TelegramNotifier
+from izthere.services import configure_services
+
+
+class FakeBot:
+    """Records the messages sent, the first ``failures`` calls raise."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures: int = failures
+        self.sent: list[str] = []
+
+    async def send_message(self, chat_id: str, text: str, **kwargs: Any) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("telegram unreachable")
+        self.sent.append(text)
+
+
+def test_shutdown_sends_the_pending_digest(tmp_path: Path) -> None:
+    bot = FakeBot()
+
+    async def scenario() -> float:
+        dispatcher = configure_services({"data_dir": str(tmp_path)})
+        scheduler = AsyncIOScheduler()
+        engine = Engine(scheduler, dispatcher, configure_execution())
+        notifier = TelegramNotifier(
+            bot_token="1:test", chat_id="shutdown", digest_window_seconds=60
+        )
+        notifier._chat.bot = bot  # pyright: ignore[reportPrivateUsage, reportAttributeAccessIssue]
+        engine.notifiers = {"digest": notifier}
+        scheduler.start()
+
+        await dispatcher.submit(
+            [notifier],
+            Notification(
+                what="job",
+                where="https://example.com/jobs",
+                answer=True,
+                ts=datetime.now(UTC),
+            ),
+        )
+        while not dispatcher.pending or dispatcher._queue.qsize():  # pyright: ignore[reportPrivateUsage]
+            await asyncio.sleep(0.01)
+
+        start = time.perf_counter()
+        await shutdown(scheduler, engine)
+        return time.perf_counter() - start
+
+    # flushed by the notifier, not dropped once the dispatcher gave up waiting for it
+    assert asyncio.run(scenario()) < 1
+    assert len(bot.sent) == 1
@@ -0,0 +1,139 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import httpx
+
+from izthere.metrics import Counter, Metrics, MetricsServer
+from izthere.monitors.html_word_monitor import HtmlWordMonitor
+from izthere.monitors.http_client import close_client_manager, configure_client_manager
+
+PAGE = b"<p>backend engineer</p>"
+
+
+async def serve(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/down":
+        return httpx.Response(503)
+
+    # streamed, a body given as bytes is not counted as downloaded
+    async def body() -> AsyncIterator[bytes]:
+        yield PAGE
+
+    return httpx.Response(200, content=body())
+
+
+def observed_runs() -> Metrics:
+    """Metrics after one run of a working monitor and one of a failing one."""
+    metrics = Metrics()
+
+    async def scenario() -> None:
+        manager = configure_client_manager()
+        client = httpx.AsyncClient(transport=httpx.MockTransport(serve))
+        manager.client = lambda headers=None, timeout=10: client  # pyright: ignore[reportAttributeAccessIssue]
+        try:
+            for name, path, seconds in (
+                ("careers", "/careers", 0.02),
+                ("down", "/down", 3),
+            ):
+                m = HtmlWordMonitor(
+                    name=name, url=f"http://pages.test{path}", keywords=["backend"]
+                )
+                _ = await m.run()
+                metrics.record_run(name, m, seconds)
+        finally:
+            await client.aclose()
+            await close_client_manager()
+
+    asyncio.run(scenario())
+    metrics.record_notify("telegram", 0.2, None)
+    metrics.record_notify("telegram", 0.3, ConnectionError("unreachable"))
+    return metrics
+
+
+def test_render_after_observed_runs() -> None:
+    lines = observed_runs().render().splitlines()
+
+    careers = 'monitor="careers",type="html_word"'
+    assert "# TYPE izthere_monitor_run_seconds histogram" in lines
+    assert (
+        f'izthere_monitor_run_seconds_bucket{{{careers},host="pages.test",le="0.01"}} 0'
+        in lines
+    )
+    assert (
+        f'izthere_monitor_run_seconds_bucket{{{careers},host="pages.test",le="0.025"}} 1'
+        in lines
+    )
+    assert (
+        f'izthere_monitor_run_seconds_bucket{{{careers},host="pages.test",le="+Inf"}} 1'
+        in lines
+    )
+    assert (
+        f'izthere_monitor_run_seconds_sum{{{careers},host="pages.test"}} 0.02' in lines
+    )
+    assert (
+        f'izthere_monitor_run_seconds_count{{{careers},host="pages.test"}} 1' in lines
+    )
+    assert f'izthere_monitor_phase_seconds_count{{{careers},phase="fetch"}} 1' in lines
+    assert (
+        f'izthere_monitor_phase_seconds_count{{{careers},phase="extract"}} 1' in lines
+    )
+
+    assert "# TYPE izthere_monitor_runs_total counter" in lines
+    assert f"izthere_monitor_runs_total{{{careers}}} 1.0" in lines
+    assert 'izthere_monitor_runs_total{monitor="down",type="html_word"} 1.0' in lines
+    assert (
+        'izthere_monitor_errors_total{monitor="down",type="html_word",error="HTTPStatusError"} 1.0'
+        in lines
+    )
+    assert not any(
+        line.startswith('izthere_monitor_errors_total{monitor="careers"')
+        for line in lines
+    )
+
+    # per monitor, the failed one downloaded no body
+    assert (
+        f'izthere_monitor_downloaded_bytes_total{{monitor="careers",host="pages.test"}} {float(len(PAGE))}'
+        in lines
+    )
+    assert not any('downloaded_bytes_total{monitor="down"' in line for line in lines)
+
+    assert 'izthere_notify_seconds_count{notifier="telegram"} 2' in lines
+    assert 'izthere_notify_seconds_sum{notifier="telegram"} 0.5' in lines
+    assert (
+        'izthere_notify_errors_total{notifier="telegram",error="ConnectionError"} 1.0'
+        in lines
+    )
+
+
+def test_metrics_without_samples_render_their_header_only() -> None:
+    lines = Metrics().render().splitlines()
+    assert "# TYPE izthere_scheduler_lag_seconds histogram" in lines
+    assert not any(line.startswith("izthere_scheduler_lag_seconds") for line in lines)
+
+
+def test_label_values_are_escaped() -> None:
+    counter = Counter("jobs_total", "Jobs.", ("title",))
+    counter.inc('a "quoted"\\ title\n')
+    assert counter.render()[-1] == 'jobs_total{title="a \\"quoted\\"\\\\ title\\n"} 1.0'
+
+
+def test_metrics_are_served() -> None:
+    async def scenario() -> tuple[bytes, bytes]:
+        metrics = Metrics()
+        metrics.runs.inc("careers", "html_word")
+        server = MetricsServer(metrics, "127.0.0.1", 0)
+        await server.start()
+        try:
+            url = f"http://127.0.0.1:{server.port}"
+            async with httpx.AsyncClient(base_url=url) as client:
+                served = await client.get("/metrics")
+                missing = await client.get("/")
+            return served.content, missing.content
+        finally:
+            await server.close()
+
+    body, not_found = asyncio.run(scenario())
+
+    assert (
+        b'izthere_monitor_runs_total{monitor="careers",type="html_word"} 1.0\n' in body
+    )
+    assert not_found == b"not found\n"
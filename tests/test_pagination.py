@@ -0,0 +1,248 @@
+import asyncio
+import json
+from collections.abc import Collection
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from izthere.monitors.http_client import close_client_manager, configure_client_manager
+from izthere.monitors.json_parser_monitor import JSONParserMonitor
+from izthere.monitors.pagination import Pagination, Strategy
+from izthere.monitors.predicates import Predicate
+from izthere.monitors.seen_store import close_seen_store, configure_seen_store
+
+BASE_URL = "http://api.test/jobs"
+PAGE_SIZE = 2
+
+
+class StubAPI:
+    """
+    Serves ``pages`` (lists of items, page 0 first) the way ``strategy`` asks for them,
+    answering page ``i`` after ``delays[i]`` seconds. Past the last page it serves [].
+    """
+
+    def __init__(
+        self,
+        strategy: Strategy,
+        pages: list[list[Any]],
+        delays: dict[int, float] | None = None,
+        cursors: dict[int, str | None] | None = None,
+    ) -> None:
+        self.strategy: Strategy = strategy
+        self.pages: list[list[Any]] = pages
+        self.delays: dict[int, float] = delays or {}
+        # cursor served with each page, "c<i+1>" by default
+        self.cursors: dict[int, str | None] = cursors or {}
+        self.requested: list[int] = []
+        self.completed: list[int] = []
+        self.active: int = 0
+
+    def index(self, request: httpx.Request) -> int:
+        params = request.url.params
+        if self.strategy == "page":
+            return int(params["page"]) - 1
+        if self.strategy == "offset":
+            return int(params["offset"]) // int(params["limit"])
+        if self.strategy == "cursor":
+            return int(params.get("cursor", "c0")[1:])
+        return int(params.get("p", "0"))
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        index = self.index(request)
+        self.requested.append(index)
+        self.active += 1
+        try:
+            await asyncio.sleep(self.delays.get(index, 0))
+        finally:
+            self.active -= 1
+        self.completed.append(index)
+
+        items = self.pages[index] if index < len(self.pages) else []
+        more = index + 1 < len(self.pages)
+        body: dict[str, Any] = {"items": items}
+        headers: dict[str, str] = {}
+        if self.strategy == "cursor":
+            body["next"] = self.cursors.get(index, f"c{index + 1}" if more else None)
+        if self.strategy == "link" and more:
+            headers["Link"] = f'<{BASE_URL}?p={index + 1}>; rel="next"'
+        return httpx.Response(200, content=json.dumps(body), headers=headers)
+
+
+def pagination(strategy: Strategy, **options: Any) -> Pagination:
+    settings: dict[str, Any] = {"strategy": strategy, "page_size": PAGE_SIZE}
+    if strategy == "cursor":
+        settings["cursor_path"] = "next"
+    return Pagination.from_config({**settings, **options})
+
+
+def monitor(strategy: Strategy, **options: Any) -> JSONParserMonitor:
+    stop = options.pop("stop_on_first_match", False)
+    identity_path = options.pop("identity_path", None)
+    return JSONParserMonitor(
+        name=f"paginated {strategy}",
+        url=BASE_URL,
+        items_path="items",
+        predicates=[Predicate("contains_insensitive", path="title", value="backend")],
+        extras_path="url",
+        stop_on_first_match=stop,
+        identity_path=identity_path,
+        pagination=pagination(strategy, **options),
+    )
+
+
+def run(m: JSONParserMonitor, api: StubAPI) -> tuple[bool, str | None]:
+    async def scenario() -> tuple[bool, str | None]:
+        manager = configure_client_manager()
+        client = httpx.AsyncClient(transport=httpx.MockTransport(api.handler))
+        manager.client = lambda headers=None, timeout=10: client  # pyright: ignore[reportAttributeAccessIssue]
+        try:
+            result = await m.run()
+            # whatever the walk cancelled has had the time to wind down
+            await asyncio.sleep(0.05)
+            assert api.active == 0
+            others = asyncio.all_tasks() - {asyncio.current_task()}
+            assert not others, others
+            return result
+        finally:
+            await client.aclose()
+            await close_client_manager()
+
+    return asyncio.run(scenario())
+
+
+def job(id: int, title: str = "frontend") -> dict[str, Any]:
+    return {"id": id, "title": title, "url": f"/jobs/{id}"}
+
+
+def urls(*ids: int) -> str:
+    return "\n".join(f"/jobs/{id}" for id in ids)
+
+
+def full_pages(count: int, matching: Collection[int] = ()) -> list[list[Any]]:
+    """``count`` full pages, the first item of the pages in ``matching`` matches."""
+    return [
+        [
+            job(i * PAGE_SIZE, "backend" if i in matching else "frontend"),
+            job(i * PAGE_SIZE + 1),
+        ]
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("strategy", ["page", "offset", "cursor", "link"])
+def test_every_page_is_walked(strategy: Strategy) -> None:
+    pages = [*full_pages(3, matching={0, 2}), [job(6, "backend")]]
+    api = StubAPI(strategy, pages)
+
+    found, extra = run(monitor(strategy), api)
+
+    assert found
+    assert extra == urls(0, 4, 6)
+    assert sorted(set(api.requested)) == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("strategy", ["page", "offset", "cursor", "link"])
+def test_walk_stops_at_max_pages(strategy: Strategy) -> None:
+    api = StubAPI(strategy, full_pages(10, matching={4}), {})
+
+    found, _ = run(monitor(strategy, max_pages=3), api)
+
+    assert not found
+    assert sorted(set(api.requested)) == [0, 1, 2]
+
+
+@pytest.mark.parametrize("strategy", ["page", "offset"])
+def test_short_last_page_arriving_first(strategy: Strategy) -> None:
+    # page 1 is the last one and answers before page 0, pages 2 and 3 are in flight
+    pages = [*full_pages(1, matching={0}), [job(2, "backend")]]
+    api = StubAPI(strategy, pages, delays={0: 0.2, 2: 1, 3: 1})
+
+    found, extra = run(monitor(strategy, concurrency=4), api)
+
+    # extras in page order, the requests past the last page cancelled
+    assert found
+    assert extra == urls(0, 2)
+    assert sorted(api.completed) == [0, 1]
+
+
+@pytest.mark.parametrize("strategy", ["page", "offset"])
+def test_failed_page_past_the_last_is_ignored(strategy: Strategy) -> None:
+    # page 2 fails as page 1 turns out to be the last one, page 0 is still in flight
+    pages = [*full_pages(1, matching={0}), []]
+
+    class FailingAPI(StubAPI):
+        async def handler(self, request: httpx.Request) -> httpx.Response:
+            if self.index(request) == 2:
+                return httpx.Response(500)
+            return await super().handler(request)
+
+    api = FailingAPI(strategy, pages, delays={0: 0.1, 3: 1})
+
+    found, extra = run(monitor(strategy, concurrency=4), api)
+
+    assert found
+    assert extra == urls(0)
+
+
+def test_failed_page_fails_the_run() -> None:
+    class FailingAPI(StubAPI):
+        async def handler(self, request: httpx.Request) -> httpx.Response:
+            if self.index(request) == 1:
+                return httpx.Response(500)
+            return await super().handler(request)
+
+    api = FailingAPI("page", full_pages(3), delays={0: 0.05, 2: 0.5})
+    m = monitor("page", concurrency=3)
+
+    found, _ = run(m, api)
+
+    assert not found
+    assert m.error_type == "HTTPStatusError"
+
+
+@pytest.mark.parametrize("strategy", ["page", "offset", "cursor", "link"])
+def test_stop_on_first_match(strategy: Strategy) -> None:
+    # the match on page 2 arrives first, pages 0 and 1 are still evaluated before it
+    pages = full_pages(8, matching={1, 2})
+    delays = {0: 0.1, 1: 0.2, **dict.fromkeys(range(3, 8), 0.5)}
+    api = StubAPI(strategy, pages, delays)
+
+    found, extra = run(
+        monitor(strategy, stop_on_first_match=True, max_pages=8, concurrency=4), api
+    )
+
+    # the item of page 1, the first matching page, and the requests in flight dropped
+    assert found
+    assert extra == urls(2)
+    assert set(api.completed) <= {0, 1, 2}
+
+
+def test_cursor_pointing_back_ends_the_walk() -> None:
+    api = StubAPI("cursor", full_pages(3), cursors={0: "c1", 1: "c1"})
+
+    found, _ = run(monitor("cursor", max_pages=10), api)
+
+    assert not found
+    assert api.requested == [0, 1]
+
+
+def test_seen_items_refreshed_for_evaluated_pages(tmp_path: Path) -> None:
+    store = configure_seen_store(None, tmp_path)
+    try:
+        pages = full_pages(4, matching={1, 3})
+        api = StubAPI("page", pages, delays={0: 0.1, 1: 0.2})
+        m = monitor("page", stop_on_first_match=True, identity_path="id")
+
+        assert run(m, api) == (True, urls(2))
+
+        # the pages up to the match are recorded, whatever order they arrived in
+        seen = store._load(m.cache_key)  # pyright: ignore[reportPrivateUsage]
+        assert {0, 1, 2} <= {int(i) for i in seen}
+        assert not {4, 5, 6, 7} & {int(i) for i in seen}
+
+        # next run: the match of page 1 is no longer new, page 3 holds the next one
+        assert run(m, StubAPI("page", pages)) == (True, urls(6))
+    finally:
+        close_seen_store()
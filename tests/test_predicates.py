@@ -0,0 +1,144 @@
+import random
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+import pytest
+
+from izthere.monitors.predicates import OPERATORS, Predicate, SubParser
+
+KEYS = ["title", "location", "tags", "team"]
+WORDS = ["Remote", "remote", "USA", "backend", "Engineer", "", "r", "42"]
+
+# the interpreter json_api monitors used before predicates were compiled
+REFERENCE_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "equal_insensitive": lambda val, target: str(val).lower() == str(target).lower(),
+    "contains_insensitive": lambda val, target: str(target).lower() in str(val).lower(),
+    "contains_any_insensitive": lambda val, targets: any(
+        str(t).lower() in str(val).lower() for t in targets
+    ),
+    "any_item_contains_insensitive": lambda val, target: any(
+        str(target).lower() in str(item).lower() for item in val
+    ),
+    "any_item_contains_any_insensitive": lambda val, targets: any(
+        str(t).lower() in str(item).lower() for t in targets for item in val
+    ),
+}
+
+
+def reference(item: dict[str, Any], pred: Predicate) -> bool:
+    if pred.op == "sub_parser" and pred.parser:
+        sub_items = item.get(pred.parser.items_path)
+        if not sub_items:
+            return False
+        if isinstance(sub_items, list):
+            return any(
+                all(reference(si, sp) for sp in pred.parser.predicates)
+                for si in sub_items
+            )
+        if isinstance(sub_items, dict):
+            return all(reference(sub_items, sp) for sp in pred.parser.predicates)
+        return False
+    actual = item.get(pred.path) if pred.path else item
+    return REFERENCE_OPERATORS[pred.op](actual, pred.value)
+
+
+def outcome(evaluate: Callable[[], bool]) -> bool | type[Exception]:
+    try:
+        return evaluate()
+    except Exception as e:  # noqa: BLE001
+        return type(e)
+
+
+def random_value(rng: random.Random) -> Any:
+    kind = rng.randint(0, 5)
+    if kind == 0:
+        return None
+    if kind == 1:
+        return rng.randint(0, 100)
+    if kind == 2:
+        return rng.choice(WORDS)
+    if kind == 3:
+        return {rng.choice(WORDS): rng.choice(WORDS)}
+    return [rng.choice([*WORDS, 7, None]) for _ in range(rng.randint(0, 3))]
+
+
+def random_item(rng: random.Random) -> dict[str, Any]:
+    item = {k: random_value(rng) for k in rng.sample(KEYS, rng.randint(0, 4))}
+    if rng.random() < 0.3:
+        item["offices"] = [
+            {k: random_value(rng) for k in rng.sample(KEYS, 2)}
+            for _ in range(rng.randint(0, 3))
+        ]
+    return item
+
+
+def random_predicate(rng: random.Random, depth: int = 0) -> Predicate:
+    if depth == 0 and rng.random() < 0.15:
+        return Predicate(
+            "sub_parser",
+            parser=SubParser(
+                items_path="offices",
+                predicates=[random_predicate(rng, 1) for _ in range(2)],
+            ),
+        )
+    op = rng.choice(list(OPERATORS))
+    if op.endswith("any_insensitive"):
+        # a list, or a string: its characters are the targets
+        value: Any = rng.choice(
+            [rng.sample(WORDS, rng.randint(0, 3)), rng.choice(WORDS)]
+        )
+    else:
+        value = rng.choice([*WORDS, 42])
+    return Predicate(op, path=rng.choice([*KEYS, None]), value=value)
+
+
+def test_compiled_predicates_match_the_interpreter() -> None:
+    rng = random.Random(7)
+    for _ in range(2000):
+        pred = random_predicate(rng)
+        for _ in range(5):
+            item = random_item(rng)
+            expected = outcome(partial(reference, item, pred))
+            assert outcome(partial(pred.evaluate, item)) == expected, (pred, item)
+
+
+@pytest.mark.parametrize(
+    ("val", "expected"),
+    [
+        (["Remote", "Berlin"], True),
+        (["Berlin"], False),
+        ("Remote", False),  # iterated by character
+        ({"remote": 1}, True),  # by key
+        ([], False),
+    ],
+)
+def test_any_item_contains(val: Any, expected: bool) -> None:
+    pred = Predicate("any_item_contains_insensitive", path="loc", value="remote")
+    assert pred.evaluate({"loc": val}) is expected
+
+
+def test_any_item_contains_on_a_missing_value_raises() -> None:
+    pred = Predicate("any_item_contains_insensitive", path="loc", value="remote")
+    with pytest.raises(TypeError):
+        _ = pred.evaluate({})
+
+
+def test_contains_any_with_a_string_value() -> None:
+    # each character is a target
+    pred = Predicate("contains_any_insensitive", path="title", value="xz")
+    assert pred.evaluate({"title": "Zoo"})
+    assert not pred.evaluate({"title": "Bar"})
+
+
+@pytest.mark.parametrize(
+    "op", ["contains_any_insensitive", "any_item_contains_any_insensitive"]
+)
+def test_contains_any_without_a_value_fails_at_compile_time(op: str) -> None:
+    with pytest.raises(ValueError):
+        _ = Predicate(op, path="title").compile()
+
+
+def test_unknown_operator() -> None:
+    with pytest.raises(ValueError):
+        _ = Predicate("nope", path="title", value="x").compile()
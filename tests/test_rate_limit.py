@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+import pytest
+
+from izthere.notifiers.rate_limit import TokenBucket
+
+
+def test_burst_then_rate() -> None:
+    async def scenario() -> float:
+        bucket = TokenBucket(rate=20, capacity=3)
+        start = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # 3 tokens at once, then 2 more at 20 per second
+    assert asyncio.run(scenario()) == pytest.approx(0.1, abs=0.05)
+
+
+def test_pause_during_a_wait_holds_the_waiter() -> None:
+    async def scenario() -> float:
+        bucket = TokenBucket(rate=10, capacity=1)
+        await bucket.acquire()
+        start = time.monotonic()
+        waiter = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0.05)  # the waiter sleeps until 0.1s for its token
+        bucket.pause(0.3)
+        await waiter
+        return time.monotonic() - start
+
+    # without checking again after its sleep the waiter would go at 0.1s
+    assert asyncio.run(scenario()) >= 0.3
+
+
+def test_invalid_settings() -> None:
+    with pytest.raises(ValueError):
+        _ = TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        _ = TokenBucket(rate=1, capacity=0.5)
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from izthere.monitors.http_client import (
+    close_client_manager,
+    configure_client_manager,
+    get_client_manager,
+)
+from izthere.monitors.json_parser_monitor import JSONParserMonitor
+from izthere.monitors.predicates import Predicate
+from izthere.monitors.seen_store import (
+    SeenItemStore,
+    close_seen_store,
+    configure_seen_store,
+    get_seen_store,
+)
+from izthere.services import close_services, configure_services
+
+URL = "http://api.test/jobs"
+
+
+def job(id: int, title: str = "backend") -> dict[str, Any]:
+    return {"id": id, "title": title, "url": f"/jobs/{id}"}
+
+
+def monitor(
+    question: str = "Is Backend hiring", value: str = "backend"
+) -> JSONParserMonitor:
+    return JSONParserMonitor(
+        name=question,
+        url=URL,
+        items_path="items",
+        predicates=[Predicate("contains_insensitive", path="title", value=value)],
+        extras_path="url",
+        identity_path="id",
+    )
+
+
+async def evaluate(
+    m: JSONParserMonitor, items: list[dict[str, Any]]
+) -> tuple[bool, str | None]:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=json.dumps({"items": items}))
+
+    manager = get_client_manager()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    manager.client = lambda headers=None, timeout=10: client  # pyright: ignore[reportAttributeAccessIssue]
+    try:
+        return await m.run()
+    finally:
+        await client.aclose()
+
+
+def run(m: JSONParserMonitor, items: list[dict[str, Any]]) -> tuple[bool, str | None]:
+    async def scenario() -> tuple[bool, str | None]:
+        _ = configure_client_manager()
+        try:
+            return await evaluate(m, items)
+        finally:
+            await close_client_manager()
+
+    return asyncio.run(scenario())
+
+
+def test_items_already_seen_are_skipped(tmp_path: Path) -> None:
+    _ = configure_seen_store(None, tmp_path)
+    try:
+        m = monitor()
+        assert run(m, [job(1), job(2)]) == (True, "/jobs/1\n/jobs/2")
+        # unchanged items are not reported again, a new or changed one is
+        assert run(m, [job(1), job(2)]) == (False, None)
+        changed = {**job(2), "title": "backend lead"}
+        assert run(m, [job(1), changed, job(3)]) == (True, "/jobs/2\n/jobs/3")
+    finally:
+        close_seen_store()
+
+
+def test_batch_counts_the_skipped_items(tmp_path: Path) -> None:
+    store = SeenItemStore(tmp_path / "seen.sqlite3")
+
+    async def scenario() -> tuple[list[bool], int]:
+        first = await store.begin("scope", ("id",))
+        _ = [first.is_new(item) for item in [job(1), job(2)]]
+        await store.commit(first)
+        second = await store.begin("scope", ("id",))
+        new = [second.is_new(item) for item in [job(1), job(2, "frontend"), {"x": 1}]]
+        return new, second.skipped
+
+    try:
+        # an item without identity cannot be tracked and is always evaluated
+        assert asyncio.run(scenario()) == ([False, True, True], 1)
+    finally:
+        store.close()
+
+
+def test_expired_items_are_evicted(tmp_path: Path) -> None:
+    store = SeenItemStore(tmp_path / "seen.sqlite3", ttl_seconds=0.1)
+
+    async def record(*ids: int) -> None:
+        batch = await store.begin("scope", ("id",))
+        _ = [batch.is_new(job(i)) for i in ids]
+        await store.commit(batch)
+
+    try:
+        asyncio.run(record(1))
+        time.sleep(0.2)
+        asyncio.run(record(2))
+        # the item seen again is kept, the other one expired
+        assert set(store._load("scope")) == {"2"}  # pyright: ignore[reportPrivateUsage]
+    finally:
+        store.close()
+
+
+def test_ttl_is_configured_in_days(tmp_path: Path) -> None:
+    store = configure_seen_store({"ttl_days": 2}, tmp_path)
+    try:
+        assert store.ttl_seconds == 2 * 24 * 3600
+        assert store.path == tmp_path / "seen_items.sqlite3"
+    finally:
+        close_seen_store()
+
+
+def test_each_monitor_has_its_own_seen_items(tmp_path: Path) -> None:
+    _ = configure_seen_store(None, tmp_path)
+    try:
+        items = [job(1), job(2)]
+        assert run(monitor(), items)[0]
+        # same endpoint and predicates, another question: nothing seen yet
+        assert run(monitor("Is Backend still hiring"), items)[0]
+        # other predicates on the same endpoint
+        assert run(monitor(value="back"), items)[0]
+        assert not run(monitor(), items)[0]
+    finally:
+        close_seen_store()
+
+
+def test_dry_run_records_nothing(tmp_path: Path) -> None:
+    async def scenario() -> list[bool]:
+        _ = configure_services({"data_dir": str(tmp_path)}, persist=False)
+        try:
+            assert get_seen_store() is None
+            m = monitor()
+            return [(await evaluate(m, [job(1)]))[0] for _ in range(2)]
+        finally:
+            await close_services()
+
+    # the item is new on every dry run
+    assert asyncio.run(scenario()) == [True, True]
+    assert not (tmp_path / "seen_items.sqlite3").exists()
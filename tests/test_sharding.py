@@ -0,0 +1,153 @@
+import asyncio
+import threading
+from collections import Counter
+from datetime import UTC, datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from izthere.sharding import HashRing, LeaseStore, ShardCoordinator, firing_time
+
+KEYS = [f"monitor {i}" for i in range(3000)]
+
+
+def owners(ring: HashRing) -> dict[str, str | None]:
+    return {key: ring.owner(key) for key in KEYS}
+
+
+def test_empty_ring_has_no_owner() -> None:
+    assert HashRing([]).owner("monitor") is None
+
+
+def test_keys_are_spread_over_the_workers() -> None:
+    counts = Counter(owners(HashRing(["a", "b", "c", "d"])).values())
+    assert set(counts) == {"a", "b", "c", "d"}
+    for count in counts.values():
+        assert 0.15 < count / len(KEYS) < 0.35
+
+
+def test_owner_does_not_depend_on_member_order() -> None:
+    assert owners(HashRing(["a", "b", "c"])) == owners(HashRing(["c", "a", "b", "a"]))
+
+
+def test_joining_worker_only_takes_its_share() -> None:
+    before = owners(HashRing(["a", "b", "c"]))
+    after = owners(HashRing(["a", "b", "c", "d"]))
+    moved = [key for key in KEYS if before[key] != after[key]]
+    # every monitor that moves goes to the new worker, about a quarter of them
+    assert all(after[key] == "d" for key in moved)
+    assert 0.15 < len(moved) / len(KEYS) < 0.35
+
+
+def test_leaving_worker_only_gives_its_monitors_away() -> None:
+    before = owners(HashRing(["a", "b", "c", "d"]))
+    after = owners(HashRing(["a", "b", "d"]))
+    for key in KEYS:
+        if before[key] != "c":
+            assert after[key] == before[key]
+        else:
+            assert after[key] in ("a", "b", "d")
+
+
+def test_claim_is_won_once_per_firing(tmp_path: Path) -> None:
+    stores = [LeaseStore(tmp_path / "shards.sqlite3") for _ in range(4)]
+    try:
+        results: list[bool] = []
+        barrier = threading.Barrier(len(stores))
+
+        def claim(store: LeaseStore, worker: str) -> None:
+            _ = barrier.wait()
+            results.append(store.claim("monitor", "2026-01-01T12:00:00+00:00", worker))
+
+        threads = [
+            threading.Thread(target=claim, args=(store, f"w{i}"))
+            for i, store in enumerate(stores)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(results) == [False, False, False, True]
+        # the next firing, and another monitor, are claimed anew
+        assert stores[1].claim("monitor", "2026-01-01T12:01:00+00:00", "w1")
+        assert stores[2].claim("other", "2026-01-01T12:00:00+00:00", "w2")
+    finally:
+        for store in stores:
+            store.close()
+
+
+def test_each_firing_runs_on_one_coordinator(tmp_path: Path) -> None:
+    path = tmp_path / "shards.sqlite3"
+    names = [f"monitor {i}" for i in range(20)]
+
+    async def scenario() -> tuple[dict[str, list[str]], dict[str, str | None]]:
+        coordinators = [
+            ShardCoordinator(LeaseStore(path), worker, claim_grace_seconds=0.05)
+            for worker in ("a", "b")
+        ]
+        for coordinator in coordinators:
+            await coordinator.start()
+        # both know of each other once they have refreshed after the other joined
+        for coordinator in coordinators:
+            await coordinator.refresh()
+        due = datetime(2026, 1, 1, 12, 0, tzinfo=UTC)
+        runs: dict[str, list[str]] = {name: [] for name in names}
+
+        async def fire(coordinator: ShardCoordinator, name: str) -> None:
+            if await coordinator.claim(name, firing_time(due)):
+                runs[name].append(coordinator.worker_id)
+
+        _ = await asyncio.gather(
+            *(fire(c, name) for c in coordinators for name in names)
+        )
+        ring = coordinators[0].ring
+        for coordinator in coordinators:
+            await coordinator.stop()
+        return runs, {name: ring.owner(name) for name in names}
+
+    runs, expected = asyncio.run(scenario())
+
+    # exactly once, and on the owner since it did not wait out the grace period
+    assert runs == {name: [owner] for name, owner in expected.items()}
+    assert set(expected.values()) == {"a", "b"}
+
+
+def test_other_worker_takes_over_a_dead_owner(tmp_path: Path) -> None:
+    async def scenario() -> bool:
+        coordinator = ShardCoordinator(
+            LeaseStore(tmp_path / "shards.sqlite3"), "b", claim_grace_seconds=0.01
+        )
+        # "a" is still a member but never claims
+        coordinator.ring = HashRing(["a", "b"])
+        name = next(key for key in KEYS if coordinator.ring.owner(key) == "a")
+        won = await coordinator.claim(name, firing_time())
+        await coordinator.stop()
+        return won
+
+    assert asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(
+    ("due", "expected"),
+    [
+        ("2026-01-01T12:00:00", "2026-01-01T12:00:00"),
+        ("2026-01-01T12:00:29.999", "2026-01-01T12:00:00"),
+        ("2026-01-01T12:00:30", "2026-01-01T12:01:00"),
+        ("2026-01-01T11:59:31", "2026-01-01T12:00:00"),
+        ("2026-12-31T23:59:45", "2027-01-01T00:00:00"),
+    ],
+)
+def test_firing_time_rounds_to_the_nearest_minute(due: str, expected: str) -> None:
+    rounded = firing_time(datetime.fromisoformat(f"{due}+00:00"))
+    assert rounded.isoformat() == f"{expected}+00:00"
+
+
+def test_firing_time_is_the_same_across_timezones_and_skew() -> None:
+    due = datetime(2026, 1, 1, 12, 0, tzinfo=UTC)
+    paris = timezone(timedelta(hours=1))
+    seen = {
+        firing_time(due + timedelta(seconds=skew)).isoformat()
+        for skew in (-29, -5, 0, 5, 29)
+    } | {firing_time((due + timedelta(seconds=10)).astimezone(paris)).isoformat()}
+    assert seen == {"2026-01-01T12:00:00+00:00"}
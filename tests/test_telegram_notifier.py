@@ -0,0 +1,87 @@
+import asyncio
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+from izthere.notifiers.dispatcher import Notification, NotificationDispatcher
+from izthere.notifiers.telegram_notifier import TelegramNotifier
+
+
+class FakeBot:
+    """Records the messages sent, the first ``failures`` calls raise."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures: int = failures
+        self.sent: list[str] = []
+
+    async def send_message(self, chat_id: str, text: str, **kwargs: Any) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("telegram unreachable")
+        self.sent.append(text)
+
+
+def digest_notifier(chat_id: str, bot: FakeBot, window: float) -> TelegramNotifier:
+    notifier = TelegramNotifier(
+        bot_token="1:test",
+        chat_id=chat_id,
+        messages_per_minute=6000,
+        burst=100,
+        digest_window_seconds=window,
+    )
+    notifier._chat.bot = bot  # pyright: ignore[reportPrivateUsage, reportAttributeAccessIssue]
+    return notifier
+
+
+def notification(i: int) -> Notification:
+    return Notification(
+        what=f"job {i}",
+        where="https://example.com/jobs",
+        answer=True,
+        ts=datetime.now(UTC),
+    )
+
+
+async def deliver(
+    notifier: TelegramNotifier, count: int, **dispatcher_options: Any
+) -> float:
+    dispatcher = NotificationDispatcher(workers=4, **dispatcher_options)
+    dispatcher.start()
+    start = time.perf_counter()
+    for i in range(count):
+        await dispatcher.submit([notifier], notification(i))
+    await dispatcher.close(timeout=5)
+    elapsed = time.perf_counter() - start
+    await notifier.close()
+    return elapsed
+
+
+def test_results_of_one_window_go_out_as_one_message() -> None:
+    bot = FakeBot()
+    notifier = digest_notifier("digest-one-window", bot, window=0.3)
+
+    elapsed = asyncio.run(deliver(notifier, 20))
+
+    # more results than workers, none of them waits for the window in a worker
+    assert len(bot.sent) == 1
+    assert all(f"*What:* job {i}\n" in bot.sent[0] for i in range(20))
+    assert elapsed < 1
+
+
+def test_failed_digest_is_retried_by_the_dispatcher() -> None:
+    bot = FakeBot(failures=1)
+    notifier = digest_notifier("digest-retried", bot, window=0.05)
+
+    _ = asyncio.run(deliver(notifier, 5, backoff_seconds=0.01))
+
+    assert len(bot.sent) == 1
+    assert all(f"*What:* job {i}\n" in bot.sent[0] for i in range(5))
+
+
+def test_digest_given_up_after_max_attempts() -> None:
+    bot = FakeBot(failures=10)
+    notifier = digest_notifier("digest-given-up", bot, window=0.01)
+
+    _ = asyncio.run(deliver(notifier, 3, max_attempts=2, backoff_seconds=0.01))
+
+    assert bot.sent == []
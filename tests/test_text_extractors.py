@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+from izthere.monitors.html_stream import VisibleTextStream
+from izthere.monitors.text_extractors import (
+    extract_visible_text_bs4,
+    extract_visible_text_lxml,
+)
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>Software Bundle &amp; more</title>
+  <style>.hero { color: red; }</style>
+  <script>window.data = {"keywords": ["video editing"]};</script>
+</head>
+<body>
+  <!-- navigation -->
+  <nav><ul><li><a href="/">Home</a><li><a href="/store">Store</a></ul></nav>
+  <main>
+    <h1>Pay what you want</h1>
+    <p>Get <b>DaVinci</b> tools for <em>video editing</em>&nbsp;and more.</p>
+    <template><p>hidden template</p></template>
+    <noscript>Enable JavaScript</noscript>
+    <table><tr><td>Tier 1<td>$1</tr><tr><td>Tier 2<td>$10</table>
+    <p>Ends in 3&nbsp;days &mdash; caf&eacute; &#233; &#x263A;</p>
+  </main>
+  <footer>&copy; 2026<br>All rights reserved</footer>
+</body>
+</html>
+"""
+
+# the corpus holds an XHTML document, parsed as HTML on purpose
+pytestmark = pytest.mark.filterwarnings("ignore::bs4.XMLParsedAsHTMLWarning")
+
+# every backend must give the same text for these
+CORPUS: dict[str, str] = {
+    "page": PAGE,
+    "empty": "",
+    "whitespace": "  \n\t ",
+    "text only": "just text",
+    "inline tags": "<p>a<b>b</b>c</p>",
+    "entities": "<p>a &amp; b &lt;c&gt; &quot;d&quot;</p>",
+    "nbsp": "<p>café &nbsp;x</p>",
+    "comment": "<p>a<!-- c -->b</p>",
+    "cdata": "<p>a<![CDATA[ x y ]]>b</p>",
+    "leading cdata": "<![CDATA[x]]><p>y</p>",
+    "cdata in script": "<script><![CDATA[x]]></script><p>y</p>",
+    "script markup": "<script>var a = '<p>no</p>';</script><p>yes</p>",
+    "style": "<style>p {}</style>v",
+    "noscript": "<p>x</p><noscript>n</noscript>",
+    "template": "<div>a<template>t</template>b</div>",
+    "title": "<title>T &amp; t</title><p>x</p>",
+    "xml declaration": "<?xml version='1.0' encoding='utf-8'?><p>x</p>",
+    "doctype": "<!DOCTYPE html><html><body>b</body></html>",
+    "br": "<p>one<br>two</p>",
+    "implied end tags": "<ul><li>a<li>b</ul>",
+    "unclosed": "<p>unclosed <b>bold",
+    "svg": "<svg><text>s</text></svg>",
+    "plain textarea": "<textarea>plain</textarea>",
+}
+
+# libxml2 keeps the content of these as raw text, html.parser parses tags in it, and
+# it ends a CDATA section at its first ">"
+KNOWN_DIFFERENCES: dict[str, tuple[str, str]] = {
+    "textarea": ("<textarea>a <b>b</b></textarea>", "a <b>b</b>"),
+    "xmp": ("<xmp>a <b>b</b></xmp>", "a <b>b</b>"),
+    "plaintext": ("<plaintext>a <b>", "a <b>"),
+    "cdata with markup": ("<p><![CDATA[x<b>]]></p>", "]]>"),
+}
+
+
+def _stream(html: str, chunk_sizes: list[int] | None = None) -> str:
+    parser = VisibleTextStream()
+    out: list[str] = []
+    pos = 0
+    for size in chunk_sizes or [len(html)]:
+        out.append(parser.feed_chunk(html[pos : pos + size]))
+        pos += size
+    out.append(parser.feed_chunk(html[pos:]))
+    out.append(parser.finish())
+    return "".join(out).strip()
+
+
+@pytest.mark.parametrize("html", CORPUS.values(), ids=CORPUS.keys())
+def test_backends_agree(html: str) -> None:
+    expected = extract_visible_text_bs4(html)
+    assert extract_visible_text_lxml(html) == expected
+    assert _stream(html) == expected
+
+
+@pytest.mark.parametrize("html", CORPUS.values(), ids=CORPUS.keys())
+def test_stream_chunking_does_not_matter(html: str) -> None:
+    expected = extract_visible_text_bs4(html)
+    rng = random.Random(html)
+    for _ in range(20):
+        sizes = [rng.randint(1, 16) for _ in range(len(html) // 4 + 1)]
+        assert _stream(html, sizes) == expected
+
+
+def test_page_text() -> None:
+    text = extract_visible_text_lxml(PAGE)
+    assert "video editing" in text
+    assert "Software Bundle & more" in text
+    assert "café é ☺" in text
+    for hidden in ("color: red", "window.data", "hidden template", "Enable JavaScript"):
+        assert hidden not in text
+
+
+@pytest.mark.parametrize(
+    ("html", "raw"), KNOWN_DIFFERENCES.values(), ids=KNOWN_DIFFERENCES.keys()
+)
+def test_known_differences(html: str, raw: str) -> None:
+    assert extract_visible_text_lxml(html) == raw
+    # both built on html.parser, whose handling of these varies between Pythons
+    assert _stream(html) == extract_visible_text_bs4(html)
@@ -0,0 +1,125 @@
+import asyncio
+from collections.abc import Iterator
+from pathlib import Path
+
+import httpx
+import pytest
+
+from izthere.monitors.html_word_monitor import HtmlWordMonitor
+from izthere.monitors.http_client import close_client_manager, configure_client_manager
+from izthere.monitors.response_cache import (
+    close_response_cache,
+    configure_response_cache,
+)
+from izthere.monitors.state_store import close_state_store, configure_state_store
+
+URL = "http://pages.test/careers"
+LAST_MODIFIED = "Wed, 01 Jan 2026 12:00:00 GMT"
+
+
+class Page:
+    """Serves ``body``, with validators when ``etag`` is set, and records the requests."""
+
+    def __init__(self, body: bytes, etag: str | None = None) -> None:
+        self.body: bytes = body
+        self.etag: str | None = etag
+        self.requests: list[httpx.Request] = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.etag is None:
+            return httpx.Response(200, content=self.body)
+        headers = {"ETag": self.etag, "Last-Modified": LAST_MODIFIED}
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, content=self.body, headers=headers)
+
+
+def monitor() -> HtmlWordMonitor:
+    return HtmlWordMonitor(name="Is Backend hiring", url=URL, keywords=["backend"])
+
+
+def run(m: HtmlWordMonitor, page: Page) -> tuple[bool, str | None]:
+    async def scenario() -> tuple[bool, str | None]:
+        manager = configure_client_manager()
+        client = httpx.AsyncClient(transport=httpx.MockTransport(page.handler))
+        manager.client = lambda headers=None, timeout=10: client  # pyright: ignore[reportAttributeAccessIssue]
+        try:
+            return await m.run()
+        finally:
+            await client.aclose()
+            await close_client_manager()
+
+    return asyncio.run(scenario())
+
+
+@pytest.fixture
+def stores(tmp_path: Path) -> Iterator[None]:
+    _ = configure_response_cache(None, tmp_path)
+    _ = configure_state_store(None, tmp_path)
+    yield
+    close_response_cache()
+    close_state_store()
+
+
+@pytest.mark.usefixtures("stores")
+def test_not_modified_response_replays_the_answer() -> None:
+    page = Page(b"<p>backend engineer</p>", etag='"v1"')
+    m = monitor()
+
+    assert run(m, page)[0]
+    assert "If-None-Match" not in page.requests[0].headers
+
+    # a restarted monitor revalidates with what the last response carried
+    m = monitor()
+    assert run(m, page) == (True, "matched: backend (@0)")
+    assert page.requests[1].headers["If-None-Match"] == '"v1"'
+    assert page.requests[1].headers["If-Modified-Since"] == LAST_MODIFIED
+    assert "extract" not in m.timings
+
+
+@pytest.mark.usefixtures("stores")
+def test_modified_response_is_evaluated() -> None:
+    page = Page(b"<p>backend engineer</p>", etag='"v1"')
+    m = monitor()
+    assert run(m, page)[0]
+
+    page.body, page.etag = b"<p>frontend engineer</p>", '"v2"'
+    assert run(m, page) == (False, None)
+    assert "extract" in m.timings
+
+
+@pytest.mark.usefixtures("stores")
+def test_identical_body_skips_the_evaluation() -> None:
+    # no validators to revalidate with: the body is hashed
+    page = Page(b"<p>backend engineer</p>")
+    assert run(monitor(), page)[0]
+
+    m = monitor()
+    assert run(m, page) == (True, "matched: backend (@0)")
+    assert len(page.requests) == 2
+    assert "extract" not in m.timings
+
+
+@pytest.mark.usefixtures("stores")
+def test_changed_body_is_evaluated() -> None:
+    page = Page(b"<p>backend engineer</p>")
+    m = monitor()
+    assert run(m, page)[0]
+
+    page.body = b"<p>backend engineer, remote</p>"
+    assert run(m, page) == (True, "matched: backend (@0)")
+    assert "extract" in m.timings
+
+    page.body = b"<p>closed</p>"
+    assert run(m, page) == (False, None)
+
+
+def test_restarted_monitor_evaluates_again_without_stores() -> None:
+    page = Page(b"<p>backend engineer</p>", etag='"v1"')
+    assert run(monitor(), page)[0]
+
+    m = monitor()
+    assert run(m, page)[0]
+    assert "If-None-Match" not in page.requests[1].headers
+    assert "extract" in m.timings
@@ -0,0 +1,76 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import httpx
+import pytest
+
+from izthere.monitors.http_client import close_client_manager, configure_client_manager
+from izthere.monitors.web_utils import fetch
+
+URL = "http://pages.test/jobs"
+
+
+class SlowServer:
+    """Answers after ``delay`` seconds, records how requests ended."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay: float = delay
+        self.started: int = 0
+        self.cancelled: int = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return httpx.Response(200, content=b"<p>jobs</p>")
+
+
+def run[T](server: SlowServer, scenario: Callable[[], Awaitable[T]]) -> T:
+    async def serving() -> T:
+        manager = configure_client_manager()
+        client = httpx.AsyncClient(transport=httpx.MockTransport(server.handler))
+        manager.client = lambda headers=None, timeout=10: client  # pyright: ignore[reportAttributeAccessIssue]
+        try:
+            return await scenario()
+        finally:
+            await client.aclose()
+            await close_client_manager()
+
+    return asyncio.run(serving())
+
+
+def test_cancelled_caller_leaves_the_request_to_the_others() -> None:
+    server = SlowServer(delay=0.1)
+
+    async def scenario() -> bytes:
+        first = asyncio.create_task(fetch(URL))
+        second = asyncio.create_task(fetch(URL))
+        await asyncio.sleep(0.02)
+        _ = first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return (await second).content
+
+    body = run(server, scenario)
+
+    assert body == b"<p>jobs</p>"
+    assert (server.started, server.cancelled) == (1, 0)
+
+
+def test_request_is_cancelled_with_its_last_caller() -> None:
+    server = SlowServer(delay=1)
+
+    async def scenario() -> None:
+        callers = [asyncio.create_task(fetch(URL)) for _ in range(2)]
+        await asyncio.sleep(0.02)
+        for caller in callers:
+            _ = caller.cancel()
+        _ = await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0.02)
+
+    run(server, scenario)
+
+    assert (server.started, server.cancelled) == (1, 1)